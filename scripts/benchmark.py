@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""ホットパスのマイクロベンチマーク（ネットワーク不要）.
+
+Usage:
+    python scripts/benchmark.py [signing] [startup] [body] [decode] [ws] [cancel] [connect]
+        [transport]
+
+connect / transport は実ネットワーク (BENCH_URL、デフォルト https://perps.standx.com) に
+接続する。transport の http2 側は httpx[http2] が必要。
+"""
+
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import websockets
+from aiohttp import TCPConnector, web
+
+from standx_mm_bot.auth import RequestSigner, generate_auth_headers
+from standx_mm_bot.client import StandXHTTPClient, StandXWebSocketClient
+from standx_mm_bot.client.decode import decode_open_orders, decode_order_ack, loads
+from standx_mm_bot.client.payload import encode_body, encode_new_order
+from standx_mm_bot.client.transport import Transport, create_transport
+from standx_mm_bot.config import Settings
+from standx_mm_bot.models import Order, OrderStatus, OrderType, Side
+
+# テスト用鍵（ベンチマーク専用、実資金なし）
+BENCH_PRIVATE_KEY = "0x" + "a" * 64
+BENCH_BODY = {
+    "symbol": "ETH-USD",
+    "side": "buy",
+    "order_type": "limit",
+    "qty": "0.001",
+    "price": "3500.25",
+    "time_in_force": "alo",
+    "reduce_only": False,
+}
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    """
+    1回あたりの平均実行時間を計測.
+
+    Args:
+        fn: 計測対象
+        iterations: 反復回数
+
+    Returns:
+        float: 1回あたりの平均時間 (µs)
+    """
+    # ウォームアップ
+    for _ in range(min(iterations // 10, 1000)):
+        fn()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1_000_000
+
+
+def bench_config() -> Settings:
+    """ベンチマーク用設定（.envを読まない）."""
+    return Settings(
+        _env_file=None,
+        standx_private_key=BENCH_PRIVATE_KEY,
+        standx_wallet_address="0x1234567890abcdef",
+        standx_chain="bsc",
+        standx_request_signing_key=BENCH_PRIVATE_KEY,
+        jwt_cache_path=None,
+        # レートリミッターの待ち時間を計測に混ぜない（ローカルサーバーにしか送らない）
+        rate_limit_per_second=1_000_000.0,
+        rate_limit_burst=1_000_000.0,
+    )
+
+
+async def start_local_server() -> tuple[web.AppRunner, str]:
+    """
+    即座に空レスポンスを返すローカルHTTPサーバーを起動.
+
+    Returns:
+        tuple: (runner, base_url)
+    """
+
+    async def handler(_request: web.Request) -> web.Response:
+        return web.json_response({"code": 0})
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """パーセンタイルを計算 (q: 0-100)."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def report_latency(name: str, samples_us: list[float]) -> None:
+    """レイテンシ分布を表示."""
+    print(
+        f"  {name:<28} p50={percentile(samples_us, 50):8.1f} µs  "
+        f"p99={percentile(samples_us, 99):8.1f} µs"
+    )
+
+
+def report(name: str, before_us: float, after_us: float) -> None:
+    """計測結果を表示."""
+    print(f"{name}")
+    print(f"  before: {before_us:8.2f} µs/req")
+    print(f"  after:  {after_us:8.2f} µs/req")
+    print(f"  speedup: {before_us / after_us:.2f}x")
+
+
+def bench_signing(iterations: int = 20_000) -> None:
+    """リクエスト署名コスト: generate_auth_headers vs RequestSigner."""
+    signer = RequestSigner(BENCH_PRIVATE_KEY)
+
+    def before() -> object:
+        return generate_auth_headers("jwt", BENCH_PRIVATE_KEY, "POST", "/api/new_order", BENCH_BODY)
+
+    def after() -> object:
+        headers = signer.sign(encode_body(BENCH_BODY))
+        headers["authorization"] = "Bearer jwt"
+        return headers
+
+    report("signing (POST /api/new_order)", measure(before, iterations), measure(after, iterations))
+
+
+def bench_body(iterations: int = 100_000) -> None:
+    """new_orderボディのシリアライズ + 署名スループット: 辞書+json.dumps vs テンプレート."""
+    signer = RequestSigner(BENCH_PRIVATE_KEY)
+
+    def dict_path() -> bytes:
+        body = {
+            "symbol": "ETH-USD",
+            "side": "BUY".lower(),
+            "order_type": "limit".lower(),
+            "qty": str(0.001),
+            "price": str(3500.25),
+            "time_in_force": "alo",
+            "reduce_only": False,
+        }
+        # 署名用にjson.dumps、送信時にaiohttpがstr→bytesに再エンコード
+        return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+    def template_path() -> bytes:
+        return encode_new_order("ETH-USD", "BUY", "limit", 0.001, 3500.25, "alo", False)
+
+    assert dict_path() == template_path()
+    report(
+        "serialize new_order", measure(dict_path, iterations), measure(template_path, iterations)
+    )
+
+    def dict_sign() -> object:
+        return signer.sign(dict_path())
+
+    def template_sign() -> object:
+        return signer.sign(template_path())
+
+    sign_iterations = iterations // 5
+    before_us = measure(dict_sign, sign_iterations)
+    after_us = measure(template_sign, sign_iterations)
+    report("serialize + sign new_order", before_us, after_us)
+    print(f"  throughput: {1_000_000 / before_us:,.0f} -> {1_000_000 / after_us:,.0f} req/s")
+
+
+def bench_decode(iterations: int = 50_000) -> None:
+    """レスポンスのデコード: resp.json() + キー推測 vs バイト列直接デコード + モデル変換."""
+    ack = json.dumps(
+        {"code": 0, "message": "success", "request_id": "r" * 32, "cl_ord_id": "mm" + "0" * 20}
+    ).encode()
+    item = {
+        "order_id": "1234567890",
+        "symbol": "ETH-USD",
+        "side": "buy",
+        "order_type": "limit",
+        "price": "3500.25",
+        "qty": "0.001",
+        "fill_qty": "0",
+        "status": "OPEN",
+        "cl_ord_id": "mm" + "0" * 20,
+        "time_in_force": "alo",
+        "created_at": "2025-01-01T00:00:00Z",
+    }
+    open_orders = json.dumps({"result": [item] * 20}).encode()
+
+    def dict_ack() -> Order:
+        # 従来: aiohttp の resp.json()（str へデコードしてから json.loads）+ キー推測
+        response = json.loads(ack.decode("utf-8"))
+        order_id = response.get("order_id") or response.get("request_id", "unknown")
+        try:
+            status = OrderStatus(response.get("status", "OPEN"))
+        except ValueError:
+            status = OrderStatus.OPEN
+        return Order(order_id, "ETH-USD", Side.BUY, 3500.25, 0.001, OrderType.LIMIT, status)
+
+    def typed_ack() -> Order:
+        return decode_order_ack(loads(ack), "ETH-USD", Side.BUY, 3500.25, 0.001)
+
+    report("decode new_order ack", measure(dict_ack, iterations), measure(typed_ack, iterations))
+
+    def dict_orders() -> list[Order]:
+        response = json.loads(open_orders.decode("utf-8"))
+        orders = response.get("result") or response.get("data", [])
+        return [
+            Order(
+                str(o.get("order_id", "")),
+                o.get("symbol", "ETH-USD"),
+                Side(o.get("side", "").upper()),
+                float(o.get("price", 0)),
+                float(o.get("qty", 0)),
+                OrderType(o.get("order_type", "limit").upper()),
+                OrderStatus(o.get("status", "OPEN")),
+            )
+            for o in orders
+        ]
+
+    def typed_orders() -> list[Order]:
+        return decode_open_orders(loads(open_orders), "ETH-USD")
+
+    list_iterations = iterations // 10
+    report(
+        "decode query_open_orders (20)",
+        measure(dict_orders, list_iterations),
+        measure(typed_orders, list_iterations),
+    )
+    print(f"  json backend: {loads.__module__}")
+
+
+class FakeConnection:
+    """
+    記録済みフレームを返すWebSocket接続の代用（recv と非同期イテレーションのみ）.
+
+    実際の接続と同じくフレームごとにイベントループへ制御を返す（キューの
+    コンシューマーが受信の合間に動ける）。
+    """
+
+    def __init__(self, frames: list[bytes]):
+        self.frames = frames
+
+    async def recv(self, decode: bool | None = None) -> str | bytes:
+        """次のフレームを返す（尽きたら正常切断）."""
+        await asyncio.sleep(0)
+        if not self.frames:
+            raise websockets.ConnectionClosedOK(None, None)
+        frame = self.frames.pop()
+        return frame if decode is False else frame.decode("utf-8")
+
+    def __aiter__(self) -> "FakeConnection":
+        return self
+
+    async def __anext__(self) -> str:
+        await asyncio.sleep(0)
+        if not self.frames:
+            raise StopAsyncIteration
+        return self.frames.pop().decode("utf-8")
+
+
+async def _bench_ws(iterations: int) -> None:
+    price = json.dumps(
+        {
+            "seq": 123456,
+            "channel": "price",
+            "data": {
+                "base": "ETH",
+                "index_price": "3500.12",
+                "last_price": "3500.25",
+                "mark_price": "3500.20",
+                "mid_price": "3500.22",
+                "spread": ["3500.10", "3500.30"],
+                "quote": "USD",
+                "symbol": "ETH-USD",
+                "time": "2025-01-01T00:00:00.123456Z",
+            },
+        }
+    ).encode()
+    frames = [price] * iterations
+    log = logging.getLogger("standx_mm_bot.client.websocket")
+    callbacks: dict[str, list[Callable[[dict[str, Any]], Awaitable[None]]]] = {
+        "price": [],
+        "order": [],
+        "trade": [],
+    }
+    received = 0
+
+    async def on_price(_data: dict[str, Any]) -> None:
+        nonlocal received
+        received += 1
+
+    callbacks["price"].append(on_price)
+
+    async def before(ws: FakeConnection) -> None:
+        # 従来: str へのデコード + json.loads + 常に整形するデバッグログ + if/elif ディスパッチ
+        async for message in ws:
+            log.debug(f"Received raw message: {message!r} (type: {type(message)})")
+            data = json.loads(message)
+            log.debug(f"Parsed message: {data}")
+            channel = data.get("channel", "")
+            if "code" in data and data.get("code") != 200:
+                continue
+            if channel == "price":
+                for callback in callbacks["price"]:
+                    await callback(data.get("data", {}))
+            elif channel == "order":
+                for callback in callbacks["order"]:
+                    await callback(data.get("data", {}))
+            elif channel == "trade":
+                for callback in callbacks["trade"]:
+                    await callback(data.get("data", {}))
+
+    client = StandXWebSocketClient(bench_config())
+    client.on_price_update(on_price)
+    client._running = True
+
+    async def after(ws: FakeConnection) -> None:
+        # 現行: 受信ループはキューに積むだけで、コールバックはコンシューマーが実行
+        client._start_consumers()
+        try:
+            await client._receive_messages(ws)  # type: ignore[arg-type]
+            await client._drain_queues()
+        finally:
+            await client._stop_consumers()
+
+    async def timed(run: Callable[[FakeConnection], Awaitable[None]]) -> float:
+        ws = FakeConnection(list(frames))
+        start = time.perf_counter()
+        await run(ws)
+        return time.perf_counter() - start
+
+    # ウォームアップ
+    await timed(before)
+    await timed(after)
+
+    received = 0
+    before_s = await timed(before)
+    assert received == iterations
+
+    received = 0
+    dropped_before = client.queue_stats()["price"]["dropped"]
+    after_s = await timed(after)
+    # コールバックが追いつかない間の price は最新の1件に置き換わる
+    dropped = client.queue_stats()["price"]["dropped"] - dropped_before
+    assert received + dropped == iterations
+
+    report("ws receive price", before_s / iterations * 1e6, after_s / iterations * 1e6)
+    print(f"  throughput: {iterations / before_s:,.0f} -> {iterations / after_s:,.0f} msg/s")
+    print(f"  queued: {received:,} callbacks, {dropped:,} conflated")
+    print(f"  json backend: {loads.__module__}")
+
+
+def bench_ws(iterations: int = 100_000) -> None:
+    """WebSocket受信（priceフレーム）: 受信ループ内で直接ディスパッチ vs キュー経由のコンシューマー."""
+    asyncio.run(_bench_ws(iterations))
+
+
+# 新しいプロセスで計測する起動処理: import → Settings → 最初の署名付きリクエスト生成
+STARTUP_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+from standx_mm_bot.client import StandXHTTPClient
+from standx_mm_bot.config import Settings
+t1 = time.perf_counter()
+config = Settings(
+    _env_file=None,
+    standx_private_key="0x" + "a" * 64,
+    standx_wallet_address="0x1234567890abcdef",
+    standx_chain=sys.argv[1],
+    standx_request_signing_key="0x" + "b" * 64,
+)
+t2 = time.perf_counter()
+client = StandXHTTPClient(config, jwt_token="cached")
+client._get_signer().sign(b'{"symbol":"ETH-USD"}')
+t3 = time.perf_counter()
+print(t1 - t0, t2 - t1, t3 - t2, int("eth_account" in sys.modules), int("jwt" in sys.modules))
+"""
+
+
+def bench_startup(runs: int = 7) -> None:
+    """コールドスタート時間: import + 設定読み込み + 最初の署名（キャッシュ済みJWT想定）."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    for chain in ("bsc", "solana"):
+        samples = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", STARTUP_SNIPPET, chain],
+                capture_output=True,
+                text=True,
+                check=True,
+                env=env,
+            ).stdout.split()
+            samples.append([float(v) for v in out])
+
+        import_ms, settings_ms, sign_ms = (
+            statistics.median(s[i] for s in samples) * 1000 for i in range(3)
+        )
+        print(f"startup ({chain}, median of {runs})")
+        print(f"  import:       {import_ms:8.2f} ms")
+        print(f"  settings:     {settings_ms:8.2f} ms")
+        print(f"  first sign:   {sign_ms:8.2f} ms")
+        print(f"  total:        {import_ms + settings_ms + sign_ms:8.2f} ms")
+        print(f"  eth_account loaded: {bool(samples[0][3])}, jwt loaded: {bool(samples[0][4])}")
+
+
+async def _bench_cancel(iterations: int) -> None:
+    runner, base_url = await start_local_server()
+    try:
+        async with StandXHTTPClient(bench_config(), jwt_token="jwt") as client:
+            client.base_url = base_url
+            await client.cancel_order("warmup", "ETH-USD")
+
+            # 現行パス: 判断後にボディ構築 + 署名 + 送信
+            signed_path = []
+            for i in range(iterations):
+                start = time.perf_counter()
+                await client.cancel_order(f"order_{i}", "ETH-USD")
+                signed_path.append((time.perf_counter() - start) * 1_000_000)
+
+            # 事前署名: 判断後は送信のみ（署名は判断前に済ませておく）
+            envelopes = [
+                client.prepare_cancel_order(f"order_{i}", "ETH-USD") for i in range(iterations)
+            ]
+            presigned = []
+            for envelope in envelopes:
+                start = time.perf_counter()
+                await client.send_prepared(envelope)
+                presigned.append((time.perf_counter() - start) * 1_000_000)
+    finally:
+        await runner.cleanup()
+
+    print(f"cancel decision-to-response latency (local loopback server, n={iterations})")
+    report_latency("cancel_order -> _request", signed_path)
+    report_latency("pre-signed envelope", presigned)
+
+
+def bench_cancel(iterations: int = 2_000) -> None:
+    """キャンセルのレイテンシ: 通常パス vs 事前署名キャンセル."""
+    asyncio.run(_bench_cancel(iterations))
+
+
+async def _timed_head(client: StandXHTTPClient) -> float:
+    assert client.transport is not None
+    start = time.perf_counter()
+    await client.transport.request("HEAD", client.base_url + "/", {}, b"", 10.0)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _bench_connect(steady_iterations: int) -> None:
+    base_url = os.environ.get("BENCH_URL", "https://perps.standx.com")
+    config = bench_config()
+    config.http_warmup_connections = 0
+
+    # コールド: 起動直後の最初のリクエスト (DNS + TCP + TLS)
+    async with StandXHTTPClient(config, jwt_token="jwt") as client:
+        client.base_url = base_url
+        cold_ms = await _timed_head(client)
+        steady_ms = [await _timed_head(client) for _ in range(steady_iterations)]
+
+    # ウォーム: 起動時にwarm_upしてから最初のリクエスト
+    async with StandXHTTPClient(config, jwt_token="jwt") as client:
+        client.base_url = base_url
+        start = time.perf_counter()
+        await client.warm_up(connections=2)
+        warmup_ms = (time.perf_counter() - start) * 1000
+        warm_first_ms = await _timed_head(client)
+
+    print(f"first request vs steady state ({base_url})")
+    print(f"  cold first request:      {cold_ms:8.1f} ms")
+    print(f"  warm-up (2 connections): {warmup_ms:8.1f} ms (off the order path)")
+    print(f"  warmed first request:    {warm_first_ms:8.1f} ms")
+    print(f"  steady state p50:        {percentile(steady_ms, 50):8.1f} ms")
+    print(f"  steady state p99:        {percentile(steady_ms, 99):8.1f} ms")
+
+
+def bench_connect(steady_iterations: int = 20) -> None:
+    """接続確立コスト: コールド初回 vs warm_up後の初回 vs 定常状態."""
+    asyncio.run(_bench_connect(steady_iterations))
+
+
+async def _timed_burst(transport: Transport, url: str, size: int) -> list[float]:
+    """同時に size 件送信し、各リクエストのレイテンシ (ms) を返す."""
+
+    async def _one() -> float:
+        start = time.perf_counter()
+        await transport.request("HEAD", url, {}, b"", 10.0)
+        return (time.perf_counter() - start) * 1000
+
+    return list(await asyncio.gather(*(_one() for _ in range(size))))
+
+
+async def _bench_transport(burst: int, rounds: int) -> None:
+    base_url = os.environ.get("BENCH_URL", "https://perps.standx.com")
+    config = bench_config()
+    url = base_url + "/"
+
+    print(f"burst latency, {burst} concurrent requests x {rounds} rounds ({base_url})")
+    for name in ("aiohttp", "http2"):
+        try:
+            # HTTP/1.1は同時リクエスト数だけ接続が必要（プール上限で待たされる）
+            connector = TCPConnector(limit=config.http_pool_size) if name == "aiohttp" else None
+            transport = create_transport(name, connector=connector, pool_size=config.http_pool_size)
+        except RuntimeError as e:
+            print(f"  {name:<8} skipped: {e}")
+            continue
+        try:
+            # 接続確立を計測から除く
+            await _timed_burst(transport, url, 1)
+            samples: list[float] = []
+            for _ in range(rounds):
+                samples.extend(await _timed_burst(transport, url, burst))
+        finally:
+            await transport.close()
+        print(
+            f"  {name:<8} p50={percentile(samples, 50):8.1f} ms  "
+            f"p99={percentile(samples, 99):8.1f} ms  max={max(samples):8.1f} ms"
+        )
+
+
+def bench_transport(burst: int = 16, rounds: int = 20) -> None:
+    """同時バースト（両サイドの発注・キャンセル相当）のレイテンシ: HTTP/1.1 vs HTTP/2."""
+    asyncio.run(_bench_transport(burst, rounds))
+
+
+BENCHMARKS: dict[str, Callable[[], None]] = {
+    "signing": bench_signing,
+    "startup": bench_startup,
+    "body": bench_body,
+    "decode": bench_decode,
+    "ws": bench_ws,
+    "cancel": bench_cancel,
+    "connect": bench_connect,
+    "transport": bench_transport,
+}
+
+
+def main() -> None:
+    """エントリーポイント."""
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            sys.exit(1)
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""モック取引所に対するオフライン負荷試験（ネットワーク不要）.
+
+Usage:
+    python scripts/load_test.py [--seconds 10] [--ticks-per-second 2000] [--latency-ms 5]
+        [--strategy adaptive] [--trace-phases] ...
+
+モック取引所を起動し、WebSocket・HTTPクライアントと OrderManager を接続して
+両サイドにクォートを出し、価格更新ごとに約定回避・再配置の判断を実行する。
+--seed を指定すると価格系列・注入する遅延とエラーが再現可能になる。
+"""
+
+import argparse
+import asyncio
+import contextlib
+import time
+from collections import Counter
+from typing import Any
+
+from standx_mm_bot.client import APIError, StandXHTTPClient, StandXWebSocketClient
+from standx_mm_bot.config import Settings
+from standx_mm_bot.core.distance import calculate_distance_bps, calculate_target_price
+from standx_mm_bot.core.escape import should_escape
+from standx_mm_bot.core.order import OrderManager
+from standx_mm_bot.mock_exchange import MockExchange, MockExchangeConfig
+from standx_mm_bot.models import Order, Side
+
+# テスト用鍵（負荷試験専用、実資金なし）
+LOAD_TEST_PRIVATE_KEY = "0x" + "a" * 64
+
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数を解析."""
+    parser = argparse.ArgumentParser(description="Offline load test against the mock exchange")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--ticks-per-second", type=float, default=2000.0)
+    parser.add_argument("--volatility-bps", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--strategy", choices=["place_first", "cancel_first", "adaptive"], default="place_first"
+    )
+    parser.add_argument(
+        "--trace-phases", action="store_true", help="break request latency into phases"
+    )
+    return parser.parse_args()
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """パーセンタイルを計算 (q: 0-100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class QuotingLoop:
+    """両サイドのクォートを維持する最小限の戦略."""
+
+    def __init__(self, manager: OrderManager, config: Settings):
+        self.manager = manager
+        self.config = config
+        self.orders: dict[Side, Order] = {}
+        self.ticks = 0
+        self.escapes = 0
+        self.repositions = 0
+        self.fills = 0
+        self.errors: Counter[str] = Counter()
+        self.decision_ms: list[float] = []
+
+    async def on_order(self, data: dict[str, Any]) -> None:
+        """約定した注文を外し、次の価格更新で出し直す."""
+        if data.get("status") != "FILLED":
+            return
+        for side, order in list(self.orders.items()):
+            if data.get("cl_ord_id") in (order.id, order.client_order_id):
+                del self.orders[side]
+                self.fills += 1
+
+    async def on_price(self, data: dict[str, Any]) -> None:
+        """価格更新ごとに各サイドを判断."""
+        self.ticks += 1
+        mark_price = float(data["mark_price"])
+        for side in (Side.BUY, Side.SELL):
+            started = time.perf_counter()
+            order = self.orders.get(side)
+            if order is None:
+                target = calculate_target_price(mark_price, side, self.config.target_distance_bps)
+                try:
+                    self.orders[side] = await self.manager.place_order(
+                        side, round(target, 2), self.config.order_size
+                    )
+                except APIError as e:
+                    self.errors[str(e)[:60]] += 1
+                self.decision_ms.append((time.perf_counter() - started) * 1000)
+                continue
+
+            target = calculate_target_price(mark_price, side, self.config.target_distance_bps)
+            escape = should_escape(mark_price, order.price, side, self.config.escape_threshold_bps)
+            if escape:
+                self.escapes += 1
+                target = calculate_target_price(
+                    mark_price, side, self.config.outer_escape_distance_bps
+                )
+            elif (
+                calculate_distance_bps(order.price, target) <= self.config.price_move_threshold_bps
+            ):
+                continue
+            else:
+                self.repositions += 1
+
+            try:
+                self.orders[side] = await self.manager.reposition_order(
+                    order.id, round(target, 2), side, self.config.order_size, escape=escape
+                )
+            except APIError as e:
+                self.errors[str(e)[:60]] += 1
+            self.decision_ms.append((time.perf_counter() - started) * 1000)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """負荷試験を実行."""
+    exchange_config = MockExchangeConfig(
+        mark_prices={"ETH-USD": 3000.0},
+        ticks_per_second=args.ticks_per_second,
+        volatility_bps=args.volatility_bps,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+    )
+    async with MockExchange(exchange_config) as exchange:
+        config = Settings(
+            _env_file=None,
+            standx_private_key=LOAD_TEST_PRIVATE_KEY,
+            standx_wallet_address="0x1234567890abcdef",
+            standx_chain="bsc",
+            standx_request_signing_key=LOAD_TEST_PRIVATE_KEY,
+            standx_api_url=exchange.base_url,
+            standx_auth_url=exchange.base_url,
+            standx_ws_url=exchange.ws_url,
+            symbol="ETH-USD",
+            jwt_cache_path=None,
+            http_metrics_log_seconds=0,
+            http_trace_phases=args.trace_phases,
+            order_update_strategy=args.strategy,
+            rate_limit_per_second=1000,
+            rate_limit_burst=100,
+        )
+        async with StandXHTTPClient(config) as http, OrderManager(http, config) as manager:
+            strategy = QuotingLoop(manager, config)
+            await manager.refresh_balance()
+            mark_price = float((await http.get_symbol_price("ETH-USD"))["mark_price"])
+            results = await manager.place_quotes(
+                [
+                    (side, round(calculate_target_price(mark_price, side, 8.0), 2), 0.001)
+                    for side in (Side.BUY, Side.SELL)
+                ]
+            )
+            strategy.orders = {r.side: r.order for r in results if r.order is not None}
+            # 価格と注文イベントはチャンネルごとのコンシューマーで処理される（価格は最新のみ）
+
+            ws = StandXWebSocketClient(config)
+            ws.on_price_update(strategy.on_price)
+            ws.on_order_update(http.handle_order_event)
+            ws.on_order_update(manager.handle_order_event)
+            ws.on_order_update(strategy.on_order)
+            ws_task = asyncio.create_task(ws.connect())
+            started_ticks = exchange.ticks
+            started = time.perf_counter()
+            await asyncio.sleep(args.seconds)
+            elapsed = time.perf_counter() - started
+            sent_ticks = exchange.ticks - started_ticks
+            processed_ticks = strategy.ticks
+            queue_stats = ws.queue_stats()
+            await ws.disconnect()
+            ws_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await ws_task
+            flatten_started = time.perf_counter()
+            flattened = await manager.cancel_all()
+            flatten_ms = (time.perf_counter() - flatten_started) * 1000
+            metrics = http.request_metrics.format_summary()
+
+    print(f"load test: {elapsed:.1f}s at {args.ticks_per_second:.0f} ticks/s (mock exchange)")
+    print(f"  ticks sent:        {sent_ticks:8d} ({sent_ticks / elapsed:8.0f}/s)")
+    print(f"  ticks processed:   {processed_ticks:8d} ({processed_ticks / elapsed:8.0f}/s)")
+    for channel, stats in queue_stats.items():
+        print(
+            f"  {channel + ' queue:':<19}received={stats['received']} "
+            f"dropped={stats['dropped']} max_depth={stats['max_depth']}"
+        )
+    print(f"  escapes:           {strategy.escapes:8d}")
+    print(f"  repositions:       {strategy.repositions:8d}")
+    print(f"  fills:             {strategy.fills:8d}")
+    print(f"  errors:            {strategy.errors.total():8d}")
+    for message, count in strategy.errors.most_common(3):
+        print(f"    {count:6d}  {message}")
+    print(
+        f"  decision latency:  p50={percentile(strategy.decision_ms, 50):.2f} ms  "
+        f"p99={percentile(strategy.decision_ms, 99):.2f} ms"
+    )
+    print(
+        f"  cancel_all:        {sum(r.ok for r in flattened)}/{len(flattened)} orders "
+        f"in {flatten_ms:.1f} ms"
+    )
+    print(f"  exchange:          {exchange.snapshot()}")
+    if metrics:
+        print("  request latency:")
+        for line in metrics.splitlines():
+            print(f"    {line}")
+
+
+def main() -> None:
+    """エントリーポイント."""
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""記録したWebSocket通信の再生（ネットワーク不要）.
+
+Usage:
+    python scripts/replay.py <記録ファイル> [--speed 1.0] [--max] [--direct]
+
+CAPTURE_PATH で記録したファイルのWebSocketフレームを StandXWebSocketClient に
+流し込み、スループットとチャンネル別キューの統計（置き換えた price の件数など）を
+表示する。--max を指定すると記録時の間隔を無視して最速で再生する。
+--direct を指定するとキューを経由せずにディスパッチし、フレームごとの
+コールバック所要時間を表示する。
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from standx_mm_bot.client import StandXWebSocketClient
+from standx_mm_bot.client.capture import read_capture
+from standx_mm_bot.client.replay import WebSocketReplayer
+from standx_mm_bot.config import Settings
+
+# テスト用鍵（再生専用、実資金なし）
+REPLAY_PRIVATE_KEY = "0x" + "a" * 64
+
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数を解析."""
+    parser = argparse.ArgumentParser(description="Replay captured WebSocket traffic")
+    parser.add_argument("path", help="capture file (.jsonl or .jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=1.0, help="playback speed multiplier")
+    parser.add_argument("--max", action="store_true", help="replay as fast as possible")
+    parser.add_argument(
+        "--direct",
+        action="store_true",
+        help="dispatch inline without the channel queues (per-frame callback latency)",
+    )
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    """再生を実行."""
+    records = list(read_capture(args.path))
+    config = Settings(
+        _env_file=None,
+        standx_private_key=REPLAY_PRIVATE_KEY,
+        standx_wallet_address="0x1234567890abcdef",
+        standx_chain="bsc",
+        standx_request_signing_key=REPLAY_PRIVATE_KEY,
+        jwt_cache_path=None,
+    )
+    client = StandXWebSocketClient(config)
+    channels: Counter[str] = Counter()
+
+    def counter(channel: str) -> Callable[[dict[str, Any]], Awaitable[None]]:
+        async def callback(_data: dict[str, Any]) -> None:
+            channels[channel] += 1
+
+        return callback
+
+    client.on_price_update(counter("price"))
+    client.on_order_update(counter("order"))
+    client.on_trade(counter("trade"))
+
+    replayer = WebSocketReplayer(client, records)
+    speed = None if args.max else args.speed
+    mode = "max speed" if speed is None else f"{speed:g}x"
+    path = "direct" if args.direct else "queued"
+    print(f"replaying {len(replayer.frames)} frames from {args.path} ({mode}, {path})")
+    stats = (await replayer.run(speed=speed, direct=args.direct)).snapshot()
+
+    http_records = sum(1 for r in records if r.get("k") == "http")
+    print(f"  frames:            {stats['frames']:8d} ({stats['frames_per_second']:8.0f}/s)")
+    print(f"  recorded span:     {stats['recorded_span']:8.3f} s")
+    print(f"  elapsed:           {stats['elapsed']:8.3f} s")
+    print(f"  errors:            {stats['errors']:8d}")
+    for channel, count in sorted(channels.items()):
+        print(f"  {channel + ':':<19}{count:8d}")
+    print(f"  http records:      {http_records:8d} (not replayed)")
+    if args.direct:
+        dispatch = stats["dispatch"]
+        print(
+            f"  dispatch latency:  p50={dispatch['p50_ms']:.3f} ms  "
+            f"p99={dispatch['p99_ms']:.3f} ms  max={dispatch['max_ms']:.3f} ms"
+        )
+    for channel, queue in stats["queues"].items():
+        print(
+            f"  queue {channel + ':':<13}received={queue['received']} "
+            f"dropped={queue['dropped']} max_depth={queue['max_depth']}"
+        )
+
+
+def main() -> None:
+    """エントリーポイント."""
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
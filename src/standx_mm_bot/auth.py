@@ -1,15 +1,24 @@
-"""StandX API認証モジュール."""
+"""StandX API認証モジュール.
+
+eth_account (BSCのJWTログイン専用) は依存ツリーが大きいため、
+起動時間を短縮するよう使用時に遅延インポートする。
+"""
 
 import base64
 import json
+import logging
 import time
 import uuid
+from collections.abc import Callable
 from typing import Any
 
-from eth_account import Account
-from eth_account.messages import encode_defunct
 from nacl.signing import SigningKey
 
+logger = logging.getLogger(__name__)
+
+# リクエスト署名バージョン
+REQUEST_SIGN_VERSION = "v1"
+
 
 def sign_message(private_key: str, message: str) -> str:
     """
@@ -96,6 +105,10 @@ def sign_message_evm(private_key: str, message: str) -> str:
     Returns:
         str: 16進数署名（0x付き）
     """
+    # eth-account はBSCログイン時のみ必要なため遅延インポート
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+
     # eth-account.Account を使用して署名
     account = Account.from_key(private_key)
 
@@ -130,12 +143,8 @@ def generate_request_signature(
     Returns:
         tuple: (署名ヘッダー, ボディ文字列)
     """
-    import logging
-
-    logger = logging.getLogger(__name__)
-
     # リクエストパラメータ
-    version = "v1"
+    version = REQUEST_SIGN_VERSION
     request_id = str(uuid.uuid4())
     timestamp = str(int(time.time() * 1000))  # ミリ秒
 
@@ -163,6 +172,76 @@ def generate_request_signature(
     return headers, payload
 
 
+class RequestSigner:
+    """
+    APIリクエスト署名器（Ed25519鍵を一度だけパースして再利用）.
+
+    ``generate_request_signature`` はリクエスト毎に hex デコードと
+    SigningKey 生成を行うため、発注・キャンセルの多いホットパスでは
+    このクラスをクライアントの寿命と同じだけ保持して使う。
+    """
+
+    __slots__ = ("_clock", "_signing_key", "_version", "_version_prefix")
+
+    def __init__(
+        self,
+        private_key: str,
+        version: str = REQUEST_SIGN_VERSION,
+        clock: Callable[[], int] | None = None,
+    ):
+        """
+        署名器を初期化.
+
+        Args:
+            private_key: 秘密鍵（hex形式、0xプレフィックス可）
+            version: 署名バージョン
+            clock: タイムスタンプ (UNIXミリ秒) を返す関数（省略時はローカル時刻）
+
+        Raises:
+            ValueError: 秘密鍵が不正な場合
+        """
+        self._signing_key = SigningKey(bytes.fromhex(private_key.removeprefix("0x")))
+        self._version = version
+        self._version_prefix = (version + ",").encode("ascii")
+        self._clock = clock
+
+    @property
+    def version(self) -> str:
+        """署名バージョン."""
+        return self._version
+
+    def sign(self, payload: bytes = b"") -> dict[str, str]:
+        """
+        リクエストに署名し、署名ヘッダーを返す.
+
+        Args:
+            payload: 送信するボディのバイト列（GETの場合は空）。
+                このバイト列をそのまま送信すること。
+
+        Returns:
+            dict: 署名ヘッダー (x-request-*)
+        """
+        request_id = str(uuid.uuid4())
+        # ミリ秒（サーバー時刻補正がある場合はそれを使用）
+        timestamp = str(self._clock() if self._clock else int(time.time() * 1000))
+
+        # 署名メッセージ: "{version},{id},{timestamp},{payload}"
+        message = b"%b%b,%b,%b" % (
+            self._version_prefix,
+            request_id.encode("ascii"),
+            timestamp.encode("ascii"),
+            payload,
+        )
+        signature = self._signing_key.sign(message).signature
+
+        return {
+            "x-request-sign-version": self._version,
+            "x-request-id": request_id,
+            "x-request-timestamp": timestamp,
+            "x-request-signature": base64.b64encode(signature).decode("ascii"),
+        }
+
+
 def generate_auth_headers(
     jwt_token: str,
     private_key: str,
@@ -1,9 +1,11 @@
 """クライアントモジュール."""
 
+from standx_mm_bot.client.breaker import CircuitOpenError, CircuitState
 from standx_mm_bot.client.exceptions import (
     APIError,
     AuthenticationError,
     NetworkError,
+    RateLimitError,
 )
 from standx_mm_bot.client.http import StandXHTTPClient
 from standx_mm_bot.client.websocket import StandXWebSocketClient
@@ -14,4 +16,7 @@ __all__ = [
     "APIError",
     "AuthenticationError",
     "NetworkError",
+    "RateLimitError",
+    "CircuitOpenError",
+    "CircuitState",
 ]
@@ -0,0 +1,223 @@
+"""サーキットブレーカーと適応タイムアウト.
+
+取引所の障害時（連続したタイムアウト・5xx）はブレーカーを開いて即座に
+失敗させ、応答しないリクエストが注文ロックを握ったまま積み上がるのを防ぐ。
+一定時間後に半開状態で少数の試行リクエストを通し、成功すれば閉じる。
+
+タイムアウトはエンドポイントごとに、成功したリクエストのレイテンシの
+パーセンタイル × 倍率から求める（サンプル不足時は上限値）。
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from enum import Enum
+
+from standx_mm_bot.client.exceptions import NetworkError
+from standx_mm_bot.client.metrics import RequestMetrics
+
+logger = logging.getLogger(__name__)
+
+# タイムアウトを再計算するまでの成功サンプル数
+_TIMEOUT_RECOMPUTE_SAMPLES = 16
+
+
+class CircuitState(str, Enum):
+    """ブレーカー状態."""
+
+    CLOSED = "CLOSED"  # 通常
+    OPEN = "OPEN"  # 遮断中（即座に失敗）
+    HALF_OPEN = "HALF_OPEN"  # 試行中
+
+
+class CircuitOpenError(NetworkError):
+    """ブレーカーが開いているため送信しなかった."""
+
+    def __init__(self, message: str = "", retry_in: float = 0.0):
+        """
+        Args:
+            message: エラーメッセージ
+            retry_in: 半開状態に移行するまでの秒数
+        """
+        super().__init__(message, request_sent=False)
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    連続失敗回数によるサーキットブレーカー.
+
+    状態変化は ``on_state_change()`` で登録したコールバックに通知される
+    （戦略側が防御モードに切り替えるため）。
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_timeout: float = 5.0, half_open_max: int = 1
+    ):
+        """
+        ブレーカーを初期化.
+
+        Args:
+            failure_threshold: 開くまでの連続失敗回数
+            reset_timeout: 開いてから半開に移行するまでの秒数
+            half_open_max: 半開状態で同時に通す試行リクエスト数
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0  # time.monotonic()
+        self._probes = 0
+        self._listeners: list[Callable[[CircuitState], None]] = []
+        self._opened_count = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """現在の状態（開いてから reset_timeout 経過後は半開として扱う）."""
+        if self._state == CircuitState.OPEN and self._retry_in() <= 0:
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    def on_state_change(self, callback: Callable[[CircuitState], None]) -> None:
+        """
+        状態変化時のコールバックを登録.
+
+        Args:
+            callback: 新しい状態を受け取る関数
+        """
+        self._listeners.append(callback)
+
+    def before_request(self) -> None:
+        """
+        送信前に呼び出す.
+
+        Raises:
+            CircuitOpenError: ブレーカーが開いている、または半開で試行枠がない
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return
+        if state == CircuitState.HALF_OPEN and self._probes < self.half_open_max:
+            self._probes += 1
+            return
+        self._rejected += 1
+        retry_in = max(0.0, self._retry_in())
+        raise CircuitOpenError(f"Circuit open, retry in {retry_in:.1f}s", retry_in=retry_in)
+
+    def record_success(self) -> None:
+        """送信成功（サーバーが応答した）を記録."""
+        self._failures = 0
+        if self._state != CircuitState.CLOSED:
+            self._probes = 0
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """送信失敗（タイムアウト・ネットワークエラー・5xx）を記録."""
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or (
+            self._state == CircuitState.CLOSED and self._failures >= self.failure_threshold
+        ):
+            self._probes = 0
+            self._opened_at = time.monotonic()
+            self._opened_count += 1
+            self._set_state(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """結果を記録せずに終わった送信（中断）の試行枠を返す."""
+        if self._state == CircuitState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def snapshot(self) -> dict[str, object]:
+        """
+        メトリクスのスナップショット.
+
+        Returns:
+            dict: state, consecutive_failures, opened, rejected
+        """
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "opened": self._opened_count,
+            "rejected": self._rejected,
+        }
+
+    def _retry_in(self) -> float:
+        return self._opened_at + self.reset_timeout - time.monotonic()
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state == self._state:
+            return
+        logger.warning(f"Circuit breaker {self._state.value} -> {state.value}")
+        self._state = state
+        for callback in self._listeners:
+            try:
+                callback(state)
+            except Exception as e:
+                logger.error(f"Error in circuit breaker callback: {e}")
+
+
+class AdaptiveTimeouts:
+    """成功レイテンシのパーセンタイルから求めるエンドポイント別タイムアウト."""
+
+    def __init__(
+        self,
+        metrics: RequestMetrics,
+        percentile: float = 99.0,
+        multiplier: float = 4.0,
+        min_timeout: float = 0.5,
+        max_timeout: float = 10.0,
+        min_samples: int = 20,
+    ):
+        """
+        タイムアウト計算器を初期化.
+
+        Args:
+            metrics: レイテンシの記録元
+            percentile: 基準とするパーセンタイル
+            multiplier: パーセンタイル値に掛ける倍率
+            min_timeout: タイムアウト下限（秒）
+            max_timeout: タイムアウト上限（秒、サンプル不足時もこの値）
+            min_samples: パーセンタイルを使い始めるサンプル数
+        """
+        self._metrics = metrics
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        # エンドポイント -> (計算時のサンプル数, タイムアウト)
+        self._cache: dict[str, tuple[int, float]] = {}
+
+    def timeout(self, endpoint: str) -> float:
+        """
+        エンドポイントのタイムアウト.
+
+        Args:
+            endpoint: エンドポイントパス（クエリ文字列なし）
+
+        Returns:
+            float: タイムアウト（秒）
+        """
+        histogram = self._metrics.success_histogram(endpoint)
+        if histogram is None or histogram.count < self.min_samples:
+            return self.max_timeout
+
+        cached = self._cache.get(endpoint)
+        if cached is not None and histogram.count - cached[0] < _TIMEOUT_RECOMPUTE_SAMPLES:
+            return cached[1]
+
+        value = histogram.percentile(self.percentile) * self.multiplier
+        timeout = min(self.max_timeout, max(self.min_timeout, value))
+        self._cache[endpoint] = (histogram.count, timeout)
+        return timeout
+
+    def snapshot(self) -> dict[str, float]:
+        """
+        メトリクスのスナップショット.
+
+        Returns:
+            dict: エンドポイントごとの現在のタイムアウト（秒）
+        """
+        return {endpoint: timeout for endpoint, (_, timeout) in self._cache.items()}
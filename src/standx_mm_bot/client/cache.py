@@ -0,0 +1,121 @@
+"""読み取りAPIのTTLキャッシュとシングルフライト.
+
+同じ照会が同時に複数発生した場合は1回の送信を共有し、結果をTTLの間
+キャッシュする。注文・約定イベントで関連キーを無効化する。
+
+キャッシュした値（dict）は呼び出し元間で共有されるため、変更しないこと。
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float  # time.monotonic()
+
+
+@dataclass
+class CacheStats:
+    """エンドポイントごとのキャッシュ統計."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    invalidations: int = 0
+
+
+class ReadCache:
+    """TTLキャッシュ + シングルフライト."""
+
+    def __init__(self) -> None:
+        """キャッシュを初期化."""
+        self._entries: dict[str, _Entry] = {}
+        self._inflight: dict[str, asyncio.Task[Any]] = {}
+        self._stats: dict[str, CacheStats] = {}
+
+    async def get(self, key: str, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        キャッシュから取得、なければ取得処理を実行（同時呼び出しは1回に集約）.
+
+        Args:
+            key: キャッシュキー（リクエストパス）
+            ttl: キャッシュ有効期間（秒、0以下ならキャッシュせず集約のみ）
+            fetch: 取得処理
+
+        Returns:
+            Any: 取得結果
+        """
+        stats = self._stats_for(key)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                stats.hits += 1
+                return entry.value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            stats.coalesced += 1
+        else:
+            stats.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, ttl, t))
+
+        # 1呼び出し元のキャンセルで共有中の取得を止めない
+        return await asyncio.shield(task)
+
+    def invalidate(self, *prefixes: str) -> None:
+        """
+        指定プレフィックスに一致するキーを無効化.
+
+        取得中のリクエストは結果をキャッシュせず、以降の呼び出しは新たに取得する。
+
+        Args:
+            prefixes: 無効化するキーのプレフィックス（パス）
+        """
+        for key in {k for k in (*self._entries, *self._inflight) if k.startswith(prefixes)}:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+            self._stats_for(key).invalidations += 1
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """
+        メトリクスのスナップショット.
+
+        Returns:
+            dict: エンドポイント（クエリ文字列を除いたパス）ごとの hits/misses/coalesced/invalidations
+        """
+        result: dict[str, dict[str, int]] = {}
+        for key, stats in self._stats.items():
+            endpoint = result.setdefault(
+                key.partition("?")[0],
+                {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0},
+            )
+            endpoint["hits"] += stats.hits
+            endpoint["misses"] += stats.misses
+            endpoint["coalesced"] += stats.coalesced
+            endpoint["invalidations"] += stats.invalidations
+        return result
+
+    def _stats_for(self, key: str) -> CacheStats:
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = CacheStats()
+        return stats
+
+    def _on_done(self, key: str, ttl: float, task: asyncio.Task[Any]) -> None:
+        """取得完了時: 無効化されていなければ結果をキャッシュ."""
+        failed = task.cancelled() or task.exception() is not None
+        if self._inflight.get(key) is not task:
+            # 取得中に無効化された（古い可能性のある結果はキャッシュしない）
+            return
+        del self._inflight[key]
+        if ttl > 0 and not failed:
+            self._entries[key] = _Entry(task.result(), time.monotonic() + ttl)
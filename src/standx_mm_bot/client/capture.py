@@ -0,0 +1,210 @@
+"""HTTP・WebSocket通信の記録.
+
+本番で受信した通信をそのまま再生して障害を再現したり、実際の相場で判断パスの
+性能を測るため、RESTのリクエスト・レスポンスとWebSocketのフレームを時刻付きで
+1行1レコードのJSONに記録する（``.gz`` で終わるパスはgzip圧縮）。
+
+レコード形式（キーは短縮形）:
+
+- ``{"t": 経過秒, "k": "http", "m": メソッド, "u": URL, "q": リクエストボディ,
+  "s": ステータス, "h": レスポンスヘッダー, "b": レスポンスボディ}``
+  （通信エラーの場合は s/h/b の代わりに ``"e": メッセージ, "n": 送信済みか``）
+- ``{"t": 経過秒, "k": "ws", "d": フレーム}``
+- ``{"t": 0, "k": "start", "time": UNIX秒}``（記録開始ごと。経過秒はここから数える）
+
+リクエストヘッダー（JWT・署名）は記録しない。
+"""
+
+import gzip
+import json
+import logging
+import time
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import IO, Any, ClassVar
+
+from standx_mm_bot.client.exceptions import NetworkError
+from standx_mm_bot.client.transport import Transport, TransportResponse
+
+logger = logging.getLogger(__name__)
+
+# バッファを書き出す間隔（秒）
+_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+def _open(path: Path, append: bool) -> IO[str]:
+    """拡張子に応じて通常ファイルまたはgzipファイルを開く（追記または読み込み）."""
+    if path.suffix == ".gz":
+        if append:
+            return gzip.open(path, "at", encoding="utf-8")
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("a" if append else "r", encoding="utf-8")
+
+
+class TrafficRecorder:
+    """
+    通信の記録先.
+
+    HTTPクライアントとWebSocketクライアントが同じファイルに記録できるよう、
+    ``shared()`` でパスごとに1つのインスタンスを共有し、``release()`` で閉じる。
+    """
+
+    _instances: ClassVar[dict[Path, "TrafficRecorder"]] = {}
+
+    def __init__(self, path: str | Path):
+        """
+        記録ファイルを開く（追記）.
+
+        Args:
+            path: 記録ファイルのパス
+        """
+        self.path = Path(path)
+        self._file = _open(self.path, append=True)
+        self._started = time.monotonic()
+        self._flushed_at = self._started
+        self._users = 0
+        self.records = 0
+        self._write({"t": 0.0, "k": "start", "time": time.time()})
+
+    @classmethod
+    def shared(cls, path: str | Path) -> "TrafficRecorder":
+        """
+        パスごとに共有される記録先を取得（使用後は release() を呼ぶ）.
+
+        Args:
+            path: 記録ファイルのパス
+
+        Returns:
+            TrafficRecorder: 記録先
+        """
+        key = Path(path).resolve()
+        recorder = cls._instances.get(key)
+        if recorder is None:
+            recorder = cls._instances[key] = cls(path)
+            logger.info(f"Capturing HTTP/WebSocket traffic to {path}")
+        recorder._users += 1
+        return recorder
+
+    def release(self) -> None:
+        """共有の利用を終了（最後の利用者で閉じる）."""
+        self._users -= 1
+        if self._users <= 0:
+            self._instances.pop(self.path.resolve(), None)
+            self.close()
+
+    def record_http(
+        self,
+        method: str,
+        url: str,
+        body: bytes,
+        response: TransportResponse | None = None,
+        error: NetworkError | None = None,
+    ) -> None:
+        """
+        RESTのリクエストと結果を記録.
+
+        Args:
+            method: HTTPメソッド
+            url: リクエストURL
+            body: リクエストボディ
+            response: レスポンス（通信エラーの場合はNone）
+            error: 通信エラー
+        """
+        record: dict[str, Any] = {
+            "t": self._elapsed(),
+            "k": "http",
+            "m": method,
+            "u": url,
+            "q": body.decode("utf-8", errors="replace"),
+        }
+        if response is not None:
+            record["s"] = response.status
+            record["h"] = dict(response.headers)
+            record["b"] = response.text()
+        elif error is not None:
+            record["e"] = str(error)
+            record["n"] = error.request_sent
+        self._write(record)
+
+    def record_ws(self, frame: str | bytes) -> None:
+        """
+        受信したWebSocketフレームを記録.
+
+        Args:
+            frame: 受信フレーム
+        """
+        data = frame.decode("utf-8", errors="replace") if isinstance(frame, bytes) else frame
+        self._write({"t": self._elapsed(), "k": "ws", "d": data})
+
+    def flush(self) -> None:
+        """バッファを書き出す."""
+        if not self._file.closed:
+            self._file.flush()
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        """記録ファイルを閉じる."""
+        if not self._file.closed:
+            self._file.close()
+
+    def _elapsed(self) -> float:
+        return round(time.monotonic() - self._started, 6)
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._file.closed:
+            return
+        self._file.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self.records += 1
+        if time.monotonic() - self._flushed_at >= _FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+
+class RecordingTransport:
+    """送受信を記録するトランスポート（内側のトランスポートに委譲）."""
+
+    def __init__(self, inner: Transport, recorder: TrafficRecorder):
+        """
+        Args:
+            inner: 実際に送受信するトランスポート
+            recorder: 記録先
+        """
+        self.inner = inner
+        self.recorder = recorder
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        timeout: float,
+    ) -> TransportResponse:
+        """リクエストを送信して記録."""
+        try:
+            response = await self.inner.request(method, url, headers, body, timeout)
+        except NetworkError as e:
+            self.recorder.record_http(method, url, body, error=e)
+            raise
+        self.recorder.record_http(method, url, body, response)
+        return response
+
+    async def close(self) -> None:
+        """内側のトランスポートを閉じ、記録の利用を終了."""
+        await self.inner.close()
+        self.recorder.release()
+
+
+def read_capture(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    記録ファイルを読み込む.
+
+    Args:
+        path: 記録ファイルのパス
+
+    Yields:
+        dict: レコード（記録順）
+    """
+    with _open(Path(path), append=False) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
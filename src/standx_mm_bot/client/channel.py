@@ -0,0 +1,110 @@
+"""WebSocket受信とコールバックの間のチャンネル別キュー.
+
+受信ループはメッセージをキューに積むだけで、コールバックはチャンネルごとの
+コンシューマータスクが実行する。遅いコールバック（再配置中の OrderManager の
+ロック待ちなど）があっても受信ループは止まらない。
+
+- conflate=True（price）: 未処理のメッセージは最新の1件だけ保持する。
+  置き換えたメッセージは dropped に数える
+- conflate=False（order / trade）: 全件を受信順に保持する
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class ChannelQueueStats:
+    """チャンネルキューの統計."""
+
+    received: int = 0
+    dropped: int = 0  # 新しいメッセージで置き換えた件数（conflate時のみ）
+    max_depth: int = 0
+
+
+class ChannelQueue:
+    """チャンネル1つ分の受信キュー."""
+
+    def __init__(self, conflate: bool = False):
+        """
+        キューを初期化.
+
+        Args:
+            conflate: 未処理のメッセージを最新の1件に置き換えるか
+        """
+        self.conflate = conflate
+        self._items: deque[dict[str, Any]] = deque(maxlen=1 if conflate else None)
+        self._ready = asyncio.Event()
+        # 取り出して処理が終わっていない件数（置き換えで捨てた分は数えない）
+        self._unfinished = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.stats = ChannelQueueStats()
+
+    @property
+    def depth(self) -> int:
+        """未処理のメッセージ数."""
+        return len(self._items)
+
+    def put(self, item: dict[str, Any]) -> None:
+        """
+        メッセージを積む（待たない）.
+
+        Args:
+            item: メッセージのdata部
+        """
+        self.stats.received += 1
+        if self.conflate and self._items:
+            self.stats.dropped += 1
+        else:
+            self._unfinished += 1
+            self._idle.clear()
+        self._items.append(item)
+        if len(self._items) > self.stats.max_depth:
+            self.stats.max_depth = len(self._items)
+        self._ready.set()
+
+    async def get(self) -> dict[str, Any]:
+        """
+        次のメッセージを取り出す（なければ待つ）.
+
+        Returns:
+            dict: メッセージのdata部
+        """
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+    def task_done(self) -> None:
+        """get() で取り出したメッセージの処理完了を通知."""
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._idle.set()
+
+    async def join(self) -> None:
+        """積んだメッセージがすべて処理される（task_done() される）まで待つ."""
+        await self._idle.wait()
+
+    def clear(self) -> None:
+        """未処理のメッセージを破棄（統計は残す）."""
+        self._items.clear()
+        self._unfinished = 0
+        self._idle.set()
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        統計のスナップショット.
+
+        Returns:
+            dict: depth, max_depth, received, dropped
+        """
+        return {
+            "depth": self.depth,
+            "max_depth": self.stats.max_depth,
+            "received": self.stats.received,
+            "dropped": self.stats.dropped,
+        }
@@ -0,0 +1,167 @@
+"""取引所との時刻オフセット推定.
+
+リクエスト署名の x-request-timestamp をサーバー時刻に合わせるため、
+既存のレスポンスから得られる時刻情報でローカル時計とのオフセットを推定する。
+
+各サンプルは「オフセットが取り得る範囲」として扱う:
+
+- HTTP ``Date`` ヘッダー (秒精度): サーバー時刻は [D, D + 1000) ms、
+  応答はリクエスト送信〜受信の間に生成されるため
+  offset ∈ [D - received, D + 1000 - sent]
+- WebSocketメッセージの時刻 T (片方向): 受信前に生成されるため
+  offset ≥ T - received
+
+新しいサンプルから順に範囲の共通部分を取り、その中点を推定値とする。
+共通部分が空になった時点（時計のドリフト）より古いサンプルは使わない。
+"""
+
+import math
+import time
+from collections import deque
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+# HTTP Dateヘッダーの分解能 (ms)
+HTTP_DATE_RESOLUTION_MS = 1000.0
+
+
+def parse_server_time_ms(value: Any) -> float | None:
+    """
+    サーバー時刻表現をUNIXミリ秒に変換.
+
+    Args:
+        value: UNIX秒/ミリ秒の数値、またはISO 8601文字列
+
+    Returns:
+        float | None: UNIXミリ秒（解釈できない場合はNone）
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        # 1e11未満はUNIX秒とみなす（ミリ秒なら1973年以前になるため）
+        return float(value) * 1000 if value < 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000
+        except ValueError:
+            return None
+    return None
+
+
+class ClockSync:
+    """
+    サーバー時刻オフセット・RTT推定器.
+
+    ``now_ms()`` はオフセット補正済みの現在時刻を返し、推定前はローカル時刻を返す。
+    """
+
+    def __init__(self, window: int = 64, rtt_alpha: float = 0.2):
+        """
+        推定器を初期化.
+
+        Args:
+            window: 保持するサンプル数
+            rtt_alpha: RTT指数移動平均の係数
+        """
+        self._samples: deque[tuple[float, float]] = deque(maxlen=window)
+        self._rtt_alpha = rtt_alpha
+        self._offset_ms: float | None = None
+        self._uncertainty_ms: float | None = None
+        self._rtt_ms: float | None = None
+        self._sample_count = 0
+
+    @property
+    def offset_ms(self) -> float:
+        """推定オフセット (サーバー時刻 - ローカル時刻, ms)."""
+        return self._offset_ms or 0.0
+
+    @property
+    def rtt_ms(self) -> float | None:
+        """推定RTT (ms、HTTPサンプルがない場合はNone)."""
+        return self._rtt_ms
+
+    def now_ms(self) -> int:
+        """
+        サーバー時刻に補正した現在時刻.
+
+        Returns:
+            int: UNIXミリ秒
+        """
+        return int(time.time() * 1000 + self.offset_ms)
+
+    def observe_http_date(self, date_header: str, sent_at_ms: float, received_at_ms: float) -> None:
+        """
+        HTTPレスポンスのDateヘッダーからサンプルを追加.
+
+        Args:
+            date_header: Dateヘッダー値 (RFC 7231)
+            sent_at_ms: リクエスト送信時のローカル時刻 (UNIXミリ秒)
+            received_at_ms: レスポンス受信時のローカル時刻 (UNIXミリ秒)
+        """
+        try:
+            server_ms = parsedate_to_datetime(date_header).timestamp() * 1000
+        except (TypeError, ValueError):
+            return
+
+        self._observe_rtt(received_at_ms - sent_at_ms)
+        self._add_sample(
+            server_ms - received_at_ms,
+            server_ms + HTTP_DATE_RESOLUTION_MS - sent_at_ms,
+        )
+
+    def observe_server_time(self, server_ms: float, received_at_ms: float) -> None:
+        """
+        片方向メッセージ（WebSocket等）のサーバー時刻からサンプルを追加.
+
+        Args:
+            server_ms: メッセージ内のサーバー時刻 (UNIXミリ秒)
+            received_at_ms: 受信時のローカル時刻 (UNIXミリ秒)
+        """
+        self._add_sample(server_ms - received_at_ms, math.inf)
+
+    def snapshot(self) -> dict[str, float | int | None]:
+        """
+        メトリクスのスナップショット.
+
+        Returns:
+            dict: offset_ms, uncertainty_ms, rtt_ms, samples
+        """
+        return {
+            "offset_ms": self._offset_ms,
+            "uncertainty_ms": self._uncertainty_ms,
+            "rtt_ms": self._rtt_ms,
+            "samples": self._sample_count,
+        }
+
+    def _observe_rtt(self, rtt_ms: float) -> None:
+        """RTTの指数移動平均を更新."""
+        if rtt_ms < 0:
+            return
+        if self._rtt_ms is None:
+            self._rtt_ms = rtt_ms
+        else:
+            self._rtt_ms += self._rtt_alpha * (rtt_ms - self._rtt_ms)
+
+    def _add_sample(self, lower_ms: float, upper_ms: float) -> None:
+        """オフセット範囲サンプルを追加して推定値を更新."""
+        self._samples.append((lower_ms, upper_ms))
+        self._sample_count += 1
+
+        # 新しいサンプルから順に共通部分を取る（矛盾した時点で打ち切り）
+        lower, upper = -math.inf, math.inf
+        for sample_lower, sample_upper in reversed(self._samples):
+            new_lower = max(lower, sample_lower)
+            new_upper = min(upper, sample_upper)
+            if new_lower > new_upper:
+                break
+            lower, upper = new_lower, new_upper
+
+        if math.isinf(upper):
+            # 下限のみ（片方向サンプルのみ）: 下限まで補正し、それ以上は推測しない
+            if self._offset_ms is None or self._offset_ms < lower:
+                self._offset_ms = lower
+            self._uncertainty_ms = None
+        else:
+            self._offset_ms = (lower + upper) / 2
+            self._uncertainty_ms = (upper - lower) / 2
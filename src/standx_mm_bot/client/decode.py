@@ -0,0 +1,207 @@
+"""レスポンスのデコード.
+
+レスポンスのバイト列を直接デコードし（orjsonがあれば使用）、注文・ポジション・
+残高のモデルに変換する。レスポンス形式の違い（キー名の揺れ）はここだけで吸収し、
+呼び出し側はキーを推測しない。
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+from standx_mm_bot.models import Balance, Order, OrderStatus, OrderType, Position, Side
+
+try:
+    import orjson
+
+    loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:  # pragma: no cover - orjson は任意依存
+    loads = json.loads
+
+# 一覧レスポンスで配列を格納するキー
+_LIST_KEYS = ("result", "data")
+
+_SIDES = {"buy": Side.BUY, "sell": Side.SELL, "BUY": Side.BUY, "SELL": Side.SELL}
+_STATUSES = {status.value: status for status in OrderStatus}
+
+
+def _float(value: Any) -> float:
+    """数値・数値文字列をfloatに変換（欠損は0.0）."""
+    if value is None or value == "":
+        return 0.0
+    return float(value)
+
+
+def _status(value: Any) -> OrderStatus:
+    """注文ステータスを変換（不明な値はOPEN）."""
+    if isinstance(value, str):
+        return _STATUSES.get(value.upper(), OrderStatus.OPEN)
+    return OrderStatus.OPEN
+
+
+def _items(data: Any) -> list[Any]:
+    """一覧レスポンス（配列、または result/data に配列を持つオブジェクト）から要素を取り出す."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in _LIST_KEYS:
+            value = data.get(key)
+            if isinstance(value, list):
+                return value
+        return [data]
+    return []
+
+
+def decode_order_ack(
+    data: dict[str, Any], symbol: str, side: Side, price: float, size: float
+) -> Order:
+    """
+    new_order のレスポンスを Order に変換.
+
+    レスポンス形式:
+    ``{"order_id": "xxx", "status": "OPEN", ...}`` または
+    ``{"code": 0, "message": "success", "request_id": "xxx"}``
+    （HTTPクライアントが cl_ord_id を追加している）
+
+    注文IDは order_id → cl_ord_id → request_id の順で採用する。
+
+    Args:
+        data: レスポンスJSON
+        symbol: 取引ペア
+        side: 注文サイド
+        price: 注文価格
+        size: 注文サイズ
+
+    Returns:
+        Order: 注文情報
+    """
+    client_order_id = data.get("cl_ord_id")
+    order_id = data.get("order_id") or client_order_id or data.get("request_id") or "unknown"
+    return Order(
+        id=str(order_id),
+        symbol=symbol,
+        side=side,
+        price=price,
+        size=size,
+        order_type=OrderType.LIMIT,
+        status=_status(data.get("status")),
+        client_order_id=client_order_id,
+    )
+
+
+def decode_open_orders(data: Any, symbol: str) -> list[Order]:
+    """
+    query_open_orders のレスポンスを Order のリストに変換.
+
+    Args:
+        data: レスポンスJSON
+        symbol: 取引ペア（レスポンスに含まれない場合に使用）
+
+    Returns:
+        list[Order]: 未決注文（サイド不明の要素は除外）
+    """
+    orders = []
+    for item in _items(data):
+        side = _SIDES.get(item.get("side", ""))
+        if side is None:
+            continue
+        order_type = OrderType.MARKET if item.get("order_type") == "market" else OrderType.LIMIT
+        orders.append(
+            Order(
+                id=str(item.get("order_id") or item.get("id") or ""),
+                symbol=item.get("symbol") or symbol,
+                side=side,
+                price=_float(item.get("price")),
+                size=_float(item.get("qty") or item.get("size")),
+                order_type=order_type,
+                status=_status(item.get("status")),
+                filled_size=_float(item.get("fill_qty") or item.get("filled_qty")),
+                client_order_id=item.get("cl_ord_id"),
+            )
+        )
+    return orders
+
+
+def decode_position(data: Any, symbol: str) -> Position | None:
+    """
+    query_positions のレスポンスを Position に変換.
+
+    サイズは符号付き（正: ロング、負: ショート）で返される。
+
+    Args:
+        data: レスポンスJSON
+        symbol: 取引ペア
+
+    Returns:
+        Position | None: ポジション（ポジションなし・サイズ0の場合はNone）
+    """
+    for item in _items(data):
+        item_symbol = item.get("symbol") or symbol
+        if item_symbol != symbol:
+            continue
+        size = _float(item.get("qty") if "qty" in item else item.get("size"))
+        if size == 0:
+            continue
+        return Position(
+            symbol=item_symbol,
+            side=Side.BUY if size > 0 else Side.SELL,
+            size=abs(size),
+            entry_price=_float(item.get("entry_price")),
+            unrealized_pnl=_float(item.get("upnl") or item.get("unrealized_pnl")),
+        )
+    return None
+
+
+def decode_cancel_results(data: Any) -> dict[str, tuple[int, str]]:
+    """
+    cancel_orders のレスポンスから注文ごとの結果を取り出す.
+
+    要素の形式: ``{"order_id": "xxx", "code": 0, "message": "..."}``
+    （order_id の代わりに cl_ord_id）。注文ごとの結果を含まないレスポンス
+    （``{"code": 0, "message": "success"}`` のみ）では空の辞書を返す。
+
+    Args:
+        data: レスポンスJSON
+
+    Returns:
+        dict: 注文ID → (code, message)。code 0 は成功
+    """
+    results: dict[str, tuple[int, str]] = {}
+    if not isinstance(data, dict):
+        return results
+    for key in _LIST_KEYS:
+        items = data.get(key)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            order_id = item.get("order_id") or item.get("cl_ord_id")
+            if order_id is None:
+                continue
+            try:
+                code = int(item.get("code") or 0)
+            except (TypeError, ValueError):
+                code = -1
+            results[str(order_id)] = (code, str(item.get("message") or ""))
+        break
+    return results
+
+
+def decode_balance(data: dict[str, Any]) -> Balance:
+    """
+    query_balance のレスポンスを Balance に変換.
+
+    Args:
+        data: レスポンスJSON
+
+    Returns:
+        Balance: 残高情報
+    """
+    return Balance(
+        balance=_float(data.get("balance")),
+        equity=_float(data.get("equity")),
+        available=_float(data.get("cross_available")),
+        locked=_float(data.get("locked")),
+        upnl=_float(data.get("upnl")),
+    )
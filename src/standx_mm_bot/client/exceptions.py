@@ -1,13 +1,68 @@
 """カスタム例外クラス."""
 
+import json
+from typing import Any
+
 
 class APIError(Exception):
     """StandX API エラー."""
 
+    def __init__(self, message: str = "", status: int | None = None, code: int | None = None):
+        """
+        Args:
+            message: エラーメッセージ
+            status: HTTPステータスコード（HTTP応答由来の場合）
+            code: 取引所のエラーコード（レスポンスボディの code、ある場合）
+        """
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
 
 class AuthenticationError(APIError):
     """認証エラー (401)."""
 
 
+class RateLimitError(APIError):
+    """レート制限エラー (429)."""
+
+    def __init__(self, message: str = "", retry_after: float = 1.0):
+        """
+        Args:
+            message: エラーメッセージ
+            retry_after: サーバーが指定した待機秒数
+        """
+        super().__init__(message, status=429)
+        self.retry_after = retry_after
+
+
 class NetworkError(APIError):
     """ネットワークエラー."""
+
+    def __init__(self, message: str = "", request_sent: bool = True):
+        """
+        Args:
+            message: エラーメッセージ
+            request_sent: リクエストがサーバーに届いた可能性があるか
+                （接続確立前の失敗ならFalse）
+        """
+        super().__init__(message)
+        self.request_sent = request_sent
+
+
+def error_payload(error: APIError) -> dict[str, Any] | None:
+    """
+    "HTTP {status}: {body}" 形式のエラーからJSONボディを取り出す.
+
+    Args:
+        error: HTTP応答由来のエラー
+
+    Returns:
+        dict | None: JSONオブジェクトのボディ（JSONでない場合はNone）
+    """
+    _, _, body = str(error).partition(f"HTTP {error.status}: ")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
@@ -0,0 +1,152 @@
+"""キャンセルのヘッジ送信.
+
+キャンセルの応答が直近のキャンセルレイテンシのパーセンタイルを超えても
+返らない場合、同じキャンセルをもう1本送信し、先に成功した方を採用する。
+1本目がコネクションを使用中のため、2本目はプール内の別コネクションで送られる。
+
+2本とも取引所に届くと片方は「キャンセル済み・注文なし」で拒否されるが、
+もう片方の結果を待つため通常は成功として扱われる。
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from standx_mm_bot.client.exceptions import APIError, NetworkError, RateLimitError, error_payload
+
+# 取引所はキャンセル済み・注文なしを HTTP 400 + {"code": 400, "message": ...} で拒否する
+ALREADY_CANCELLED_STATUS = 400
+ALREADY_CANCELLED_MESSAGE = re.compile(r"^order (?:not found|already cancell?ed)\b", re.IGNORECASE)
+
+
+def is_already_cancelled_rejection(code: Any, message: Any) -> bool:
+    """
+    取引所の拒否（code・メッセージ）がキャンセル済み・注文なしによるものか判定.
+
+    Args:
+        code: 拒否のcode
+        message: 拒否のメッセージ
+
+    Returns:
+        bool: キャンセル済み・注文なしの拒否ならTrue
+    """
+    return (
+        code == ALREADY_CANCELLED_STATUS
+        and isinstance(message, str)
+        and ALREADY_CANCELLED_MESSAGE.match(message) is not None
+    )
+
+
+def is_already_cancelled(error: Exception) -> bool:
+    """
+    重複キャンセル（キャンセル済み・注文なし）による拒否か判定.
+
+    ステータス・ボディのcode・メッセージがすべて取引所の拒否形式に一致する場合のみ
+    Trueを返す。「キャンセルできない」などの拒否や、ルーティング誤りによる汎用の404は
+    注文が板に残っている可能性があるため含めない。
+
+    Args:
+        error: キャンセルで発生したエラー
+
+    Returns:
+        bool: 重複キャンセルの拒否ならTrue
+    """
+    if not isinstance(error, APIError) or isinstance(error, RateLimitError | NetworkError):
+        return False
+    if error.status != ALREADY_CANCELLED_STATUS:
+        return False
+    payload = error_payload(error)
+    if payload is None:
+        return False
+    return is_already_cancelled_rejection(payload.get("code"), payload.get("message"))
+
+
+class LatencyWindow:
+    """直近N件のレイテンシ（パーセンタイル計算用）."""
+
+    def __init__(self, size: int = 128):
+        """
+        ウィンドウを初期化.
+
+        Args:
+            size: 保持するサンプル数
+        """
+        self._samples: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] | None = None
+
+    def __len__(self) -> int:
+        """保持しているサンプル数."""
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """
+        レイテンシを記録.
+
+        Args:
+            seconds: レイテンシ（秒）
+        """
+        self._samples.append(seconds)
+        self._sorted = None
+
+    def percentile(self, q: float) -> float:
+        """
+        パーセンタイル値を取得.
+
+        Args:
+            q: パーセンタイル (0-100)
+
+        Returns:
+            float: レイテンシ（秒、サンプルがなければ0.0）
+        """
+        if not self._samples:
+            return 0.0
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * q / 100))
+        return self._sorted[index]
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """ヘッジ送信の待機時間の決め方."""
+
+    percentile: float = 95.0
+    min_delay: float = 0.005  # 秒
+    max_delay: float = 0.25  # 秒（サンプル不足時はこの値）
+    min_samples: int = 20
+
+    def delay(self, latency: LatencyWindow) -> float:
+        """
+        ヘッジを送信するまでの待機秒数.
+
+        Args:
+            latency: 直近の成功キャンセルのレイテンシ
+
+        Returns:
+            float: 待機秒数
+        """
+        if len(latency) < self.min_samples:
+            return self.max_delay
+        return min(self.max_delay, max(self.min_delay, latency.percentile(self.percentile)))
+
+
+@dataclass
+class HedgeStats:
+    """ヘッジ統計."""
+
+    requests: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    duplicate_rejections: int = 0
+
+    def snapshot(self) -> dict[str, float | int]:
+        """メトリクスのスナップショット."""
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "duplicate_rejections": self.duplicate_rejections,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "win_rate": self.hedge_wins / self.hedged if self.hedged else 0.0,
+        }
@@ -1,57 +1,418 @@
 """REST API クライアント."""
 
 import asyncio
+import contextlib
 import logging
+import re
+import time
 import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any, cast
 
 import aiohttp
-import jwt as pyjwt
 
 from standx_mm_bot.auth import (
-    generate_auth_headers,
+    RequestSigner,
     sign_message_evm,
     sign_message_solana,
 )
+from standx_mm_bot.client.breaker import AdaptiveTimeouts, CircuitBreaker, CircuitState
+from standx_mm_bot.client.cache import ReadCache
+from standx_mm_bot.client.capture import RecordingTransport, TrafficRecorder
+from standx_mm_bot.client.clock import ClockSync
+from standx_mm_bot.client.decode import (
+    decode_balance,
+    decode_cancel_results,
+    decode_open_orders,
+    decode_position,
+    loads,
+)
 from standx_mm_bot.client.exceptions import (
     APIError,
     AuthenticationError,
     NetworkError,
+    RateLimitError,
+    error_payload,
+)
+from standx_mm_bot.client.hedge import (
+    HedgePolicy,
+    HedgeStats,
+    LatencyWindow,
+    is_already_cancelled,
+    is_already_cancelled_rejection,
+)
+from standx_mm_bot.client.metrics import RequestMetrics
+from standx_mm_bot.client.order_ids import ClientOrderIds, is_client_order_id, is_duplicate_order
+from standx_mm_bot.client.payload import (
+    encode_body,
+    encode_cancel_order,
+    encode_cancel_order_by_client_id,
+    encode_cancel_orders,
+    encode_cancel_orders_by_client_id,
+    encode_new_order,
 )
+from standx_mm_bot.client.ratelimit import Priority, PriorityRateLimiter, priority_for_path
+from standx_mm_bot.client.retry import RetryPolicy, RetryStats, default_policies
+from standx_mm_bot.client.token_store import CachedToken, TokenStore, token_expiry
+from standx_mm_bot.client.tracing import create_trace_config
+from standx_mm_bot.client.transport import AiohttpTransport, Transport, create_transport
 from standx_mm_bot.config import Settings
+from standx_mm_bot.models import Balance, CancelResult, Order, Position
 
 logger = logging.getLogger(__name__)
 
 
+# 注文・約定で内容が変わる照会エンドポイント（キャッシュ無効化対象）
+ORDER_STATE_PATHS = ("/api/query_open_orders", "/api/query_positions", "/api/query_balance")
+
+# 429応答でRetry-Afterがない場合の待機秒数
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+def _retry_after_seconds(headers: Any) -> float:
+    """429応答のRetry-Afterヘッダーから待機秒数を取得."""
+    try:
+        return max(0.0, float(headers.get("Retry-After", DEFAULT_RETRY_AFTER_SECONDS)))
+    except ValueError:
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedRequest:
+    """署名済みリクエスト（送信するバイト列と署名ヘッダー）."""
+
+    method: str
+    path: str
+    payload: bytes
+    headers: dict[str, str]
+    signed_at: float  # time.monotonic()
+
+    def age(self) -> float:
+        """署名からの経過秒数."""
+        return time.monotonic() - self.signed_at
+
+
+# 署名の期限切れ・タイムスタンプのずれによる拒否のメッセージ
+STALE_SIGNATURE_MESSAGE = re.compile(
+    r"\b(?:timestamp|signature)\b.*\b(?:expired|stale|invalid|too old|out of)\b"
+    r"|\b(?:expired|stale|invalid)\s+(?:request\s+)?(?:timestamp|signature)\b",
+    re.IGNORECASE,
+)
+
+
+def is_stale_signature(error: Exception) -> bool:
+    """
+    署名の期限切れ・タイムスタンプのずれによる拒否か判定.
+
+    署名済みリクエスト（PreparedRequest）を署名し直せば受け付けられる拒否のみTrue。
+    注文なし・約定済みなどの拒否は署名し直しても結果が変わらないため含めない。
+
+    Args:
+        error: 署名済みリクエストの送信で発生したエラー
+
+    Returns:
+        bool: 署名し直して送る意味がある拒否ならTrue
+    """
+    if not isinstance(error, APIError) or isinstance(error, RateLimitError | NetworkError):
+        return False
+    if error.status not in (400, 403):
+        return False
+    payload = error_payload(error)
+    message = payload.get("message") if payload is not None else str(error)
+    return isinstance(message, str) and STALE_SIGNATURE_MESSAGE.search(message) is not None
+
+
+# キャッシュ済みJWTを起動時に再利用するための最低残り有効期間（秒）
+JWT_MIN_VALIDITY_SECONDS = 60.0
+
+# JWT更新失敗時の再試行間隔（秒）
+JWT_REFRESH_RETRY_SECONDS = 30.0
+
+
 class StandXHTTPClient:
     """StandX REST API クライアント."""
 
-    def __init__(self, config: Settings, jwt_token: str | None = None):
+    def __init__(
+        self, config: Settings, jwt_token: str | None = None, transport: Transport | None = None
+    ):
         """
         HTTPクライアントを初期化.
 
         Args:
             config: アプリケーション設定
             jwt_token: JWTトークン（テスト用、省略時は自動取得）
+            transport: 取引用トランスポート（省略時は http_transport 設定から作成）
         """
         self.config = config
-        self.base_url = "https://perps.standx.com"
-        self.auth_base_url = "https://api.standx.com"
+        self.base_url = config.standx_api_url.rstrip("/")
+        self.auth_base_url = config.standx_auth_url.rstrip("/")
         self.jwt_token = jwt_token
+        # 取引用 (perps.standx.com) と認証用 (api.standx.com) でコネクションプールを分ける
+        self.transport = transport
+        # 取引用トランスポートが aiohttp の場合のセッション
         self.session: aiohttp.ClientSession | None = None
+        self.auth_session: aiohttp.ClientSession | None = None
+        self._last_request_at = 0.0  # time.monotonic()
+        self._signer: RequestSigner | None = None
+        self.clock = ClockSync()
+        self.rate_limiter = PriorityRateLimiter(
+            rate=config.rate_limit_per_second,
+            burst=config.rate_limit_burst,
+            cancel_reserve=config.rate_limit_cancel_reserve,
+        )
+        # エンドポイント種別（優先度）ごとのリトライポリシー（差し替え可能）
+        self.retry_policies: dict[Priority, RetryPolicy] = default_policies(
+            max_attempts=config.retry_max_attempts,
+            base_delay=config.retry_base_delay_seconds,
+            max_delay=config.retry_max_delay_seconds,
+            deadline=config.retry_deadline_seconds,
+        )
+        self.retry_stats = {p: RetryStats() for p in Priority}
+        self.read_cache = ReadCache()
+        self.order_ids = ClientOrderIds()
+        self.request_metrics = RequestMetrics()
+        self.timeouts = AdaptiveTimeouts(
+            self.request_metrics,
+            percentile=config.http_timeout_percentile,
+            multiplier=config.http_timeout_multiplier,
+            min_timeout=config.http_timeout_min_seconds,
+            max_timeout=config.http_timeout_seconds,
+        )
+        # 取引所の障害検知（状態は circuit_state / breaker.on_state_change で参照）
+        self.breaker = CircuitBreaker(
+            failure_threshold=config.circuit_failure_threshold,
+            reset_timeout=config.circuit_reset_seconds,
+        )
+        self.hedge_policy = HedgePolicy(
+            percentile=config.cancel_hedge_percentile,
+            min_delay=config.cancel_hedge_min_delay_seconds,
+            max_delay=config.cancel_hedge_max_delay_seconds,
+            min_samples=config.cancel_hedge_min_samples,
+        )
+        self.hedge_stats = HedgeStats()
+        self._cancel_latency = LatencyWindow()
+        self.jwt_expires_at: float | None = None
+        self._token_store = TokenStore(config.jwt_cache_path) if config.jwt_cache_path else None
+        self._background_tasks: list[asyncio.Task[None]] = []
+        # 実行中のJWT再取得（同時の401では1回のログインを共有する）
+        self._renew_task: asyncio.Task[None] | None = None
+        self._relogins = 0
+        # 一括キャンセルAPIを再び試す時刻（time.monotonic()、404/405で先送り）
+        self._bulk_cancel_retry_at = 0.0
+        self._replays = 0
 
     async def __aenter__(self) -> "StandXHTTPClient":
         """非同期コンテキストマネージャー (enter)."""
-        self.session = aiohttp.ClientSession()
-        # JWTトークンが未設定の場合のみ取得
-        if self.jwt_token is None:
-            self.jwt_token = await self._obtain_jwt()
+        # リクエスト単位のタイムアウトがない通信（warm_up、認証）もこの上限で打ち切る
+        timeout = aiohttp.ClientTimeout(total=self.config.http_timeout_seconds)
+        if self.transport is None:
+            name = self.config.http_transport
+            self.transport = create_transport(
+                name,
+                connector=self._create_connector() if name == "aiohttp" else None,
+                timeout=self.config.http_timeout_seconds,
+                pool_size=self.config.http_pool_size,
+                keepalive_seconds=self.config.http_keepalive_seconds,
+                trace_configs=(
+                    [create_trace_config(self.request_metrics)]
+                    if self.config.http_trace_phases
+                    else None
+                ),
+            )
+        if isinstance(self.transport, AiohttpTransport):
+            self.session = self.transport.session
+        if self.config.capture_path:
+            self.transport = RecordingTransport(
+                self.transport, TrafficRecorder.shared(self.config.capture_path)
+            )
+        try:
+            self.auth_session = aiohttp.ClientSession(
+                connector=self._create_connector(limit=2), timeout=timeout
+            )
+
+            # 取引用コネクションをJWT取得と並行して確立し、アイドル中も維持する
+            if self.config.http_warmup_connections > 0:
+                self._background_tasks.append(asyncio.create_task(self.warm_up()))
+                if self.config.http_keepalive_ping_seconds > 0:
+                    self._background_tasks.append(asyncio.create_task(self._keepalive_loop()))
+
+            if self.config.http_metrics_log_seconds > 0:
+                self._background_tasks.append(asyncio.create_task(self._metrics_log_loop()))
+
+            # JWTトークンが未設定の場合のみ取得（キャッシュ優先）し、バックグラウンド更新を開始
+            if self.jwt_token is None:
+                await self._load_or_obtain_jwt()
+                self._background_tasks.append(asyncio.create_task(self._refresh_jwt_loop()))
+        except BaseException:
+            # ログイン失敗時は __aexit__ が呼ばれないため、タスクとセッションをここで片付ける
+            await self.__aexit__(None, None, None)
+            raise
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         """非同期コンテキストマネージャー (exit)."""
-        if self.session:
-            await self.session.close()
+        if self._renew_task is not None and not self._renew_task.done():
+            self._background_tasks.append(self._renew_task)
+        self._renew_task = None
+        for task in self._background_tasks:
+            task.cancel()
+        for task in self._background_tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._background_tasks.clear()
+        if self.transport:
+            await self.transport.close()
+        if self.auth_session:
+            await self.auth_session.close()
+
+    def _create_connector(self, limit: int | None = None) -> aiohttp.TCPConnector:
+        """
+        チューニング済みTCPコネクタを作成.
+
+        Args:
+            limit: 最大接続数（省略時は http_pool_size）
+
+        Returns:
+            aiohttp.TCPConnector: コネクタ
+        """
+        pool_size = limit if limit is not None else self.config.http_pool_size
+        return aiohttp.TCPConnector(
+            limit=pool_size,
+            limit_per_host=pool_size,
+            keepalive_timeout=self.config.http_keepalive_seconds,
+            ttl_dns_cache=self.config.http_dns_cache_seconds,
+        )
+
+    async def warm_up(self, connections: int | None = None) -> None:
+        """
+        取引用コネクションを事前に確立してプールに載せる.
+
+        同時に複数のHEADリクエストを送ることで、DNS解決・TCP・TLSハンドシェイクを
+        最初の発注より前に済ませる。失敗しても例外は送出しない。
+
+        Args:
+            connections: 確立する接続数（省略時は http_warmup_connections）
+        """
+        if self.transport is None:
+            return
+        count = connections if connections is not None else self.config.http_warmup_connections
+        transport = self.transport
+        timeout = self.config.http_timeout_seconds
+
+        async def _ping() -> None:
+            await transport.request("HEAD", self.base_url + "/", {}, b"", timeout)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(_ping() for _ in range(count)), return_exceptions=True)
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures:
+            logger.warning(f"Connection warm-up failed for {len(failures)}/{count}: {failures[0]}")
+        else:
+            logger.debug(
+                f"Warmed up {count} connections in {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+
+    async def _keepalive_loop(self) -> None:
+        """アイドル中に接続が切れないよう定期的にwarm_upを実行."""
+        interval = self.config.http_keepalive_ping_seconds
+        while True:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self._last_request_at >= interval:
+                await self.warm_up()
+
+    async def _metrics_log_loop(self) -> None:
+        """リクエストレイテンシのサマリーを定期的にログ出力."""
+        while True:
+            await asyncio.sleep(self.config.http_metrics_log_seconds)
+            summary = self.request_metrics.format_summary()
+            if summary:
+                logger.info(f"Request latency summary:\n{summary}")
+
+    async def _load_or_obtain_jwt(self) -> None:
+        """キャッシュからJWTを読み込み、なければ取得してキャッシュに保存."""
+        if self._token_store is not None:
+            cached = self._token_store.load(
+                self.config.standx_wallet_address,
+                self.config.standx_chain,
+                self.auth_base_url,
+                min_validity=JWT_MIN_VALIDITY_SECONDS,
+            )
+            if cached is not None:
+                logger.info(
+                    f"Using cached JWT token (expires in {cached.remaining_seconds():.0f}s)"
+                )
+                self.jwt_token = cached.token
+                self.jwt_expires_at = cached.expires_at
+                return
+
+        await self._renew_jwt()
+
+    async def _renew_jwt(self) -> None:
+        """JWTを新規取得して差し替え、キャッシュに保存."""
+        token = await self._obtain_jwt()
+        expires_at = token_expiry(token, self.config.jwt_expires_seconds)
+
+        # 代入のみで差し替えるため、送信中のリクエストは旧トークンのまま完了する
+        self.jwt_token = token
+        self.jwt_expires_at = expires_at
+
+        if self._token_store is not None:
+            self._token_store.save(
+                CachedToken(
+                    token=token,
+                    expires_at=expires_at,
+                    address=self.config.standx_wallet_address,
+                    chain=self.config.standx_chain,
+                    auth_url=self.auth_base_url,
+                )
+            )
+
+    async def _renew_jwt_shared(self, stale_token: str | None = None) -> None:
+        """
+        JWTを再取得（実行中の再取得があればその完了を待つ）.
+
+        Args:
+            stale_token: 拒否されたトークン（既に差し替え済みなら再取得しない）
+        """
+        if stale_token is not None and self.jwt_token != stale_token:
+            return
+        task = self._renew_task
+        if task is None or task.done():
+            self._relogins += 1
+            task = self._renew_task = asyncio.create_task(self._renew_jwt())
+        # 1呼び出し元のキャンセルで共有中のログインを止めない
+        await asyncio.shield(task)
+
+    def _seconds_until_refresh(self) -> float:
+        """
+        次回JWT更新までの待機秒数.
+
+        Returns:
+            float: 待機秒数（有効期限 - 更新マージン、最小0）
+        """
+        if self.jwt_expires_at is None:
+            return 0.0
+        # マージンが有効期間より長いと更新が連続するため、有効期間の半分を上限とする
+        margin = min(self.config.jwt_refresh_margin_seconds, self.config.jwt_expires_seconds / 2)
+        refresh_at = self.jwt_expires_at - margin
+        return max(0.0, refresh_at - time.time())
+
+    async def _refresh_jwt_loop(self) -> None:
+        """有効期限前にJWTをバックグラウンドで更新し続ける."""
+        while True:
+            await asyncio.sleep(self._seconds_until_refresh())
+            try:
+                await self._renew_jwt_shared()
+                logger.info("JWT token refreshed in background")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Background JWT refresh failed: {e}. "
+                    f"Retrying in {JWT_REFRESH_RETRY_SECONDS:.0f}s"
+                )
+                await asyncio.sleep(JWT_REFRESH_RETRY_SECONDS)
 
     async def _obtain_jwt(self) -> str:
         """
@@ -63,7 +424,7 @@ class StandXHTTPClient:
         Raises:
             AuthenticationError: JWT取得に失敗
         """
-        if self.session is None:
+        if self.auth_session is None:
             raise RuntimeError("Session not initialized")
 
         try:
@@ -77,7 +438,7 @@ class StandXHTTPClient:
                 "requestId": request_id,
             }
 
-            async with self.session.post(
+            async with self.auth_session.post(
                 prepare_url,
                 json=prepare_body,
                 headers={"Content-Type": "application/json"},
@@ -96,7 +457,9 @@ class StandXHTTPClient:
             # Step 2: signedDataをデコードしてmessageを取得
             # signedDataはJWT形式の文字列
             try:
-                # JWTをデコード（署名検証なし）
+                # JWTをデコード（署名検証なし、ログイン時のみ必要なため遅延インポート）
+                import jwt as pyjwt
+
                 decoded_payload = pyjwt.decode(signed_data, options={"verify_signature": False})
                 message = decoded_payload.get("message")
                 if not message:
@@ -127,7 +490,7 @@ class StandXHTTPClient:
                 "expiresSeconds": self.config.jwt_expires_seconds,
             }
 
-            async with self.session.post(
+            async with self.auth_session.post(
                 login_url,
                 json=login_body,
                 headers={"Content-Type": "application/json"},
@@ -147,11 +510,318 @@ class StandXHTTPClient:
         except aiohttp.ClientError as e:
             raise AuthenticationError(f"Network error during JWT acquisition: {e}") from e
 
+    def _get_signer(self) -> RequestSigner:
+        """
+        リクエスト署名器を取得（初回のみ鍵をパースしてキャッシュ）.
+
+        Returns:
+            RequestSigner: 署名器
+
+        Raises:
+            RuntimeError: BSCでSTANDX_REQUEST_SIGNING_KEYが未設定
+        """
+        if self._signer is not None:
+            return self._signer
+
+        # チェーンに応じて適切な署名鍵を選択
+        # BSC: APIリクエスト署名用Ed25519鍵を使用（JWT認証とは別の鍵）
+        # Solana: ウォレット秘密鍵（Ed25519）を使用
+        if self.config.standx_chain.lower() == "bsc":
+            if not self.config.standx_request_signing_key:
+                raise RuntimeError(
+                    "BSC chain requires STANDX_REQUEST_SIGNING_KEY in .env. "
+                    "Generate wallet with: make wallet-bsc"
+                )
+            signing_key = self.config.standx_request_signing_key
+        else:
+            signing_key = self.config.standx_private_key
+
+        self._signer = RequestSigner(signing_key, clock=self.clock.now_ms)
+        return self._signer
+
+    def prepare_request(self, method: str, path: str, payload: bytes = b"") -> PreparedRequest:
+        """
+        リクエストに署名して送信可能な状態にする（送信はしない）.
+
+        Authorizationヘッダーは署名対象外のため、送信時に最新のJWTで付与する。
+
+        Args:
+            method: HTTPメソッド (GET, POST)
+            path: リクエストパス
+            payload: エンコード済みボディ
+
+        Returns:
+            PreparedRequest: 署名済みリクエスト
+        """
+        started = time.perf_counter()
+        headers = self._get_signer().sign(payload)
+        self.request_metrics.observe_sign(path.partition("?")[0], time.perf_counter() - started)
+        headers["Content-Type"] = "application/json"
+        return PreparedRequest(
+            method=method,
+            path=path,
+            payload=payload,
+            headers=headers,
+            signed_at=time.monotonic(),
+        )
+
+    async def send_prepared(
+        self, prepared: PreparedRequest, *, policy: RetryPolicy | None = None
+    ) -> dict[str, Any]:
+        """
+        署名済みリクエストを送信（エンドポイント種別のリトライポリシーを適用）.
+
+        リトライ時は同じボディを署名し直して送信する。401応答の場合はJWTを
+        再取得（同時の401では1回のログインを共有）して、期限内なら1回だけ再送する。
+
+        Args:
+            prepared: prepare_request で作成したリクエスト（一度だけ送信可能）
+            policy: リトライポリシー（省略時はエンドポイント種別のポリシー）
+
+        Returns:
+            dict: レスポンスJSON
+
+        Raises:
+            AuthenticationError: 再ログイン後も認証エラー (401)、または再ログインに失敗
+            RateLimitError: リトライ上限までレート制限 (429) が続いた
+            APIError: APIエラー
+            NetworkError: ネットワークエラー
+        """
+        if self.transport is None:
+            raise RuntimeError("Session not initialized. Use 'async with' context manager.")
+
+        if self.jwt_token is None:
+            raise RuntimeError("JWT token not initialized. Use 'async with' context manager.")
+
+        priority = priority_for_path(prepared.path)
+        if policy is None:
+            policy = self.retry_policies[priority]
+        stats = self.retry_stats[priority]
+        deadline = time.monotonic() + policy.deadline
+        attempt = 1
+        reauthenticated = False
+
+        while True:
+            token = self.jwt_token
+            try:
+                if priority == Priority.CANCEL and self.config.cancel_hedge_enabled:
+                    response = await self._send_hedged(prepared, priority)
+                else:
+                    response = await self._send_once(prepared, priority)
+                if attempt > 1:
+                    stats.recovered += 1
+                if priority != Priority.QUERY:
+                    # 発注・キャンセルで注文状態が変わるため照会キャッシュを破棄
+                    self.read_cache.invalidate(*ORDER_STATE_PATHS)
+                return response
+            except AuthenticationError as e:
+                # トークン失効: 1回だけ再ログインして再署名・再送
+                if reauthenticated or time.monotonic() >= deadline:
+                    raise
+                await self._reauthenticate(token, e)
+                reauthenticated = True
+                self._replays += 1
+                prepared = self.prepare_request(prepared.method, prepared.path, prepared.payload)
+                continue
+            except APIError as e:
+                if not policy.should_retry(e):
+                    raise
+                error = e
+
+            stats.errors[type(error).__name__] = stats.errors.get(type(error).__name__, 0) + 1
+            delay = policy.backoff(attempt)
+            if isinstance(error, RateLimitError):
+                delay = max(delay, error.retry_after)
+            if attempt >= policy.max_attempts or time.monotonic() + delay > deadline:
+                stats.exhausted += 1
+                raise error
+
+            logger.warning(
+                f"{prepared.method} {prepared.path} failed ({error}), "
+                f"retrying in {delay:.2f}s (attempt {attempt}/{policy.max_attempts})"
+            )
+            stats.retries += 1
+            stats.retry_seconds += delay
+            await asyncio.sleep(delay)
+            attempt += 1
+            prepared = self.prepare_request(prepared.method, prepared.path, prepared.payload)
+
+    async def _reauthenticate(self, stale_token: str | None, error: AuthenticationError) -> None:
+        """
+        401応答を受けてJWTを再取得.
+
+        Args:
+            stale_token: 拒否されたリクエストで使ったトークン
+            error: 401応答のエラー
+
+        Raises:
+            AuthenticationError: 再ログインに失敗（元のエラーを送出）
+        """
+        logger.warning(f"{error}, re-authenticating")
+        try:
+            await self._renew_jwt_shared(stale_token)
+        except Exception as e:
+            logger.error(f"Re-authentication failed: {e}")
+            raise error from e
+
+    async def _send_hedged(self, prepared: PreparedRequest, priority: Priority) -> dict[str, Any]:
+        """
+        署名済みリクエストをヘッジ付きで送信（リトライ1回分）.
+
+        直近レイテンシのパーセンタイル以内に応答がなければ再署名した同じリクエストを
+        もう1本送信し、先に成功した方の結果を返す（遅い方は中断する）。
+
+        Args:
+            prepared: 署名済みリクエスト
+            priority: レートリミッターの優先度
+
+        Returns:
+            dict: レスポンスJSON
+
+        Raises:
+            APIError: 両方の送信が失敗（1本目のエラーを優先）
+        """
+        stats = self.hedge_stats
+        stats.requests += 1
+        started = time.perf_counter()
+        primary = asyncio.create_task(self._send_once(prepared, priority))
+        pending: set[asyncio.Task[dict[str, Any]]] = {primary}
+        try:
+            done, pending = await asyncio.wait(
+                pending, timeout=self.hedge_policy.delay(self._cancel_latency)
+            )
+            if done:
+                response = primary.result()
+                self._cancel_latency.record(time.perf_counter() - started)
+                return response
+
+            stats.hedged += 1
+            logger.info(f"{prepared.method} {prepared.path} slow, sending hedged request")
+            hedged = self.prepare_request(prepared.method, prepared.path, prepared.payload)
+            hedge = asyncio.create_task(self._send_once(hedged, priority))
+            pending.add(hedge)
+
+            errors: dict[asyncio.Task[dict[str, Any]], Exception] = {}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        self._cancel_latency.record(time.perf_counter() - started)
+                        return task.result()
+                    if not isinstance(error, Exception):
+                        raise error
+                    errors[task] = error
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # 両方失敗: 片方が重複キャンセルの拒否なら、もう片方が処理済みとみなす
+        duplicates = [e for e in errors.values() if is_already_cancelled(e)]
+        stats.duplicate_rejections += len(duplicates)
+        if len(duplicates) == 1:
+            logger.info(f"{prepared.method} {prepared.path} completed by the other hedged request")
+            return {"code": 0, "message": str(duplicates[0])}
+        raise errors[primary]
+
+    async def _send_once(self, prepared: PreparedRequest, priority: Priority) -> dict[str, Any]:
+        """
+        署名済みリクエストを1回だけ送信.
+
+        Args:
+            prepared: 署名済みリクエスト
+            priority: レートリミッターの優先度
+
+        Returns:
+            dict: レスポンスJSON
+
+        Raises:
+            AuthenticationError: 認証エラー (401)
+            RateLimitError: レート制限 (429)
+            APIError: APIエラー
+            NetworkError: ネットワークエラー
+        """
+        assert self.transport is not None
+
+        endpoint = prepared.path.partition("?")[0]
+        # 障害中は送信枠を待たずに即座に失敗させる
+        self.breaker.before_request()
+        try:
+            waited = await self.rate_limiter.acquire(priority)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        self.request_metrics.observe_queue(endpoint, waited)
+        timeout = self.timeouts.timeout(endpoint)
+
+        headers = {**prepared.headers, "authorization": f"Bearer {self.jwt_token}"}
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Request body (exact bytes used in signature): {prepared.payload!r}")
+            logger.debug(f"Request headers: {headers}")
+
+        self._last_request_at = time.monotonic()
+        status: int | None = None
+        cancelled = False
+        malformed = False
+        started = time.perf_counter()
+        try:
+            sent_at_ms = time.time() * 1000
+            resp = await self.transport.request(
+                prepared.method, self.base_url + prepared.path, headers, prepared.payload, timeout
+            )
+            status = resp.status
+            # Dateヘッダーからサーバー時刻オフセットを推定
+            date_header = resp.headers.get("Date")
+            if date_header:
+                self.clock.observe_http_date(date_header, sent_at_ms, time.time() * 1000)
+            self.rate_limiter.update_from_headers(resp.headers)
+
+            if resp.status == 200:
+                try:
+                    return cast(dict[str, Any], loads(resp.body))
+                except ValueError as e:
+                    # プロキシのエラーページなど、JSONでない200応答は取引所側の障害とみなす
+                    malformed = True
+                    raise NetworkError(
+                        f"Invalid JSON response (HTTP 200): {resp.text()[:200]!r}"
+                    ) from e
+            elif resp.status == 401:
+                raise AuthenticationError("JWT expired or invalid", status=401)
+            elif resp.status == 429:
+                # レート制限: 全リクエストの送信を止める
+                retry_after = _retry_after_seconds(resp.headers)
+                self.rate_limiter.penalize(retry_after)
+                raise RateLimitError("Rate limited (429)", retry_after=retry_after)
+            else:
+                raise APIError(f"HTTP {resp.status}: {resp.text()}", status=resp.status)
+        except asyncio.CancelledError:
+            # ヘッジで中断された送信はレイテンシ・ブレーカーに記録しない
+            cancelled = True
+            raise
+        finally:
+            if cancelled:
+                self.breaker.release()
+            else:
+                # レスポンス読み込み完了（またはエラー）までをネットワーク時間として記録
+                elapsed = time.perf_counter() - started
+                self.request_metrics.observe_network(endpoint, status, elapsed)
+                # 応答なし・5xx・不正な応答は取引所側の障害とみなす
+                if status is None or status >= 500 or malformed:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+
     async def _request(
         self,
         method: str,
         path: str,
         body: dict[str, Any] | None = None,
+        *,
+        payload: bytes | None = None,
+        policy: RetryPolicy | None = None,
     ) -> dict[str, Any]:
         """
         HTTPリクエストを送信.
@@ -159,7 +829,9 @@ class StandXHTTPClient:
         Args:
             method: HTTPメソッド (GET, POST)
             path: リクエストパス
-            body: リクエストボディ
+            body: リクエストボディ（payload未指定時にエンコードされる）
+            payload: エンコード済みボディ（署名・送信にそのまま使用）
+            policy: リトライポリシー（省略時はエンドポイント種別のポリシー）
 
         Returns:
             dict: レスポンスJSON
@@ -169,67 +841,93 @@ class StandXHTTPClient:
             APIError: APIエラー
             NetworkError: ネットワークエラー
         """
-        if self.session is None:
+        if self.transport is None:
             raise RuntimeError("Session not initialized. Use 'async with' context manager.")
 
         if self.jwt_token is None:
             raise RuntimeError("JWT token not initialized. Use 'async with' context manager.")
 
-        # チェーンに応じて適切な署名鍵を選択
-        # BSC: APIリクエスト署名用Ed25519鍵を使用（JWT認証とは別の鍵）
-        # Solana: ウォレット秘密鍵（Ed25519）を使用
-        if self.config.standx_chain.lower() == "bsc":
-            if not self.config.standx_request_signing_key:
-                raise RuntimeError(
-                    "BSC chain requires STANDX_REQUEST_SIGNING_KEY in .env. "
-                    "Generate wallet with: make wallet-bsc"
-                )
-            signing_key = self.config.standx_request_signing_key
-        else:
-            signing_key = self.config.standx_private_key
+        # POSTの場合、署名計算と完全に同じバイト列を送信（エンコードは一度だけ）
+        if payload is None:
+            payload = encode_body(body) if method.upper() == "POST" and body else b""
+
+        return await self.send_prepared(self.prepare_request(method, path, payload), policy=policy)
 
-        # 認証ヘッダー生成（署名計算で使用したペイロード文字列も返される）
-        headers, payload_str = generate_auth_headers(
-            self.jwt_token,
-            signing_key,
-            method,
-            path,
-            body,
-            self.config.standx_chain,
+    def metrics(self) -> dict[str, Any]:
+        """
+        クライアントのメトリクスを取得.
+
+        Returns:
+            dict: コンポーネント別メトリクス
+                - clock: サーバー時刻オフセット・RTT (ms)
+                - rate_limit: 残りトークン・優先度別の待機状況
+                - retry: エンドポイント種別ごとのリトライ回数・リトライ待機秒数
+                - cache: 照会エンドポイントごとのキャッシュヒット・集約数
+                - latency: エンドポイントごとの署名・送信待ち・ネットワーク時間の分布
+                - hedge: キャンセルのヘッジ送信率・ヘッジ側の勝率
+                - circuit: ブレーカー状態・連続失敗回数
+                - timeouts: エンドポイントごとの現在のタイムアウト (秒)
+                - auth: JWT再取得回数・401後の再送回数
+        """
+        return {
+            "clock": self.clock.snapshot(),
+            "rate_limit": self.rate_limiter.snapshot(),
+            "retry": {p.name.lower(): stats.snapshot() for p, stats in self.retry_stats.items()},
+            "cache": self.read_cache.snapshot(),
+            "latency": self.request_metrics.snapshot(),
+            "hedge": self.hedge_stats.snapshot(),
+            "circuit": self.breaker.snapshot(),
+            "timeouts": self.timeouts.snapshot(),
+            "auth": {"relogins": self._relogins, "replays": self._replays},
+        }
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        """
+        取引所への送信状態.
+
+        OPEN の間は送信せずに CircuitOpenError を送出する。戦略側は新規発注を控え、
+        防御的に振る舞うこと。
+        """
+        return self.breaker.state
+
+    async def _cached_get(self, path: str, ttl: float) -> dict[str, Any]:
+        """
+        照会リクエストをキャッシュ経由で送信（同時の同一リクエストは1回に集約）.
+
+        Args:
+            path: リクエストパス
+            ttl: キャッシュ有効期間（秒）
+
+        Returns:
+            dict: レスポンスJSON（共有されるため変更しないこと）
+        """
+        result: dict[str, Any] = await self.read_cache.get(
+            path, ttl, lambda: self._request("GET", path)
         )
-        headers["Content-Type"] = "application/json"
+        return result
 
-        # POSTの場合、署名計算と完全に同じJSON文字列を送信
-        request_kwargs: dict[str, Any]
-        if method.upper() == "POST" and payload_str:
-            logger.debug(f"Request body (exact string used in signature): {payload_str}")
-            request_kwargs = {"data": payload_str}
-        else:
-            request_kwargs = {}
+    def invalidate_order_state(self) -> None:
+        """注文・ポジション・残高の照会キャッシュを破棄."""
+        self.read_cache.invalidate(*ORDER_STATE_PATHS)
 
-        logger.debug(f"Request headers: {headers}")
+    async def handle_order_event(self, data: dict[str, Any]) -> None:
+        """
+        WebSocketの注文・約定イベントで照会キャッシュを破棄.
 
-        try:
-            async with self.session.request(
-                method,
-                self.base_url + path,
-                headers=headers,
-                **request_kwargs,
-            ) as resp:
-                if resp.status == 200:
-                    return cast(dict[str, Any], await resp.json())
-                elif resp.status == 401:
-                    raise AuthenticationError("JWT expired or invalid")
-                elif resp.status == 429:
-                    # レート制限: 1秒待機してリトライ
-                    logger.warning("Rate limited (429). Retrying after 1 second...")
-                    await asyncio.sleep(1)
-                    return await self._request(method, path, body)
-                else:
-                    error_text = await resp.text()
-                    raise APIError(f"HTTP {resp.status}: {error_text}")
-        except aiohttp.ClientError as e:
-            raise NetworkError(f"Network error: {e}") from e
+        ``ws.on_order_update(http.handle_order_event)`` /
+        ``ws.on_trade(http.handle_order_event)`` のように登録して使う。
+
+        注文イベントにクライアント注文IDと取引所注文IDが含まれていれば対応表に登録する。
+
+        Args:
+            data: イベントデータ
+        """
+        self.invalidate_order_state()
+        client_id = data.get("cl_ord_id")
+        order_id = data.get("order_id") or data.get("id")
+        if client_id and order_id and str(client_id) in self.order_ids:
+            self.order_ids.bind(str(client_id), str(order_id))
 
     async def get_symbol_price(self, symbol: str) -> dict[str, Any]:
         """
@@ -242,7 +940,7 @@ class StandXHTTPClient:
             dict: 価格情報
         """
         path = f"/api/query_symbol_price?symbol={symbol}"
-        return await self._request("GET", path)
+        return await self._cached_get(path, self.config.cache_ttl_price_seconds)
 
     async def new_order(
         self,
@@ -253,10 +951,14 @@ class StandXHTTPClient:
         order_type: str = "limit",
         time_in_force: str = "gtc",
         reduce_only: bool = False,
+        cl_ord_id: str | None = None,
     ) -> dict[str, Any]:
         """
         新規注文を発注.
 
+        クライアント注文IDを付けて送信するため、タイムアウト等の曖昧な失敗も
+        同じIDでリトライする（取引所が重複を弾く）。
+
         Args:
             symbol: 取引ペア
             side: 注文サイド (buy/sell、小文字)
@@ -265,21 +967,50 @@ class StandXHTTPClient:
             order_type: 注文タイプ (limit/market、小文字)
             time_in_force: 注文有効期限 (gtc/ioc/alo)
             reduce_only: ポジション縮小のみフラグ
+            cl_ord_id: クライアント注文ID（省略時は自動生成）
 
         Returns:
-            dict: 注文情報
-        """
-        # API仕様に従ったボディ構築
-        body = {
-            "symbol": symbol,
-            "side": side.lower(),  # 小文字に変換
-            "order_type": order_type.lower(),  # 小文字に変換
-            "qty": str(size),  # 文字列として送信
-            "price": str(price),  # 文字列として送信
-            "time_in_force": time_in_force,
-            "reduce_only": reduce_only,
-        }
-        return await self._request("POST", "/api/new_order", body)
+            dict: 注文情報（cl_ord_id を含む）
+        """
+        if cl_ord_id is None:
+            cl_ord_id = self.order_ids.new_id()
+        else:
+            self.order_ids.bind(cl_ord_id)
+
+        # API仕様に従ったボディ構築（side/order_typeは小文字、qty/priceは文字列）
+        payload = encode_new_order(
+            symbol, side, order_type, size, price, time_in_force, reduce_only, cl_ord_id
+        )
+        policy = self.retry_policies[Priority.PLACE].deduplicated()
+        try:
+            response = await self._request("POST", "/api/new_order", payload=payload, policy=policy)
+        except APIError as e:
+            if not is_duplicate_order(e):
+                raise
+            # リトライが重複として拒否された: 最初の送信は受け付けられている
+            logger.info(f"Order {cl_ord_id} already accepted: {e}")
+            response = {"code": 0, "message": str(e)}
+
+        response.setdefault("cl_ord_id", cl_ord_id)
+        order_id = response.get("order_id")
+        if order_id:
+            self.order_ids.bind(cl_ord_id, str(order_id))
+        return response
+
+    def prepare_cancel_order(self, order_id: str, symbol: str) -> PreparedRequest:
+        """
+        キャンセルリクエストを事前に署名.
+
+        Args:
+            order_id: 注文ID
+            symbol: 取引ペア
+
+        Returns:
+            PreparedRequest: send_prepared で送信できる署名済みキャンセル
+        """
+        return self.prepare_request(
+            "POST", "/api/cancel_order", self._encode_cancel(order_id, symbol)
+        )
 
     async def cancel_order(self, order_id: str, symbol: str) -> dict[str, Any]:
         """
@@ -292,8 +1023,175 @@ class StandXHTTPClient:
         Returns:
             dict: キャンセル結果
         """
-        body = {"order_id": order_id, "symbol": symbol}
-        return await self._request("POST", "/api/cancel_order", body)
+        return await self._request(
+            "POST", "/api/cancel_order", payload=self._encode_cancel(order_id, symbol)
+        )
+
+    def _encode_cancel(self, order_id: str, symbol: str) -> bytes:
+        """
+        キャンセルボディをエンコード（クライアント注文IDは取引所注文IDに解決）.
+
+        Args:
+            order_id: 取引所注文ID、またはクライアント注文ID
+            symbol: 取引ペア
+
+        Returns:
+            bytes: 署名・送信用ボディ
+        """
+        if is_client_order_id(order_id):
+            exchange_id = self.order_ids.exchange_id(order_id)
+            if exchange_id is None:
+                return encode_cancel_order_by_client_id(order_id, symbol)
+            order_id = exchange_id
+        return encode_cancel_order(order_id, symbol)
+
+    async def cancel_orders(self, order_ids: Sequence[str], symbol: str) -> list[CancelResult]:
+        """
+        複数の注文をキャンセル.
+
+        一括キャンセルAPIが使えれば1リクエスト（クライアント注文IDが混在する場合は
+        2リクエストを並行）で送信し、レスポンスの注文ごとの結果を採用する。結果の
+        ない注文は未決注文を照会して確認し、残っている注文は個別に送り直す。
+        一括キャンセルAPIが使えない・失敗した場合は注文ごとのキャンセルを
+        cancel_max_concurrency 件まで同時に送信する。キャンセル済み・注文なしによる
+        拒否は成功として扱う。
+
+        Args:
+            order_ids: 取引所注文ID、またはクライアント注文IDのリスト
+            symbol: 取引ペア（注文ごとに送信する場合に使用）
+
+        Returns:
+            list[CancelResult]: order_ids と同じ順序のキャンセル結果
+        """
+        if not order_ids:
+            return []
+        results: dict[str, CancelResult] = {}
+        if self.config.cancel_bulk_enabled and time.monotonic() >= self._bulk_cancel_retry_at:
+            try:
+                results = await self._cancel_orders_bulk(order_ids)
+            except APIError as e:
+                if e.status in (404, 405):
+                    # 一時的な404（プロキシの経路誤りなど）もあり得るため、時間をおいて再び試す
+                    logger.warning(
+                        f"Bulk cancel endpoint not available ({e.status}), cancelling per order "
+                        f"for {self.config.cancel_bulk_retry_seconds:.0f}s"
+                    )
+                    self._bulk_cancel_retry_at = (
+                        time.monotonic() + self.config.cancel_bulk_retry_seconds
+                    )
+                else:
+                    logger.warning(f"Bulk cancel failed, cancelling per order: {e}")
+            else:
+                # 注文ごとの結果がない注文は、未決注文に残っていなければキャンセル済みとみなす
+                unconfirmed = [order_id for order_id in order_ids if order_id not in results]
+                if unconfirmed:
+                    still_open = await self._still_open(unconfirmed, symbol)
+                    for order_id in unconfirmed:
+                        if order_id not in still_open:
+                            results[order_id] = CancelResult(order_id)
+
+        semaphore = asyncio.Semaphore(max(1, self.config.cancel_max_concurrency))
+
+        async def cancel_one(order_id: str) -> CancelResult:
+            async with semaphore:
+                try:
+                    await self.cancel_order(order_id, symbol)
+                except APIError as e:
+                    if is_already_cancelled(e):
+                        return CancelResult(order_id)
+                    logger.error(f"Failed to cancel order {order_id}: {e}")
+                    return CancelResult(order_id, error=e)
+                return CancelResult(order_id)
+
+        remaining = [order_id for order_id in order_ids if order_id not in results]
+        for result in await asyncio.gather(*(cancel_one(order_id) for order_id in remaining)):
+            results[result.order_id] = result
+        return [results[order_id] for order_id in order_ids]
+
+    async def _cancel_orders_bulk(self, order_ids: Sequence[str]) -> dict[str, CancelResult]:
+        """
+        一括キャンセルAPIで送信（クライアント注文IDは取引所注文IDに解決）.
+
+        Args:
+            order_ids: 取引所注文ID、またはクライアント注文IDのリスト
+
+        Returns:
+            dict: レスポンスに注文ごとの結果が含まれていた注文の結果（order_ids の値がキー）
+        """
+        # 送信するID → 呼び出し元が指定したID
+        exchange_ids: dict[str, str] = {}
+        client_ids: dict[str, str] = {}
+        for order_id in order_ids:
+            if is_client_order_id(order_id):
+                exchange_id = self.order_ids.exchange_id(order_id)
+                if exchange_id is None:
+                    client_ids[order_id] = order_id
+                    continue
+                exchange_ids[exchange_id] = order_id
+            else:
+                exchange_ids[order_id] = order_id
+
+        payloads = []
+        if exchange_ids:
+            payloads.append(encode_cancel_orders(list(exchange_ids)))
+        if client_ids:
+            payloads.append(encode_cancel_orders_by_client_id(list(client_ids)))
+        responses = await asyncio.gather(
+            *(self._request("POST", "/api/cancel_orders", payload=p) for p in payloads)
+        )
+
+        results: dict[str, CancelResult] = {}
+        for response in responses:
+            for sent_id, (code, message) in decode_cancel_results(response).items():
+                requested_id = exchange_ids.get(sent_id) or client_ids.get(sent_id)
+                if requested_id is None:
+                    continue
+                order_id = requested_id
+                if code in (0, 200) or is_already_cancelled_rejection(code, message):
+                    results[order_id] = CancelResult(order_id)
+                else:
+                    # HTTP応答自体は成功 (200)。注文ごとの拒否は取引所のコードで表す
+                    error = APIError(f"Cancel rejected ({code}): {message}", status=200, code=code)
+                    logger.error(f"Failed to cancel order {order_id}: {error}")
+                    results[order_id] = CancelResult(order_id, error=error)
+        return results
+
+    async def _still_open(self, order_ids: Sequence[str], symbol: str) -> set[str]:
+        """
+        指定した注文のうち未決注文に残っているものを照会（キャッシュを使わない）.
+
+        Args:
+            order_ids: 取引所注文ID、またはクライアント注文IDのリスト
+            symbol: 取引ペア
+
+        Returns:
+            set[str]: 未決注文に残っている注文ID（照会に失敗した場合は order_ids 全体）
+        """
+        self.read_cache.invalidate("/api/query_open_orders")
+        try:
+            orders = await self.fetch_open_orders(symbol)
+        except APIError as e:
+            logger.warning(f"Could not verify bulk cancel, cancelling per order: {e}")
+            return set(order_ids)
+        open_ids = {order.id for order in orders}
+        open_ids.update(order.client_order_id for order in orders if order.client_order_id)
+        return {order_id for order_id in order_ids if order_id in open_ids}
+
+    async def cancel_all(self, symbol: str) -> list[CancelResult]:
+        """
+        取引ペアの未決注文をすべてキャンセル.
+
+        未決注文を照会（キャッシュを使わない）してから cancel_orders で送信する。
+
+        Args:
+            symbol: 取引ペア
+
+        Returns:
+            list[CancelResult]: 未決注文ごとのキャンセル結果
+        """
+        self.read_cache.invalidate("/api/query_open_orders")
+        orders = await self.fetch_open_orders(symbol)
+        return await self.cancel_orders([order.id for order in orders], symbol)
 
     async def get_open_orders(self, symbol: str) -> dict[str, Any]:
         """
@@ -306,7 +1204,7 @@ class StandXHTTPClient:
             dict: 未決注文一覧
         """
         path = f"/api/query_open_orders?symbol={symbol}"
-        return await self._request("GET", path)
+        return await self._cached_get(path, self.config.cache_ttl_orders_seconds)
 
     async def get_position(self, symbol: str) -> dict[str, Any]:
         """
@@ -319,7 +1217,7 @@ class StandXHTTPClient:
             dict: ポジション情報
         """
         path = f"/api/query_positions?symbol={symbol}"
-        return await self._request("GET", path)
+        return await self._cached_get(path, self.config.cache_ttl_position_seconds)
 
     async def get_balance(self) -> dict[str, Any]:
         """
@@ -339,4 +1237,37 @@ class StandXHTTPClient:
                 - equity: アカウント資産額
                 - pnl_freeze: 24時間実現損益
         """
-        return await self._request("GET", "/api/query_balance")
+        return await self._cached_get("/api/query_balance", self.config.cache_ttl_balance_seconds)
+
+    async def fetch_open_orders(self, symbol: str) -> list[Order]:
+        """
+        未決注文一覧を取得してモデルに変換.
+
+        Args:
+            symbol: 取引ペア
+
+        Returns:
+            list[Order]: 未決注文
+        """
+        return decode_open_orders(await self.get_open_orders(symbol), symbol)
+
+    async def fetch_position(self, symbol: str) -> Position | None:
+        """
+        ポジションを取得してモデルに変換.
+
+        Args:
+            symbol: 取引ペア
+
+        Returns:
+            Position | None: ポジション（なければNone）
+        """
+        return decode_position(await self.get_position(symbol), symbol)
+
+    async def fetch_balance(self) -> Balance:
+        """
+        残高を取得してモデルに変換.
+
+        Returns:
+            Balance: 残高情報
+        """
+        return decode_balance(await self.get_balance())
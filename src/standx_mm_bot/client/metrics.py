@@ -0,0 +1,309 @@
+"""リクエストレイテンシのヒストグラム計測.
+
+HDR Histogram と同じ対数線形バケット（2の冪ごとに一定数のサブバケット）で
+マイクロ秒単位のレイテンシを記録する。記録はリストのインクリメントのみで、
+パーセンタイルはスナップショット時に計算する。相対誤差は約 1/SUB_BUCKETS_HALF。
+"""
+
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+# 2の冪あたりのサブバケット数のビット数（5 → 最大相対誤差 約3%）
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+SUB_BUCKETS_HALF = SUB_BUCKETS >> 1
+
+# スナップショットで報告するパーセンタイル
+REPORTED_PERCENTILES = (50.0, 90.0, 99.0)
+
+# 接続フェーズ（tracing.create_trace_config で記録、aiohttp トランスポートのみ）
+PHASES = ("pool", "dns", "connect", "ttfb")
+
+
+def _bucket_index(value_us: int) -> int:
+    """値（マイクロ秒）からバケット番号を求める."""
+    if value_us < SUB_BUCKETS:
+        return max(0, value_us)
+    shift = value_us.bit_length() - SUB_BUCKET_BITS
+    top = value_us >> shift
+    return SUB_BUCKETS + (shift - 1) * SUB_BUCKETS_HALF + (top - SUB_BUCKETS_HALF)
+
+
+def _bucket_upper(index: int) -> int:
+    """バケットに含まれる最大値（マイクロ秒）."""
+    if index < SUB_BUCKETS:
+        return index
+    shift, offset = divmod(index - SUB_BUCKETS, SUB_BUCKETS_HALF)
+    shift += 1
+    return ((offset + SUB_BUCKETS_HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """対数線形バケットのレイテンシヒストグラム."""
+
+    __slots__ = ("_counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self) -> None:
+        """空のヒストグラムを作成."""
+        self._counts: list[int] = []
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        """
+        レイテンシを記録.
+
+        Args:
+            seconds: レイテンシ（秒）
+        """
+        value = int(seconds * 1_000_000)
+        index = _bucket_index(value)
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+
+        if self.count == 0 or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+        self.count += 1
+        self.total_us += value
+
+    def percentile(self, q: float) -> float:
+        """
+        パーセンタイル値を取得.
+
+        Args:
+            q: パーセンタイル (0-100)
+
+        Returns:
+            float: 該当バケットの上限値（秒、記録がなければ0.0）
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(self.count * q / 100 + 0.5))
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def merge(self, others: Iterable["LatencyHistogram"]) -> None:
+        """
+        他のヒストグラムの記録を合算.
+
+        Args:
+            others: 合算するヒストグラム
+        """
+        for other in others:
+            if other.count == 0:
+                continue
+            if len(other._counts) > len(self._counts):
+                self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+            for index, n in enumerate(other._counts):
+                self._counts[index] += n
+            self.min_us = other.min_us if self.count == 0 else min(self.min_us, other.min_us)
+            self.max_us = max(self.max_us, other.max_us)
+            self.count += other.count
+            self.total_us += other.total_us
+
+    def snapshot(self) -> dict[str, float | int]:
+        """
+        集計値のスナップショット.
+
+        Returns:
+            dict: count, mean_ms, min_ms, p50_ms, p90_ms, p99_ms, max_ms
+        """
+        result: dict[str, float | int] = {
+            "count": self.count,
+            "mean_ms": self.total_us / self.count / 1000 if self.count else 0.0,
+            "min_ms": self.min_us / 1000,
+        }
+        for q in REPORTED_PERCENTILES:
+            result[f"p{q:g}_ms"] = self.percentile(q) * 1000
+        result["max_ms"] = self.max_us / 1000
+        return result
+
+
+def status_class(status: int | None) -> str:
+    """
+    HTTPステータスを集計用の分類に変換.
+
+    Args:
+        status: HTTPステータス（応答なしはNone）
+
+    Returns:
+        str: "2xx" / "4xx" / "429" / "5xx" / "network"
+    """
+    if status is None:
+        return "network"
+    if status == 429:
+        return "429"
+    return f"{status // 100}xx"
+
+
+class RequestMetrics:
+    """
+    エンドポイント別のリクエストレイテンシ.
+
+    フェーズごとに分けて記録する:
+
+    - sign: リクエスト署名にかかった時間
+    - queue: レートリミッターで送信枠を待った時間
+    - network: 送信〜レスポンス読み込み完了（ステータス分類ごと）
+
+    network の内訳として接続フェーズ（PHASES）も記録できる:
+
+    - pool: コネクションプールの空きを待った時間（待たなかったリクエストは0）
+    - dns: DNS解決（キャッシュミス時のみ）
+    - connect: TCP・TLSハンドシェイク（新規接続時のみ、DNSを除く）
+    - ttfb: リクエストヘッダー送信〜レスポンスヘッダー受信
+    """
+
+    def __init__(self) -> None:
+        """空の計測器を作成."""
+        self._sign: dict[str, LatencyHistogram] = {}
+        self._queue: dict[str, LatencyHistogram] = {}
+        self._network: dict[tuple[str, str], LatencyHistogram] = {}
+        self._phases: dict[tuple[str, str], LatencyHistogram] = {}
+        self._reused: dict[str, int] = {}
+
+    def observe_sign(self, endpoint: str, seconds: float) -> None:
+        """署名時間を記録."""
+        _histogram(self._sign, endpoint).record(seconds)
+
+    def observe_queue(self, endpoint: str, seconds: float) -> None:
+        """送信待ち時間を記録."""
+        _histogram(self._queue, endpoint).record(seconds)
+
+    def observe_network(self, endpoint: str, status: int | None, seconds: float) -> None:
+        """ネットワーク時間を記録."""
+        _histogram(self._network, (endpoint, status_class(status))).record(seconds)
+
+    def observe_phase(self, endpoint: str, phase: str, seconds: float) -> None:
+        """接続フェーズの時間を記録."""
+        _histogram(self._phases, (endpoint, phase)).record(seconds)
+
+    def observe_reused_connection(self, endpoint: str) -> None:
+        """プールの既存接続を再利用したリクエストを記録."""
+        self._reused[endpoint] = self._reused.get(endpoint, 0) + 1
+
+    def phase_histogram(self, endpoint: str, phase: str) -> LatencyHistogram | None:
+        """
+        エンドポイントの接続フェーズの時間.
+
+        Args:
+            endpoint: エンドポイントパス
+            phase: フェーズ名（PHASES）
+
+        Returns:
+            LatencyHistogram | None: 記録中のヒストグラム（記録がなければNone）
+        """
+        return self._phases.get((endpoint, phase))
+
+    def success_histogram(self, endpoint: str) -> LatencyHistogram | None:
+        """
+        エンドポイントの成功 (2xx) リクエストのネットワーク時間.
+
+        Args:
+            endpoint: エンドポイントパス
+
+        Returns:
+            LatencyHistogram | None: 記録中のヒストグラム（記録がなければNone）
+        """
+        return self._network.get((endpoint, "2xx"))
+
+    def network_histogram(self, endpoint: str) -> LatencyHistogram:
+        """
+        エンドポイントの全ステータス分類を合算したネットワーク時間.
+
+        Args:
+            endpoint: エンドポイントパス
+
+        Returns:
+            LatencyHistogram: 合算したヒストグラム（コピー）
+        """
+        merged = LatencyHistogram()
+        merged.merge(h for (ep, _), h in self._network.items() if ep == endpoint)
+        return merged
+
+    def snapshot(self) -> dict[str, dict[str, object]]:
+        """
+        メトリクスのスナップショット.
+
+        Returns:
+            dict: エンドポイントごとの sign / queue / network（ステータス分類別）/
+            phases（フェーズ別）の集計値と、新規・再利用の接続数 (connections)
+        """
+        result: dict[str, dict[str, object]] = {}
+        for endpoint, histogram in self._sign.items():
+            result.setdefault(endpoint, {})["sign"] = histogram.snapshot()
+        for endpoint, histogram in self._queue.items():
+            result.setdefault(endpoint, {})["queue"] = histogram.snapshot()
+        for (endpoint, klass), histogram in self._network.items():
+            network = result.setdefault(endpoint, {}).setdefault("network", {})
+            assert isinstance(network, dict)
+            network[klass] = histogram.snapshot()
+        for (endpoint, phase), histogram in self._phases.items():
+            phases = result.setdefault(endpoint, {}).setdefault("phases", {})
+            assert isinstance(phases, dict)
+            phases[phase] = histogram.snapshot()
+        for endpoint in {ep for ep, _ in self._phases} | set(self._reused):
+            connect = self._phases.get((endpoint, "connect"))
+            result.setdefault(endpoint, {})["connections"] = {
+                "new": connect.count if connect is not None else 0,
+                "reused": self._reused.get(endpoint, 0),
+            }
+        return result
+
+    def format_summary(self) -> str:
+        """
+        ログ出力用の1エンドポイント1行のサマリー.
+
+        Returns:
+            str: サマリー文字列（記録がなければ空文字列）
+        """
+        lines = []
+        for endpoint in sorted({ep for ep, _ in self._network} | {ep for ep, _ in self._phases}):
+            network = self.network_histogram(endpoint)
+            parts = [f"{endpoint}: n={network.count}"]
+            if network.count:
+                parts += [
+                    f"net p50={network.percentile(50) * 1000:.1f}ms",
+                    f"p99={network.percentile(99) * 1000:.1f}ms",
+                    f"max={network.max_us / 1000:.1f}ms",
+                ]
+            queue = self._queue.get(endpoint)
+            if queue is not None and queue.count:
+                parts.append(f"queue p99={queue.percentile(99) * 1000:.1f}ms")
+            sign = self._sign.get(endpoint)
+            if sign is not None and sign.count:
+                parts.append(f"sign p50={sign.percentile(50) * 1_000_000:.0f}us")
+            errors = sum(
+                h.count
+                for (ep, klass), h in self._network.items()
+                if ep == endpoint and klass != "2xx"
+            )
+            if errors:
+                parts.append(f"errors={errors}")
+            for phase in PHASES:
+                histogram = self._phases.get((endpoint, phase))
+                if histogram is not None and histogram.count:
+                    parts.append(f"{phase} p99={histogram.percentile(99) * 1000:.1f}ms")
+            connect = self._phases.get((endpoint, "connect"))
+            if connect is not None and connect.count:
+                parts.append(f"new_conn={connect.count}")
+            lines.append(" ".join(parts))
+        return "\n".join(lines)
+
+
+def _histogram(histograms: dict[Any, LatencyHistogram], key: Hashable) -> LatencyHistogram:
+    """キーのヒストグラムを取得（なければ作成）."""
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = LatencyHistogram()
+    return histogram
@@ -0,0 +1,120 @@
+"""クライアント注文ID.
+
+発注ごとにクライアント注文ID (cl_ord_id) を生成し、取引所の注文IDとの
+対応を保持する。リトライ時は同じ cl_ord_id を送るため、取引所側で
+重複発注として弾かれる。
+"""
+
+import itertools
+import os
+import time
+from collections import OrderedDict
+
+from standx_mm_bot.client.exceptions import APIError, RateLimitError
+
+# クライアント注文IDの接頭辞（取引所の注文IDと区別するため）
+CLIENT_ORDER_ID_PREFIX = "mm"
+
+# 生成されるIDの長さ: 接頭辞 + 乱数(6) + 起動時刻(8) + 連番(6)
+_ID_LENGTH = len(CLIENT_ORDER_ID_PREFIX) + 6 + 8 + 6
+
+# 重複発注の拒否とみなすエラーメッセージ（小文字）
+DUPLICATE_ORDER_MARKERS = ("duplicate", "already exists")
+
+
+def is_client_order_id(value: str) -> bool:
+    """
+    このボットが生成したクライアント注文IDか判定.
+
+    Args:
+        value: 注文ID
+
+    Returns:
+        bool: クライアント注文IDならTrue
+    """
+    return value.startswith(CLIENT_ORDER_ID_PREFIX) and len(value) == _ID_LENGTH
+
+
+def is_duplicate_order(error: Exception) -> bool:
+    """
+    同じクライアント注文IDの再送が重複として拒否されたか判定.
+
+    Args:
+        error: 発注で発生したエラー
+
+    Returns:
+        bool: 重複発注の拒否ならTrue（最初の送信が受け付けられている）
+    """
+    if not isinstance(error, APIError) or isinstance(error, RateLimitError):
+        return False
+    if error.status is None or not 400 <= error.status < 500 or error.status == 401:
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in DUPLICATE_ORDER_MARKERS)
+
+
+class ClientOrderIds:
+    """
+    クライアント注文IDの生成と取引所注文IDとの対応表.
+
+    IDは プロセス固有の接頭辞 + 起動時刻 + 連番 で、再起動後も重複しない。
+    対応表は直近 ``capacity`` 件のみ保持する。
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        生成器を初期化.
+
+        Args:
+            capacity: 対応表に保持する注文数
+        """
+        self._prefix = f"{CLIENT_ORDER_ID_PREFIX}{os.urandom(3).hex()}{int(time.time()):x}"
+        self._seq = itertools.count()
+        self._capacity = capacity
+        self._exchange_ids: OrderedDict[str, str | None] = OrderedDict()
+
+    def new_id(self) -> str:
+        """
+        新しいクライアント注文IDを生成して対応表に登録.
+
+        Returns:
+            str: クライアント注文ID（固定長）
+        """
+        client_id = f"{self._prefix}{next(self._seq) % 0x1000000:06x}"
+        self.bind(client_id)
+        return client_id
+
+    def bind(self, client_id: str, exchange_id: str | None = None) -> None:
+        """
+        クライアント注文IDを登録し、判明していれば取引所注文IDを対応付ける.
+
+        Args:
+            client_id: クライアント注文ID
+            exchange_id: 取引所の注文ID
+        """
+        if exchange_id is None and self._exchange_ids.get(client_id) is not None:
+            return
+        self._exchange_ids[client_id] = exchange_id
+        self._exchange_ids.move_to_end(client_id)
+        while len(self._exchange_ids) > self._capacity:
+            self._exchange_ids.popitem(last=False)
+
+    def exchange_id(self, client_id: str) -> str | None:
+        """
+        クライアント注文IDに対応する取引所注文ID.
+
+        Args:
+            client_id: クライアント注文ID
+
+        Returns:
+            str | None: 取引所注文ID（未判明の場合はNone）
+        """
+        return self._exchange_ids.get(client_id)
+
+    def __contains__(self, client_id: object) -> bool:
+        """対応表に登録済みか."""
+        return client_id in self._exchange_ids
+
+    def __len__(self) -> int:
+        """対応表の件数."""
+        return len(self._exchange_ids)
@@ -0,0 +1,142 @@
+"""リクエストボディのエンコード.
+
+署名対象と送信データを同一のバイト列にするため、ボディはここで一度だけ
+エンコードする。発注・キャンセルはテンプレートを使い、辞書の再構築や
+json.dumps を経由せずに ``json.dumps(body, separators=(",", ":"))`` と
+同一のバイト列を生成する。
+"""
+
+import json
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+
+_NEW_ORDER_TEMPLATE = (
+    b'{"symbol":%b,"side":%b,"order_type":%b,"qty":"%b","price":"%b",'
+    b'"time_in_force":%b,"reduce_only":%b}'
+)
+_NEW_ORDER_WITH_CLIENT_ID_TEMPLATE = _NEW_ORDER_TEMPLATE[:-1] + b',"cl_ord_id":%b}'
+_CANCEL_ORDER_TEMPLATE = b'{"order_id":%b,"symbol":%b}'
+_CANCEL_ORDER_BY_CLIENT_ID_TEMPLATE = b'{"cl_ord_id":%b,"symbol":%b}'
+
+
+@lru_cache(maxsize=256)
+def _json_str(value: str) -> bytes:
+    """文字列をJSON文字列リテラルとしてエンコード（シンボル等の繰り返し値をキャッシュ）."""
+    return json.dumps(value).encode("utf-8")
+
+
+@lru_cache(maxsize=64)
+def _json_lower(value: str) -> bytes:
+    """小文字化してJSON文字列リテラルとしてエンコード（side/order_type用）."""
+    return json.dumps(value.lower()).encode("utf-8")
+
+
+def encode_body(body: dict[str, Any]) -> bytes:
+    """
+    任意のボディを正規形式でエンコード.
+
+    Args:
+        body: リクエストボディ
+
+    Returns:
+        bytes: コンパクトJSON（挿入順序を保持、sort_keysなし）
+    """
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def encode_new_order(
+    symbol: str,
+    side: str,
+    order_type: str,
+    qty: float,
+    price: float,
+    time_in_force: str,
+    reduce_only: bool,
+    cl_ord_id: str | None = None,
+) -> bytes:
+    """
+    new_order ボディをエンコード.
+
+    Args:
+        symbol: 取引ペア
+        side: 注文サイド（小文字に変換される）
+        order_type: 注文タイプ（小文字に変換される）
+        qty: 注文サイズ（文字列として送信）
+        price: 注文価格（文字列として送信）
+        time_in_force: 注文有効期限
+        reduce_only: ポジション縮小のみフラグ
+        cl_ord_id: クライアント注文ID（末尾に追加）
+
+    Returns:
+        bytes: 署名・送信用ボディ
+    """
+    fields = (
+        _json_str(symbol),
+        _json_lower(side),
+        _json_lower(order_type),
+        str(qty).encode("ascii"),
+        str(price).encode("ascii"),
+        _json_str(time_in_force),
+        b"true" if reduce_only else b"false",
+    )
+    if cl_ord_id is None:
+        return _NEW_ORDER_TEMPLATE % fields
+    return _NEW_ORDER_WITH_CLIENT_ID_TEMPLATE % (*fields, json.dumps(cl_ord_id).encode("utf-8"))
+
+
+def encode_cancel_order(order_id: str, symbol: str) -> bytes:
+    """
+    cancel_order ボディをエンコード.
+
+    Args:
+        order_id: 注文ID
+        symbol: 取引ペア
+
+    Returns:
+        bytes: 署名・送信用ボディ
+    """
+    return _CANCEL_ORDER_TEMPLATE % (json.dumps(order_id).encode("utf-8"), _json_str(symbol))
+
+
+def encode_cancel_order_by_client_id(cl_ord_id: str, symbol: str) -> bytes:
+    """
+    クライアント注文IDを指定した cancel_order ボディをエンコード.
+
+    Args:
+        cl_ord_id: クライアント注文ID
+        symbol: 取引ペア
+
+    Returns:
+        bytes: 署名・送信用ボディ
+    """
+    return _CANCEL_ORDER_BY_CLIENT_ID_TEMPLATE % (
+        json.dumps(cl_ord_id).encode("utf-8"),
+        _json_str(symbol),
+    )
+
+
+def encode_cancel_orders(order_ids: Sequence[str]) -> bytes:
+    """
+    cancel_orders（一括キャンセル）ボディをエンコード.
+
+    Args:
+        order_ids: 注文IDのリスト
+
+    Returns:
+        bytes: 署名・送信用ボディ
+    """
+    return encode_body({"order_id_list": list(order_ids)})
+
+
+def encode_cancel_orders_by_client_id(cl_ord_ids: Sequence[str]) -> bytes:
+    """
+    クライアント注文IDを指定した cancel_orders ボディをエンコード.
+
+    Args:
+        cl_ord_ids: クライアント注文IDのリスト
+
+    Returns:
+        bytes: 署名・送信用ボディ
+    """
+    return encode_body({"cl_ord_id_list": list(cl_ord_ids)})
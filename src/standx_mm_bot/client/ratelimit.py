@@ -0,0 +1,233 @@
+"""優先度付きトークンバケット・レートリミッター.
+
+キャンセル > 発注 > 照会 の厳格な優先度でリクエストの送信枠を割り当てる。
+待機中のリクエストは優先度順に処理されるため、約定回避のキャンセルが
+価格照会の後ろで待たされることはない。さらに一定数のトークンを
+キャンセル専用に確保し、発注・照会がそれを使い切らないようにする。
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Mapping
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """リクエスト優先度（値が小さいほど優先）."""
+
+    CANCEL = 0
+    PLACE = 1
+    QUERY = 2
+
+
+# パス別の優先度（クエリ文字列を除いたパス）
+PRIORITY_BY_PATH: dict[str, Priority] = {
+    "/api/cancel_order": Priority.CANCEL,
+    "/api/cancel_orders": Priority.CANCEL,
+    "/api/new_order": Priority.PLACE,
+}
+
+
+def priority_for_path(path: str) -> Priority:
+    """
+    リクエストパスから優先度を判定.
+
+    Args:
+        path: リクエストパス（クエリ文字列含む可）
+
+    Returns:
+        Priority: 優先度（不明なパスは照会扱い）
+    """
+    return PRIORITY_BY_PATH.get(path.partition("?")[0], Priority.QUERY)
+
+
+class PriorityRateLimiter:
+    """
+    優先度付きトークンバケット.
+
+    ``acquire()`` は送信枠が得られるまで待機する。サーバーのレート制限
+    ヘッダーや429応答を受け取った場合は ``update_from_headers()`` /
+    ``penalize()`` でバケットを調整する。
+    """
+
+    def __init__(self, rate: float, burst: float, cancel_reserve: float = 0.0):
+        """
+        レートリミッターを初期化.
+
+        Args:
+            rate: 1秒あたりの補充トークン数
+            burst: バケット容量
+            cancel_reserve: キャンセル専用に確保するトークン数
+        """
+        self.rate = rate
+        self.burst = burst
+        self.cancel_reserve = cancel_reserve
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._acquired = [0] * len(Priority)
+        self._delayed = [0] * len(Priority)
+        self._wait_seconds = [0.0] * len(Priority)
+        self._rate_limited = 0
+
+    async def acquire(self, priority: Priority = Priority.QUERY) -> float:
+        """
+        送信枠を1つ取得.
+
+        Args:
+            priority: リクエスト優先度
+
+        Returns:
+            float: 待機した秒数
+        """
+        self._refill()
+        if not self._waiters and self._try_take(priority):
+            self._acquired[priority] += 1
+            return 0.0
+
+        start = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        self._schedule()
+        try:
+            await future
+        finally:
+            # キャンセルされた場合もタイマーを張り直して後続を止めない
+            if future.cancelled():
+                self._schedule()
+
+        waited = time.monotonic() - start
+        self._acquired[priority] += 1
+        self._delayed[priority] += 1
+        self._wait_seconds[priority] += waited
+        return waited
+
+    def penalize(self, retry_after: float) -> None:
+        """
+        サーバーからレート制限 (429) を受けた場合に送信を一時停止.
+
+        Args:
+            retry_after: 停止する秒数
+        """
+        self._rate_limited += 1
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._schedule()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        レスポンスのレート制限ヘッダーでバケットを補正.
+
+        対応ヘッダー: X-RateLimit-Remaining, X-RateLimit-Reset (秒 or UNIX秒),
+        Retry-After (秒)
+
+        Args:
+            headers: レスポンスヘッダー
+        """
+        remaining = _parse_float(headers.get("X-RateLimit-Remaining"))
+        if remaining is not None:
+            self._refill()
+            self._tokens = min(self._tokens, remaining)
+            if remaining <= 0:
+                reset = _parse_float(headers.get("X-RateLimit-Reset"))
+                if reset is not None:
+                    # 大きな値はUNIX秒とみなす
+                    delay = reset - time.time() if reset > 1e9 else reset
+                    if delay > 0:
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+        retry_after = _parse_float(headers.get("Retry-After"))
+        if retry_after is not None and retry_after > 0:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def snapshot(self) -> dict[str, object]:
+        """
+        メトリクスのスナップショット.
+
+        Returns:
+            dict: tokens, waiting, rate_limited と優先度別の acquired/delayed/wait_seconds
+        """
+        self._refill()
+        waiting = [0] * len(Priority)
+        for priority, _, future in self._waiters:
+            if not future.done():
+                waiting[priority] += 1
+        return {
+            "tokens": self._tokens,
+            "rate_limited": self._rate_limited,
+            **{
+                p.name.lower(): {
+                    "acquired": self._acquired[p],
+                    "delayed": self._delayed[p],
+                    "waiting": waiting[p],
+                    "wait_seconds": self._wait_seconds[p],
+                }
+                for p in Priority
+            },
+        }
+
+    def _refill(self) -> None:
+        """経過時間分のトークンを補充."""
+        now = time.monotonic()
+        if now > self._updated_at:
+            start = max(self._updated_at, self._blocked_until)
+            if now > start:
+                self._tokens = min(self.burst, self._tokens + (now - start) * self.rate)
+            self._updated_at = now
+
+    def _required(self, priority: int) -> float:
+        """優先度ごとに送信に必要なトークン残量."""
+        return 1.0 if priority == Priority.CANCEL else 1.0 + self.cancel_reserve
+
+    def _try_take(self, priority: int) -> bool:
+        """トークンを消費できれば消費してTrueを返す."""
+        if time.monotonic() < self._blocked_until or self._tokens < self._required(priority):
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def _dispatch(self) -> None:
+        """待機中のリクエストに優先度順で送信枠を割り当てる."""
+        self._timer = None
+        self._refill()
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take(priority):
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """先頭の待機者が送信可能になる時刻にディスパッチを予約."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        if not self._waiters:
+            return
+
+        self._refill()
+        now = time.monotonic()
+        deficit = self._required(self._waiters[0][0]) - self._tokens
+        delay = max(0.0, self._blocked_until - now) + max(0.0, deficit / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+
+def _parse_float(value: str | None) -> float | None:
+    """ヘッダー値を数値に変換（不正値はNone）."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -0,0 +1,215 @@
+"""記録した通信の再生.
+
+- ``ReplayTransport``: 記録したRESTレスポンスを返すトランスポート。
+  ``StandXHTTPClient(config, jwt_token=..., transport=ReplayTransport(records))``
+  のように使う
+- ``WebSocketReplayer``: 記録したWebSocketフレームを ``StandXWebSocketClient`` に
+  記録時の間隔（または最速）で流し込む。既定では本番の受信ループと同じく
+  チャンネル別キューとコンシューマーを経由する（priceの置き換えも再現する）
+
+記録は capture.read_capture() で読み込む。
+"""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+from standx_mm_bot.client.decode import loads
+from standx_mm_bot.client.exceptions import NetworkError
+from standx_mm_bot.client.metrics import LatencyHistogram
+from standx_mm_bot.client.transport import TransportResponse
+from standx_mm_bot.client.websocket import StandXWebSocketClient
+
+
+def _request_key(method: str, url: str) -> tuple[str, str]:
+    """レスポンスの照合キー（ホストを除いたパスとクエリ）."""
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    return method.upper(), path
+
+
+class ReplayTransport:
+    """
+    記録したRESTレスポンスを返すトランスポート.
+
+    レスポンスはメソッド + パス（クエリを含む）ごとに記録順で返す。リクエストボディの
+    クライアント注文ID・署名は実行ごとに変わるため照合に使わない。
+    """
+
+    def __init__(
+        self,
+        records: Iterable[dict[str, Any]],
+        fallback: TransportResponse | None = None,
+    ):
+        """
+        トランスポートを初期化.
+
+        Args:
+            records: 記録（http 以外のレコードは無視）
+            fallback: 記録が尽きた・ない場合のレスポンス（省略時は NetworkError）
+        """
+        self._responses: dict[tuple[str, str], deque[dict[str, Any]]] = defaultdict(deque)
+        for record in records:
+            if record.get("k") == "http":
+                self._responses[_request_key(record["m"], record["u"])].append(record)
+        self.fallback = fallback
+        self.requests: list[tuple[str, str, bytes]] = []
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],  # noqa: ARG002
+        body: bytes,
+        timeout: float,  # noqa: ARG002
+    ) -> TransportResponse:
+        """記録したレスポンスを返す."""
+        self.requests.append((method, url, body))
+        queue = self._responses.get(_request_key(method, url))
+        if not queue:
+            if self.fallback is not None:
+                return self.fallback
+            raise NetworkError(f"No recorded response for {method} {url}", request_sent=False)
+
+        record = queue.popleft()
+        if "e" in record:
+            raise NetworkError(record["e"], request_sent=record.get("n", True))
+        return TransportResponse(
+            status=record["s"], headers=record.get("h", {}), body=record["b"].encode("utf-8")
+        )
+
+    async def close(self) -> None:
+        """何もしない."""
+
+    def remaining(self) -> int:
+        """
+        未使用の記録レスポンス数.
+
+        Returns:
+            int: 返していないレスポンスの数
+        """
+        return sum(len(queue) for queue in self._responses.values())
+
+
+@dataclass
+class ReplayStats:
+    """再生結果."""
+
+    frames: int = 0
+    errors: int = 0
+    elapsed: float = 0.0  # 秒
+    recorded_span: float = 0.0  # 記録の最初から最後のフレームまで（秒）
+    # フレームごとのコールバック所要時間（direct モードのみ記録）
+    dispatch: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # チャンネル別キューの統計（キュー経由の再生のみ）
+    queues: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        集計値のスナップショット.
+
+        Returns:
+            dict: frames, errors, elapsed, recorded_span, frames_per_second, dispatch, queues
+        """
+        return {
+            "frames": self.frames,
+            "errors": self.errors,
+            "elapsed": self.elapsed,
+            "recorded_span": self.recorded_span,
+            "frames_per_second": self.frames / self.elapsed if self.elapsed else 0.0,
+            "dispatch": self.dispatch.snapshot(),
+            "queues": self.queues,
+        }
+
+
+class WebSocketReplayer:
+    """記録したWebSocketフレームをクライアントに流し込む."""
+
+    def __init__(self, client: StandXWebSocketClient, records: Iterable[dict[str, Any]]):
+        """
+        再生器を初期化.
+
+        Args:
+            client: 再生先のクライアント（コールバック登録済み）
+            records: 記録（ws・start 以外のレコードは無視）
+        """
+        self.client = client
+        # (記録全体での経過秒, フレーム)。追記された複数の記録は続けて再生する
+        self.frames: list[tuple[float, str]] = []
+        offset = 0.0
+        last_at = 0.0
+        for record in records:
+            if record.get("k") == "start":
+                offset = last_at
+            elif record.get("k") == "ws":
+                last_at = offset + record["t"]
+                self.frames.append((last_at, record["d"]))
+
+    async def run(self, speed: float | None = 1.0, direct: bool = False) -> ReplayStats:
+        """
+        フレームを再生.
+
+        既定では受信ループと同じく ``_enqueue_message`` でチャンネル別キューに積み、
+        コンシューマーがコールバックを実行する。遅いコールバックがあると price は
+        本番同様に置き換わる（stats.queues の dropped）。再生の最後にキューが空に
+        なるまで待つ。
+
+        direct=True ではキューを経由せず ``_dispatch_message`` でフレームごとに
+        コールバックの完了まで待つ。置き換えは起きず、全フレームのコールバック
+        所要時間を stats.dispatch に記録する（コールバック単体の計測用）。
+
+        Args:
+            speed: 再生速度の倍率（1.0で記録時と同じ間隔、Noneで待たずに最速）
+            direct: キューを経由せずにディスパッチするか
+
+        Returns:
+            ReplayStats: 再生結果
+        """
+        stats = ReplayStats()
+        if not self.frames:
+            return stats
+        first_at = self.frames[0][0]
+        stats.recorded_span = self.frames[-1][0] - first_at
+
+        # 接続中のクライアントに流す場合は既存のコンシューマーを使い、止めない
+        owns_consumers = not direct and not self.client._consumers
+        if owns_consumers:
+            self.client._start_consumers()
+        started = time.perf_counter()
+        try:
+            for recorded_at, frame in self.frames:
+                if speed is not None and speed > 0:
+                    delay = (recorded_at - first_at) / speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                if direct:
+                    dispatch_started = time.perf_counter()
+                    try:
+                        await self.client._dispatch_message(loads(frame.encode("utf-8")))
+                    except Exception:
+                        stats.errors += 1
+                    stats.dispatch.record(time.perf_counter() - dispatch_started)
+                else:
+                    try:
+                        self.client._enqueue_message(loads(frame.encode("utf-8")))
+                    except Exception:
+                        stats.errors += 1
+                    # 受信ループの recv() と同じくフレームごとにコンシューマーへ制御を渡す
+                    await asyncio.sleep(0)
+                stats.frames += 1
+
+            if not direct:
+                await self.client._drain_queues()
+        finally:
+            if owns_consumers:
+                await self.client._stop_consumers()
+
+        stats.elapsed = time.perf_counter() - started
+        if not direct:
+            stats.queues = self.client.queue_stats()
+        return stats
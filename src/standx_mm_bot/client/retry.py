@@ -0,0 +1,138 @@
+"""リトライポリシー.
+
+エンドポイント種別（照会・キャンセル・発注）ごとに、指数バックオフ +
+ジッター・最大試行回数・合計期限を定める。
+
+発注は冪等ではないため、サーバーが処理していないことが確実な失敗
+（429、接続確立前のネットワークエラー）のみリトライする。
+"""
+
+import random
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+
+from standx_mm_bot.client.breaker import CircuitOpenError
+from standx_mm_bot.client.exceptions import APIError, NetworkError, RateLimitError
+from standx_mm_bot.client.ratelimit import Priority
+
+# 一時的な障害とみなすHTTPステータス
+TRANSIENT_STATUSES = frozenset({500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """リトライポリシー."""
+
+    max_attempts: int = 4
+    base_delay: float = 0.05  # 秒
+    max_delay: float = 1.0  # 秒
+    deadline: float = 3.0  # 最初の送信からの合計秒数
+    # 5xx応答をリトライするか（サーバーが処理した可能性がある）
+    retry_server_errors: bool = True
+    # 送信後のネットワークエラー・タイムアウトをリトライするか（処理済みの可能性がある）
+    retry_ambiguous: bool = True
+
+    def should_retry(self, error: Exception) -> bool:
+        """
+        エラーがリトライ対象か判定.
+
+        Args:
+            error: 発生したエラー
+
+        Returns:
+            bool: リトライ対象ならTrue
+        """
+        if isinstance(error, RateLimitError):
+            return True
+        if isinstance(error, CircuitOpenError):
+            # 障害中は即座に失敗させる
+            return False
+        if isinstance(error, NetworkError):
+            return not error.request_sent or self.retry_ambiguous
+        if isinstance(error, APIError) and error.status in TRANSIENT_STATUSES:
+            return self.retry_server_errors
+        return False
+
+    def backoff(self, attempt: int, rng: random.Random | None = None) -> float:
+        """
+        リトライ前の待機秒数（Full Jitter）.
+
+        Args:
+            attempt: 失敗した試行の番号（1始まり）
+            rng: 乱数生成器（テスト用）
+
+        Returns:
+            float: 待機秒数
+        """
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return (rng or random).uniform(0, cap)
+
+    def deduplicated(self) -> "RetryPolicy":
+        """
+        クライアント注文IDで取引所が重複を弾くリクエスト用のポリシー.
+
+        再送しても二重発注にならないため、5xx・送信後のネットワークエラーもリトライする。
+
+        Returns:
+            RetryPolicy: 曖昧な失敗もリトライするポリシー
+        """
+        return _deduplicated(self)
+
+
+@lru_cache(maxsize=8)
+def _deduplicated(policy: RetryPolicy) -> RetryPolicy:
+    return replace(policy, retry_server_errors=True, retry_ambiguous=True)
+
+
+def default_policies(
+    max_attempts: int, base_delay: float, max_delay: float, deadline: float
+) -> dict[Priority, RetryPolicy]:
+    """
+    エンドポイント種別ごとのデフォルトポリシーを作成.
+
+    Args:
+        max_attempts: 最大試行回数
+        base_delay: 初回バックオフ上限（秒）
+        max_delay: バックオフ上限（秒）
+        deadline: 合計期限（秒）
+
+    Returns:
+        dict: 優先度（エンドポイント種別）→ポリシー
+    """
+    idempotent = RetryPolicy(
+        max_attempts=max_attempts, base_delay=base_delay, max_delay=max_delay, deadline=deadline
+    )
+    return {
+        Priority.QUERY: idempotent,
+        Priority.CANCEL: idempotent,
+        # 発注: 二重発注を避けるため未処理が確実な失敗のみ
+        Priority.PLACE: RetryPolicy(
+            max_attempts=max_attempts,
+            base_delay=base_delay,
+            max_delay=max_delay,
+            deadline=deadline,
+            retry_server_errors=False,
+            retry_ambiguous=False,
+        ),
+    }
+
+
+@dataclass
+class RetryStats:
+    """リトライ統計（エンドポイント種別ごと）."""
+
+    retries: int = 0
+    retry_seconds: float = 0.0
+    recovered: int = 0
+    exhausted: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def snapshot(self) -> dict[str, object]:
+        """メトリクスのスナップショット."""
+        return {
+            "retries": self.retries,
+            "retry_seconds": self.retry_seconds,
+            "recovered": self.recovered,
+            "exhausted": self.exhausted,
+            "errors": dict(self.errors),
+        }
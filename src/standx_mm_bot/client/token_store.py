@@ -0,0 +1,128 @@
+"""JWTトークンの永続キャッシュ."""
+
+import base64
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """キャッシュされたJWTトークン."""
+
+    token: str
+    expires_at: float  # UNIX秒 (JWTのexpクレーム)
+    address: str
+    chain: str
+    auth_url: str  # 発行元の認証APIベースURL（本番とモック取引所のトークンを区別）
+
+    def remaining_seconds(self, now: float | None = None) -> float:
+        """
+        有効期限までの残り秒数.
+
+        Args:
+            now: 現在時刻（UNIX秒、省略時はtime.time()）
+
+        Returns:
+            float: 残り秒数（期限切れの場合は負）
+        """
+        return self.expires_at - (time.time() if now is None else now)
+
+
+def token_expiry(token: str, default_ttl: float) -> float:
+    """
+    JWTのexpクレームを取得.
+
+    Args:
+        token: JWTトークン
+        default_ttl: expが取得できない場合に使う有効期間（秒）
+
+    Returns:
+        float: 有効期限（UNIX秒）
+    """
+    # 署名検証は不要なため、PyJWTを読み込まずにペイロード部のみデコードする
+    try:
+        payload_b64 = token.split(".")[1]
+        payload_b64 += "=" * (-len(payload_b64) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload_b64))
+        return float(claims["exp"])
+    except Exception:
+        return time.time() + default_ttl
+
+
+class TokenStore:
+    """
+    JWTトークンをローカルファイルに保存するストア.
+
+    ファイルは所有者のみ読み書き可能 (0600) で作成し、
+    再起動時の prepare-signin / login の往復を省略するために使う。
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        トークンストアを初期化.
+
+        Args:
+            path: キャッシュファイルのパス
+        """
+        self.path = Path(path)
+
+    def load(
+        self, address: str, chain: str, auth_url: str, min_validity: float = 0.0
+    ) -> CachedToken | None:
+        """
+        キャッシュ済みトークンを読み込む.
+
+        Args:
+            address: ウォレットアドレス（一致しない場合は無効）
+            chain: チェーン（一致しない場合は無効）
+            auth_url: 認証APIのベースURL（一致しない場合は無効）
+            min_validity: 最低限必要な残り有効期間（秒）
+
+        Returns:
+            CachedToken | None: 有効なトークン、なければNone
+        """
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            cached = CachedToken(
+                token=str(data["token"]),
+                expires_at=float(data["expires_at"]),
+                address=str(data["address"]),
+                chain=str(data["chain"]),
+                # auth_url のない旧形式のキャッシュは発行元が不明なため一致させない
+                auth_url=str(data.get("auth_url", "")),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable JWT cache {self.path}: {e}")
+            return None
+
+        if cached.address != address or cached.chain != chain or cached.auth_url != auth_url:
+            return None
+        if cached.remaining_seconds() <= min_validity:
+            return None
+        return cached
+
+    def save(self, cached: CachedToken) -> None:
+        """
+        トークンを保存（一時ファイル経由でアトミックに置き換え）.
+
+        Args:
+            cached: 保存するトークン
+        """
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(cached), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to write JWT cache {self.path}: {e}")
@@ -0,0 +1,121 @@
+"""aiohttp のトレースフックによる接続フェーズの計測.
+
+遅い注文の原因がDNS・コネクションプールの枯渇・TCP/TLSハンドシェイク・
+取引所の処理時間のどれかを切り分けるため、リクエストごとにフェーズ別の時間を
+RequestMetrics に記録する（フェーズの定義は RequestMetrics を参照）。
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from standx_mm_bot.client.metrics import RequestMetrics
+
+
+def create_trace_config(metrics: RequestMetrics) -> aiohttp.TraceConfig:
+    """
+    接続フェーズを記録するトレース設定を作成.
+
+    ``aiohttp.ClientSession(trace_configs=[...])`` に渡す。エンドポイントは
+    リクエストURLのパス（クエリを除く）で、RequestMetrics の他の記録と一致する。
+
+    Args:
+        metrics: 記録先
+
+    Returns:
+        aiohttp.TraceConfig: トレース設定
+    """
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(
+        _session: aiohttp.ClientSession,
+        ctx: SimpleNamespace,
+        params: aiohttp.TraceRequestStartParams,
+    ) -> None:
+        ctx.endpoint = params.url.path
+        ctx.queued_at = None
+        ctx.pool_wait = 0.0
+        ctx.dns_at = None
+        ctx.dns = 0.0
+        ctx.connect_at = None
+        ctx.sent_at = None
+
+    async def on_connection_queued_start(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        ctx.queued_at = time.perf_counter()
+
+    async def on_connection_queued_end(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        if ctx.queued_at is not None:
+            ctx.pool_wait += time.perf_counter() - ctx.queued_at
+            ctx.queued_at = None
+
+    async def on_dns_resolvehost_start(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        ctx.dns_at = time.perf_counter()
+
+    async def on_dns_resolvehost_end(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        if ctx.dns_at is not None:
+            elapsed = time.perf_counter() - ctx.dns_at
+            ctx.dns += elapsed
+            ctx.dns_at = None
+            metrics.observe_phase(ctx.endpoint, "dns", elapsed)
+
+    async def on_connection_create_start(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        ctx.connect_at = time.perf_counter()
+        ctx.dns = 0.0
+
+    async def on_connection_create_end(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        if ctx.connect_at is not None:
+            # 新規接続の確立にはDNS解決も含まれるため差し引く
+            elapsed = time.perf_counter() - ctx.connect_at - ctx.dns
+            ctx.connect_at = None
+            metrics.observe_phase(ctx.endpoint, "connect", max(0.0, elapsed))
+
+    async def on_connection_reuseconn(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        metrics.observe_reused_connection(ctx.endpoint)
+
+    async def on_request_headers_sent(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        ctx.sent_at = time.perf_counter()
+
+    async def on_request_end(
+        _session: aiohttp.ClientSession, ctx: SimpleNamespace, _params: object
+    ) -> None:
+        # レスポンスヘッダー受信時点（ボディ読み込み前）に呼ばれる
+        now = time.perf_counter()
+        metrics.observe_phase(ctx.endpoint, "pool", ctx.pool_wait)
+        if ctx.sent_at is not None:
+            metrics.observe_phase(ctx.endpoint, "ttfb", now - ctx.sent_at)
+
+    # シグナルの型定義は aiohttp・aiosignal のバージョンで異なるため型を問わず登録する
+    hooks: list[tuple[Any, Callable[..., Awaitable[None]]]] = [
+        (trace_config.on_request_start, on_request_start),
+        (trace_config.on_connection_queued_start, on_connection_queued_start),
+        (trace_config.on_connection_queued_end, on_connection_queued_end),
+        (trace_config.on_dns_resolvehost_start, on_dns_resolvehost_start),
+        (trace_config.on_dns_resolvehost_end, on_dns_resolvehost_end),
+        (trace_config.on_connection_create_start, on_connection_create_start),
+        (trace_config.on_connection_create_end, on_connection_create_end),
+        (trace_config.on_connection_reuseconn, on_connection_reuseconn),
+        (trace_config.on_request_headers_sent, on_request_headers_sent),
+        (trace_config.on_request_end, on_request_end),
+    ]
+    for signal, callback in hooks:
+        signal.append(callback)
+    return trace_config
@@ -0,0 +1,217 @@
+"""HTTPトランスポート.
+
+``StandXHTTPClient`` は署名・リトライ・レート制限を担当し、実際の送受信は
+``Transport`` に委譲する。トランスポートはレスポンス全体（ステータス・ヘッダー・
+ボディのバイト列）を返し、通信エラーを ``NetworkError`` に変換する。
+
+- aiohttp: HTTP/1.1。同時リクエスト数だけ接続を使う（デフォルト）
+- http2: httpx による HTTP/2。同時リクエストを1本の接続に多重化する
+  （任意依存: ``pip install 'standx-mm-bot[http2]'``）
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+import aiohttp
+
+from standx_mm_bot.client.exceptions import NetworkError
+
+# 設定 (HTTP_TRANSPORT) で選択できるトランスポート
+TRANSPORTS = ("aiohttp", "http2")
+
+
+@dataclass(frozen=True, slots=True)
+class TransportResponse:
+    """読み込み済みのレスポンス."""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+    def text(self) -> str:
+        """ボディを文字列として取得（エラーメッセージ用）."""
+        return self.body.decode("utf-8", errors="replace")
+
+
+class Transport(Protocol):
+    """HTTPトランスポートのインターフェース."""
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        timeout: float,
+    ) -> TransportResponse:
+        """
+        リクエストを送信してレスポンス全体を読み込む.
+
+        Args:
+            method: HTTPメソッド
+            url: リクエストURL
+            headers: リクエストヘッダー
+            body: リクエストボディ（空の場合は送信しない）
+            timeout: タイムアウト（秒、レスポンス読み込み完了まで）
+
+        Returns:
+            TransportResponse: レスポンス
+
+        Raises:
+            NetworkError: 通信エラー・タイムアウト
+        """
+        ...
+
+    async def close(self) -> None:
+        """接続を閉じる."""
+        ...
+
+
+class AiohttpTransport:
+    """aiohttp (HTTP/1.1) トランスポート."""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        """
+        トランスポートを初期化.
+
+        Args:
+            session: 送信に使うセッション（close() で閉じる）
+        """
+        self.session = session
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        timeout: float,
+    ) -> TransportResponse:
+        """リクエストを送信してレスポンス全体を読み込む."""
+        request_kwargs: dict[str, Any] = {"data": body} if body else {}
+        try:
+            async with self.session.request(
+                method,
+                url,
+                headers=dict(headers),
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                **request_kwargs,
+            ) as resp:
+                return TransportResponse(
+                    status=resp.status, headers=resp.headers, body=await resp.read()
+                )
+        except aiohttp.ClientConnectorError as e:
+            # 接続確立前の失敗: サーバーには届いていない
+            raise NetworkError(f"Network error: {e}", request_sent=False) from e
+        except TimeoutError as e:
+            raise NetworkError(f"Network error: timed out after {timeout:.2f}s") from e
+        except aiohttp.ClientError as e:
+            raise NetworkError(f"Network error: {e!r}") from e
+
+    async def close(self) -> None:
+        """セッションを閉じる."""
+        await self.session.close()
+
+
+class Http2Transport:
+    """
+    httpx による HTTP/2 トランスポート.
+
+    同一ホストへの同時リクエストは1本の接続上のストリームとして多重化されるため、
+    両サイドの発注・キャンセルを同時に送っても新規接続・接続待ちが発生しない。
+    """
+
+    def __init__(self, pool_size: int = 2, keepalive_seconds: float = 75.0):
+        """
+        トランスポートを初期化.
+
+        Args:
+            pool_size: 最大接続数（HTTP/2では通常1本で足りる）
+            keepalive_seconds: アイドル接続の保持時間（秒）
+
+        Raises:
+            RuntimeError: httpx (h2) がインストールされていない
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise RuntimeError(
+                "HTTP_TRANSPORT=http2 requires httpx with HTTP/2 support. "
+                "Install with: pip install 'standx-mm-bot[http2]'"
+            ) from e
+
+        self._httpx = httpx
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=keepalive_seconds,
+            ),
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        timeout: float,
+    ) -> TransportResponse:
+        """リクエストを送信してレスポンス全体を読み込む."""
+        httpx = self._httpx
+        try:
+            resp = await self.client.request(
+                method, url, headers=dict(headers), content=body or None, timeout=timeout
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+            # 接続確立前の失敗: サーバーには届いていない
+            raise NetworkError(f"Network error: {e!r}", request_sent=False) from e
+        except httpx.TimeoutException as e:
+            raise NetworkError(f"Network error: timed out after {timeout:.2f}s") from e
+        except httpx.HTTPError as e:
+            raise NetworkError(f"Network error: {e!r}") from e
+        return TransportResponse(status=resp.status_code, headers=resp.headers, body=resp.content)
+
+    async def close(self) -> None:
+        """接続を閉じる."""
+        await self.client.aclose()
+
+
+def create_transport(
+    name: str,
+    *,
+    connector: aiohttp.BaseConnector | None = None,
+    timeout: float = 10.0,
+    pool_size: int = 2,
+    keepalive_seconds: float = 75.0,
+    trace_configs: list[aiohttp.TraceConfig] | None = None,
+) -> Transport:
+    """
+    設定名からトランスポートを作成.
+
+    Args:
+        name: トランスポート名 ("aiohttp" / "http2")
+        connector: aiohttp のコネクタ（aiohttp のみ）
+        timeout: リクエスト単位の指定がない通信のタイムアウト（秒、aiohttp のみ）
+        pool_size: 最大接続数（http2 のみ）
+        keepalive_seconds: アイドル接続の保持時間（秒、http2 のみ）
+        trace_configs: aiohttp のトレース設定（aiohttp のみ）
+
+    Returns:
+        Transport: トランスポート
+
+    Raises:
+        ValueError: 未対応のトランスポート名
+    """
+    if name == "aiohttp":
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            trace_configs=trace_configs,
+        )
+        return AiohttpTransport(session)
+    if name == "http2":
+        return Http2Transport(pool_size=pool_size, keepalive_seconds=keepalive_seconds)
+    raise ValueError(f"Unsupported HTTP transport: {name} (available: {', '.join(TRANSPORTS)})")
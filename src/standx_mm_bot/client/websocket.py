@@ -1,14 +1,25 @@
-"""WebSocket クライアント."""
+"""WebSocket クライアント.
+
+受信ループはメッセージをチャンネル別のキュー（channel.ChannelQueue）に積み、
+コールバックはチャンネルごとのコンシューマータスクで実行する。price は未処理の
+メッセージを最新の1件に置き換え（古い価格では判断しない）、order・trade は
+全件を受信順に処理する。
+"""
 
 import asyncio
 import json
 import logging
+import time
 from collections.abc import Awaitable, Callable
 from typing import Any
 
 import websockets
 from websockets.asyncio.client import ClientConnection
 
+from standx_mm_bot.client.capture import TrafficRecorder
+from standx_mm_bot.client.channel import ChannelQueue
+from standx_mm_bot.client.clock import ClockSync, parse_server_time_ms
+from standx_mm_bot.client.decode import loads
 from standx_mm_bot.config import Settings
 
 logger = logging.getLogger(__name__)
@@ -17,23 +28,40 @@ logger = logging.getLogger(__name__)
 class StandXWebSocketClient:
     """StandX WebSocket クライアント."""
 
-    def __init__(self, config: Settings):
+    def __init__(self, config: Settings, clock: ClockSync | None = None):
         """
         WebSocketクライアントを初期化.
 
         Args:
             config: アプリケーション設定
+            clock: サーバー時刻推定器（指定時はpriceメッセージの時刻でオフセットを補正）
         """
         self.config = config
-        self.ws_url = "wss://perps.standx.com/ws-stream/v1"
+        self.clock = clock
+        self.ws_url = config.standx_ws_url
         self.reconnect_interval = config.ws_reconnect_interval / 1000  # ms to seconds
         self.ws: ClientConnection | None = None
+        # 受信フレームの記録先（capture_path 設定時、接続中のみ）
+        self._recorder: TrafficRecorder | None = None
         self._running = False
         self._callbacks: dict[str, list[Callable[[dict[str, Any]], Awaitable[None]]]] = {
             "price": [],
             "order": [],
             "trade": [],
         }
+        # チャンネル → ハンドラの対応表（if/elif の連鎖を辿らずに1回の辞書引きで分岐）
+        self._handlers: dict[str, Callable[[dict[str, Any]], Awaitable[None]]] = {
+            "price": self._handle_price,
+            "order": self._handle_order,
+            "trade": self._handle_trade,
+        }
+        # 受信ループとコールバックの間のキュー（price のみ最新の1件に置き換え）
+        self._queues: dict[str, ChannelQueue] = {
+            "price": ChannelQueue(conflate=True),
+            "order": ChannelQueue(),
+            "trade": ChannelQueue(),
+        }
+        self._consumers: list[asyncio.Task[None]] = []
 
     def on_price_update(self, callback: Callable[[dict[str, Any]], Awaitable[None]]) -> None:
         """
@@ -84,63 +112,173 @@ class StandXWebSocketClient:
         await ws.send(json.dumps(trade_sub))
         logger.info("Subscribed to trade channel")
 
-    async def _dispatch_message(self, message: dict[str, Any]) -> None:
+    def queue_stats(self) -> dict[str, dict[str, int]]:
         """
-        受信メッセージを適切なコールバックにディスパッチ.
+        チャンネル別キューの統計.
+
+        Returns:
+            dict: チャンネル名 → depth, max_depth, received, dropped
+        """
+        return {channel: queue.snapshot() for channel, queue in self._queues.items()}
+
+    def _enqueue_message(self, message: dict[str, Any]) -> None:
+        """
+        受信メッセージをチャンネルのキューに積む（コールバックは待たない）.
+
+        サーバー時刻の観測はキュー待ちの時間を含めないよう受信時点で行う。
 
         Args:
             message: 受信したメッセージ
         """
+        # エラーメッセージをスキップ
+        if "code" in message and message["code"] != 200:
+            logger.warning(f"WebSocket error message: {message}")
+            return
+
         channel = message.get("channel", "")
+        queue = self._queues.get(channel)
+        if queue is None:
+            return
+        data = message.get("data", {})
+        if self.clock is not None and channel == "price":
+            self._observe_server_time(data)
+        queue.put(data)
 
+    async def _consume(self, channel: str, queue: ChannelQueue) -> None:
+        """
+        チャンネルのキューからメッセージを取り出してコールバックを実行.
+
+        Args:
+            channel: チャンネル名
+            queue: チャンネルのキュー
+        """
+        while True:
+            data = await queue.get()
+            try:
+                await self._run_callbacks(channel, data)
+            finally:
+                queue.task_done()
+
+    def _start_consumers(self) -> None:
+        """チャンネルごとのコンシューマータスクを起動."""
+        if not self._consumers:
+            self._consumers = [
+                asyncio.create_task(self._consume(channel, queue))
+                for channel, queue in self._queues.items()
+            ]
+
+    async def _stop_consumers(self) -> None:
+        """コンシューマータスクを停止（未処理のメッセージは破棄）."""
+        consumers, self._consumers = self._consumers, []
+        for task in consumers:
+            task.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        for queue in self._queues.values():
+            queue.clear()
+
+    async def _drain_queues(self) -> None:
+        """キューに積んだメッセージのコールバックがすべて終わるまで待つ."""
+        await asyncio.gather(*(queue.join() for queue in self._queues.values()))
+
+    async def _dispatch_message(self, message: dict[str, Any]) -> None:
+        """
+        受信メッセージを適切なコールバックに直接ディスパッチ.
+
+        キューを経由せずコールバックの完了まで待つ（再生の direct モードやテストで使用）。
+
+        Args:
+            message: 受信したメッセージ
+        """
         # エラーメッセージをスキップ
-        if "code" in message and message.get("code") != 200:
+        if "code" in message and message["code"] != 200:
             logger.warning(f"WebSocket error message: {message}")
             return
 
-        # price チャンネル
-        if channel == "price":
-            for callback in self._callbacks["price"]:
-                try:
-                    await callback(message.get("data", {}))
-                except Exception as e:
-                    logger.error(f"Error in price callback: {e}")
+        handler = self._handlers.get(message.get("channel", ""))
+        if handler is not None:
+            await handler(message.get("data", {}))
 
-        # order チャンネル
-        elif channel == "order":
-            for callback in self._callbacks["order"]:
-                try:
-                    await callback(message.get("data", {}))
-                except Exception as e:
-                    logger.error(f"Error in order callback: {e}")
+    async def _handle_price(self, data: dict[str, Any]) -> None:
+        """
+        priceチャンネルのメッセージを処理.
 
-        # trade チャンネル
-        elif channel == "trade":
-            for callback in self._callbacks["trade"]:
-                try:
-                    await callback(message.get("data", {}))
-                except Exception as e:
-                    logger.error(f"Error in trade callback: {e}")
+        Args:
+            data: メッセージのdata部
+        """
+        if self.clock is not None:
+            self._observe_server_time(data)
+        await self._run_callbacks("price", data)
+
+    async def _handle_order(self, data: dict[str, Any]) -> None:
+        """
+        orderチャンネルのメッセージを処理.
+
+        Args:
+            data: メッセージのdata部
+        """
+        await self._run_callbacks("order", data)
+
+    async def _handle_trade(self, data: dict[str, Any]) -> None:
+        """
+        tradeチャンネルのメッセージを処理.
+
+        Args:
+            data: メッセージのdata部
+        """
+        await self._run_callbacks("trade", data)
+
+    async def _run_callbacks(self, channel: str, data: dict[str, Any]) -> None:
+        """
+        チャンネルのコールバックを登録順に実行.
+
+        コールバックのエラーはログに記録し、後続のコールバックは実行する。
+
+        Args:
+            channel: チャンネル名
+            data: メッセージのdata部
+        """
+        for callback in self._callbacks[channel]:
+            try:
+                await callback(data)
+            except Exception as e:
+                logger.error(f"Error in {channel} callback: {e}")
+
+    def _observe_server_time(self, data: dict[str, Any]) -> None:
+        """
+        メッセージのサーバー時刻をオフセット推定に使用.
+
+        Args:
+            data: メッセージのdata部
+        """
+        if self.clock is None:
+            return
+        server_ms = parse_server_time_ms(data.get("time"))
+        if server_ms is not None:
+            self.clock.observe_server_time(server_ms, time.time() * 1000)
 
     async def _receive_messages(self, ws: ClientConnection) -> None:
         """
-        メッセージを受信してディスパッチ.
+        メッセージを受信してチャンネルのキューに積む.
 
         Args:
             ws: WebSocket接続
         """
-        async for message in ws:
-            if not self._running:
-                break
-
+        # テキストフレームもUTF-8デコードせずバイト列のまま受け取り、直接JSONデコードする
+        while self._running:
             try:
-                logger.debug(f"Received raw message: {message!r} (type: {type(message)})")
-                # メッセージが既にstrの場合とbytesの場合を処理
-                message_str = message.decode("utf-8") if isinstance(message, bytes) else message
+                message = await ws.recv(decode=False)
+            except websockets.ConnectionClosedOK:
+                return
+
+            if self._recorder is not None:
+                self._recorder.record_ws(message)
 
-                data = json.loads(message_str)
-                logger.debug(f"Parsed message: {data}")
-                await self._dispatch_message(data)
+            try:
+                data = loads(message)
+                # ログの整形は DEBUG 有効時のみ（price は最も高頻度の入力）
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received message: %r", message)
+                self._enqueue_message(data)
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse WebSocket message: {e}, raw: {message!r}")
             except Exception as e:
@@ -154,23 +292,32 @@ class StandXWebSocketClient:
         """
         self._running = True
         logger.info(f"Connecting to WebSocket: {self.ws_url}")
+        if self.config.capture_path:
+            self._recorder = TrafficRecorder.shared(self.config.capture_path)
+        self._start_consumers()
 
-        while self._running:
-            try:
-                async with websockets.connect(self.ws_url) as ws:
-                    self.ws = ws
-                    logger.info("WebSocket connected")
+        try:
+            while self._running:
+                try:
+                    async with websockets.connect(self.ws_url) as ws:
+                        self.ws = ws
+                        logger.info("WebSocket connected")
 
-                    await self._subscribe_channels(ws)
-                    await self._receive_messages(ws)
+                        await self._subscribe_channels(ws)
+                        await self._receive_messages(ws)
 
-            except websockets.ConnectionClosed:
-                logger.warning("WebSocket disconnected, reconnecting...")
-                await asyncio.sleep(self.reconnect_interval)
+                except websockets.ConnectionClosed:
+                    logger.warning("WebSocket disconnected, reconnecting...")
+                    await asyncio.sleep(self.reconnect_interval)
 
-            except Exception as e:
-                logger.error(f"WebSocket error: {e}")
-                await asyncio.sleep(self.reconnect_interval)
+                except Exception as e:
+                    logger.error(f"WebSocket error: {e}")
+                    await asyncio.sleep(self.reconnect_interval)
+        finally:
+            if self._recorder is not None:
+                self._recorder.release()
+                self._recorder = None
+            await self._stop_consumers()
 
         logger.info("WebSocket client stopped")
 
@@ -15,6 +15,13 @@ class Settings(BaseSettings):
         None, description="APIリクエスト署名用Ed25519秘密鍵（BSC専用、Solanaはウォレット鍵を使用）"
     )
 
+    # 接続先（モック取引所に向ける場合に変更）
+    standx_api_url: str = Field("https://perps.standx.com", description="取引REST APIのベースURL")
+    standx_auth_url: str = Field("https://api.standx.com", description="認証APIのベースURL")
+    standx_ws_url: str = Field(
+        "wss://perps.standx.com/ws-stream/v1", description="WebSocketストリームのURL"
+    )
+
     # 取引設定
     symbol: str = Field("ETH-USD", description="取引ペア")
     order_size: float = Field(
@@ -28,9 +35,113 @@ class Settings(BaseSettings):
     reposition_threshold_bps: float = Field(2.0, description="10bps境界への接近しきい値 (bps)")
     price_move_threshold_bps: float = Field(5.0, description="価格変動による再配置しきい値 (bps)")
 
+    # 再配置戦略
+    order_update_strategy: str = Field(
+        "place_first",
+        description="注文更新戦略: place_first（発注先行） / cancel_first（キャンセル優先） / "
+        "adaptive（レイテンシ・証拠金から都度選択）",
+    )
+    adaptive_escape_budget_ms: float = Field(
+        100.0, description="adaptive: 約定回避時に旧注文を板に残してよい時間 (ms)"
+    )
+    adaptive_margin_ratio: float = Field(
+        1.0, description="adaptive: 発注先行に必要な利用可能額 (注文名目額に対する比率)"
+    )
+
+    # 事前署名キャンセル
+    cancel_presign_enabled: bool = Field(
+        False, description="板上の注文ごとに署名済みキャンセルを保持するか"
+    )
+    cancel_presign_refresh_seconds: float = Field(
+        5.0, description="署名済みキャンセルの再署名間隔 (秒, タイムスタンプ許容範囲より十分短く)"
+    )
+
     # 接続設定
+    cancel_hedge_enabled: bool = Field(
+        False, description="応答が遅いキャンセルを別コネクションで重複送信する"
+    )
+    cancel_hedge_percentile: float = Field(
+        95.0, description="ヘッジ送信までの待機時間とする直近キャンセルレイテンシのパーセンタイル"
+    )
+    cancel_hedge_min_delay_seconds: float = Field(
+        0.005, description="ヘッジ送信までの最短待機 (秒)"
+    )
+    cancel_hedge_max_delay_seconds: float = Field(
+        0.25, description="ヘッジ送信までの最長待機 (秒, サンプル不足時もこの値)"
+    )
+    cancel_hedge_min_samples: int = Field(
+        20, description="パーセンタイルを使い始めるキャンセルレイテンシのサンプル数"
+    )
+    quote_max_concurrency: int = Field(4, description="place_quotesで同時に発注する最大注文数")
+    cancel_bulk_enabled: bool = Field(
+        True, description="複数注文のキャンセルに一括キャンセルAPIを使う (非対応なら個別送信)"
+    )
+    cancel_bulk_retry_seconds: float = Field(
+        300.0, description="一括キャンセルAPIが404/405を返した後、再び試すまでの時間 (秒)"
+    )
+    cancel_max_concurrency: int = Field(
+        8, description="一括キャンセルを個別に送信する場合の最大同時送信数"
+    )
     ws_reconnect_interval: int = Field(5000, description="WebSocket再接続間隔 (ms)")
     jwt_expires_seconds: int = Field(604800, description="JWT有効期限 (秒, デフォルト7日)")
+    http_transport: str = Field(
+        "aiohttp", description="取引用HTTPトランスポート (aiohttp: HTTP/1.1, http2: 多重化)"
+    )
+    http_pool_size: int = Field(8, description="取引用HTTPコネクションプールの最大接続数")
+    http_keepalive_seconds: float = Field(75.0, description="アイドル接続の保持時間 (秒)")
+    http_dns_cache_seconds: int = Field(300, description="DNSキャッシュTTL (秒)")
+    http_warmup_connections: int = Field(
+        2, description="起動時に事前確立する取引用接続数 (0で無効)"
+    )
+    http_keepalive_ping_seconds: float = Field(
+        20.0, description="アイドル時に接続を維持するための送信間隔 (秒, 0で無効)"
+    )
+    http_timeout_seconds: float = Field(
+        10.0, description="REST APIのタイムアウト上限 (秒, レイテンシ計測前はこの値)"
+    )
+    http_timeout_min_seconds: float = Field(0.5, description="REST APIのタイムアウト下限 (秒)")
+    http_timeout_percentile: float = Field(
+        99.0, description="タイムアウトの基準とする成功レイテンシのパーセンタイル"
+    )
+    http_timeout_multiplier: float = Field(4.0, description="基準レイテンシに掛ける倍率")
+    circuit_failure_threshold: int = Field(
+        5, description="サーキットブレーカーが開く連続失敗回数 (タイムアウト・5xx)"
+    )
+    circuit_reset_seconds: float = Field(
+        5.0, description="ブレーカーが開いてから試行リクエストを通すまでの秒数"
+    )
+    http_metrics_log_seconds: float = Field(
+        60.0, description="リクエストレイテンシのサマリーをログ出力する間隔 (秒, 0で無効)"
+    )
+    http_trace_phases: bool = Field(
+        False, description="接続フェーズ (プール待ち・DNS・接続・TTFB) を計測 (aiohttpのみ)"
+    )
+    rate_limit_per_second: float = Field(
+        10.0, description="REST APIの送信レート上限 (リクエスト/秒、取引所の上限より低く)"
+    )
+    rate_limit_burst: float = Field(20.0, description="REST APIのバースト上限 (リクエスト数)")
+    rate_limit_cancel_reserve: float = Field(
+        2.0, description="キャンセル専用に確保する送信枠 (発注・照会は使わない)"
+    )
+    retry_max_attempts: int = Field(4, description="REST APIの最大試行回数 (初回含む)")
+    retry_base_delay_seconds: float = Field(0.05, description="リトライ初回バックオフ上限 (秒)")
+    retry_max_delay_seconds: float = Field(1.0, description="リトライバックオフ上限 (秒)")
+    retry_deadline_seconds: float = Field(
+        3.0, description="リトライを含むリクエスト全体の期限 (秒)"
+    )
+    cache_ttl_price_seconds: float = Field(0.25, description="価格照会のキャッシュTTL (秒)")
+    cache_ttl_orders_seconds: float = Field(1.0, description="未決注文照会のキャッシュTTL (秒)")
+    cache_ttl_position_seconds: float = Field(1.0, description="ポジション照会のキャッシュTTL (秒)")
+    cache_ttl_balance_seconds: float = Field(2.0, description="残高照会のキャッシュTTL (秒)")
+    capture_path: str | None = Field(
+        None, description="HTTP・WebSocket通信の記録先 (.jsonl / .jsonl.gz, 空の場合は記録しない)"
+    )
+    jwt_cache_path: str | None = Field(
+        ".jwt_cache.json", description="JWTキャッシュファイル (空の場合はキャッシュしない)"
+    )
+    jwt_refresh_margin_seconds: int = Field(
+        86400, description="JWT有効期限の何秒前にバックグラウンド更新するか"
+    )
 
     @field_validator("target_distance_bps")
     @classmethod
@@ -40,6 +151,16 @@ class Settings(BaseSettings):
             raise ValueError("target_distance_bps must be between 0 and 10")
         return v
 
+    @field_validator("order_update_strategy")
+    @classmethod
+    def validate_order_update_strategy(cls, v: str) -> str:
+        """order_update_strategyは place_first / cancel_first / adaptive のいずれか."""
+        if v not in ("place_first", "cancel_first", "adaptive"):
+            raise ValueError(
+                "order_update_strategy must be one of: place_first, cancel_first, adaptive"
+            )
+        return v
+
     model_config = {
         "env_file": ".env",
         "env_file_encoding": "utf-8",
@@ -2,20 +2,41 @@
 
 import asyncio
 import logging
-from typing import Any, Literal
-
-from standx_mm_bot.client import StandXHTTPClient
+import time
+from collections.abc import Sequence
+from typing import Any, Literal, cast
+
+from standx_mm_bot.client import APIError, StandXHTTPClient
+from standx_mm_bot.client.decode import decode_order_ack
+from standx_mm_bot.client.hedge import LatencyWindow
+from standx_mm_bot.client.http import PreparedRequest, is_stale_signature
 from standx_mm_bot.config import Settings
-from standx_mm_bot.models import Order, OrderStatus, OrderType, Side
+from standx_mm_bot.core.reposition import (
+    RepositionDecision,
+    RepositionInputs,
+    choose_reposition_strategy,
+)
+from standx_mm_bot.models import CancelResult, Order, OrderStatus, QuoteResult, Side
 
 logger = logging.getLogger(__name__)
 
+# adaptive 戦略が参照する直近レイテンシのパーセンタイルと必要サンプル数
+LATENCY_PERCENTILE = 90.0
+LATENCY_MIN_SAMPLES = 5
+
+# 板に残っている注文のステータス（それ以外のイベントで署名済みキャンセルを破棄する）
+_OPEN_STATUSES = {"", "NEW", OrderStatus.OPEN.value, OrderStatus.PARTIALLY_FILLED.value}
+
 
 class OrderManager:
     """
     注文管理クラス.
 
     注文の発注・キャンセル・再配置を管理し、asyncio.Lockで競合を防止する。
+
+    署名済みキャンセルを使う場合は ``async with OrderManager(...)`` で起動し
+    （定期的な再署名）、``ws.on_order_update(manager.handle_order_event)`` で
+    板から消えた注文の署名済みキャンセルを破棄する。
     """
 
     def __init__(self, http_client: StandXHTTPClient, config: Settings):
@@ -29,6 +50,62 @@ class OrderManager:
         self.client = http_client
         self.config = config
         self._lock = asyncio.Lock()
+        # 板上の注文ごとの署名済みキャンセル (order_id -> PreparedRequest)
+        self._cancel_envelopes: dict[str, PreparedRequest] = {}
+        # adaptive 戦略の入力: 直近の発注・キャンセルの所要時間と利用可能額
+        self._place_latency = LatencyWindow()
+        self._cancel_latency = LatencyWindow()
+        self._available: float | None = None
+        self._balance_checked_at = float("-inf")
+        self._balance_task: asyncio.Task[None] | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+        self.last_reposition_decision: RepositionDecision | None = None
+
+    async def __aenter__(self) -> "OrderManager":
+        """バックグラウンド処理を開始."""
+        self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """バックグラウンド処理を停止."""
+        await self.close()
+
+    def start(self) -> None:
+        """
+        バックグラウンド処理を開始.
+
+        - cancel_presign_enabled 時: 署名済みキャンセルの定期再署名
+        - order_update_strategy が adaptive の時: 最初の再配置に備えた残高の取得
+        """
+        if self.config.cancel_presign_enabled and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self.run_cancel_envelope_refresh())
+        if self.config.order_update_strategy == "adaptive" and self._balance_task is None:
+            self._balance_task = asyncio.create_task(self.refresh_balance())
+
+    async def close(self) -> None:
+        """バックグラウンド処理を停止."""
+        tasks = [task for task in (self._refresh_task, self._balance_task) if task is not None]
+        self._refresh_task = None
+        self._balance_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def handle_order_event(self, data: dict[str, Any]) -> None:
+        """
+        WebSocketの注文イベントで、板から消えた注文の署名済みキャンセルを破棄.
+
+        ``ws.on_order_update(manager.handle_order_event)`` のように登録して使う。
+
+        Args:
+            data: イベントデータ
+        """
+        if str(data.get("status", "")).upper() in _OPEN_STATUSES:
+            return
+        for key in ("cl_ord_id", "order_id", "id"):
+            order_id = data.get(key)
+            if order_id:
+                self.forget_order(str(order_id))
 
     async def place_order(
         self,
@@ -58,21 +135,51 @@ class OrderManager:
                 f"time_in_force={time_in_force}"
             )
 
-            response = await self.client.new_order(
-                symbol=self.config.symbol,
-                side=side.value.lower(),
-                price=price,
-                size=size,
-                order_type="limit",
-                time_in_force=time_in_force,
-                reduce_only=False,
-            )
-
-            order = self._parse_order_response(response, side, price, size)
+            order = await self._place_order_unlocked(side, price, size, time_in_force)
             logger.info(f"Order placed: order_id={order.id}, status={order.status}")
 
             return order
 
+    async def place_quotes(
+        self,
+        quotes: Sequence[tuple[Side, float, float]],
+        time_in_force: str = "alo",
+    ) -> list[QuoteResult]:
+        """
+        複数の注文（BUY/SELL両側など）を並行して発注.
+
+        ロックは全体で1回だけ取得し、発注は quote_max_concurrency 件まで同時に送信する。
+        一部の注文が失敗しても他の注文は発注され、結果は注文ごとに返す。
+
+        Args:
+            quotes: (サイド, 価格, サイズ) のリスト
+            time_in_force: 注文有効期限 (デフォルト: alo = Add Liquidity Only)
+
+        Returns:
+            list[QuoteResult]: quotes と同じ順序の発注結果
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.quote_max_concurrency))
+
+        async def place_one(side: Side, price: float, size: float) -> QuoteResult:
+            async with semaphore:
+                try:
+                    order = await self._place_order_unlocked(side, price, size, time_in_force)
+                except Exception as e:
+                    logger.error(f"Failed to place {side.value} quote at {price:.2f}: {e}")
+                    return QuoteResult(side, price, size, error=e)
+                return QuoteResult(side, price, size, order=order)
+
+        async with self._lock:
+            logger.info(
+                "Placing quotes: "
+                + ", ".join(f"{side.value}@{price:.2f}x{size}" for side, price, size in quotes)
+            )
+            results = await asyncio.gather(*(place_one(*quote) for quote in quotes))
+
+        placed = sum(result.ok for result in results)
+        logger.info(f"Quotes placed: {placed}/{len(results)}")
+        return list(results)
+
     async def cancel_order(self, order_id: str) -> None:
         """
         注文をキャンセル.
@@ -86,20 +193,56 @@ class OrderManager:
         async with self._lock:
             logger.info(f"Cancelling order: order_id={order_id}")
 
-            await self.client.cancel_order(
-                order_id=order_id,
-                symbol=self.config.symbol,
-            )
+            await self._cancel_order_unlocked(order_id)
 
             logger.info(f"Order cancelled: order_id={order_id}")
 
+    async def cancel_orders(self, order_ids: Sequence[str]) -> list[CancelResult]:
+        """
+        複数の注文をまとめてキャンセル.
+
+        ロックは全体で1回だけ取得し、一括キャンセルAPI（非対応なら注文ごとの並行送信）で
+        送信する。一部が失敗しても他の注文はキャンセルされ、結果は注文ごとに返す。
+
+        Args:
+            order_ids: キャンセルする注文IDのリスト
+
+        Returns:
+            list[CancelResult]: order_ids と同じ順序のキャンセル結果
+        """
+        async with self._lock:
+            logger.info(f"Cancelling {len(order_ids)} orders")
+            results = await self._cancel_orders_unlocked(order_ids)
+
+        cancelled = sum(result.ok for result in results)
+        logger.info(f"Orders cancelled: {cancelled}/{len(results)}")
+        return results
+
+    async def cancel_all(self) -> list[CancelResult]:
+        """
+        設定中の取引ペアの未決注文をすべてキャンセル（停止時・未管理注文の整理用）.
+
+        Returns:
+            list[CancelResult]: 未決注文ごとのキャンセル結果
+        """
+        async with self._lock:
+            logger.info(f"Cancelling all open orders: symbol={self.config.symbol}")
+            results = await self.client.cancel_all(self.config.symbol)
+            for result in results:
+                self._cancel_envelopes.pop(result.order_id, None)
+
+        cancelled = sum(result.ok for result in results)
+        logger.info(f"Orders cancelled: {cancelled}/{len(results)}")
+        return results
+
     async def reposition_order(
         self,
         old_order_id: str,
         new_price: float,
         side: Side,
         size: float,
-        strategy: Literal["place_first", "cancel_first"] = "place_first",
+        strategy: Literal["place_first", "cancel_first", "adaptive"] | None = None,
+        escape: bool = False,
     ) -> Order:
         """
         注文を再配置.
@@ -109,9 +252,11 @@ class OrderManager:
             new_price: 新しい価格
             side: 注文サイド
             size: 注文サイズ
-            strategy: 再配置戦略
+            strategy: 再配置戦略（省略時は order_update_strategy）
                 - "place_first": 新規注文発注 → 確認 → 旧注文キャンセル（空白時間最小）
                 - "cancel_first": 旧注文キャンセル → 新規注文発注（資金効率優先）
+                - "adaptive": 直近のレイテンシ・証拠金・escape から上記のどちらかを選択
+            escape: 約定回避のための再配置か（adaptive の判断に使う）
 
         Returns:
             Order: 新規注文情報
@@ -119,7 +264,21 @@ class OrderManager:
         Raises:
             APIError: API呼び出しに失敗
         """
+        if strategy is None:
+            strategy = cast(
+                Literal["place_first", "cancel_first", "adaptive"],
+                self.config.order_update_strategy,
+            )
+
         async with self._lock:
+            if strategy == "adaptive":
+                decision = self.choose_reposition_strategy(new_price, size, escape)
+                logger.info(
+                    f"Reposition strategy: {decision.strategy} ({decision.reason}; "
+                    f"{decision.inputs.format()})"
+                )
+                strategy = decision.strategy
+
             logger.info(
                 f"Repositioning order: old_order_id={old_order_id}, "
                 f"new_price={new_price:.2f}, strategy={strategy}"
@@ -149,11 +308,54 @@ class OrderManager:
 
                 return new_order
 
+    def choose_reposition_strategy(
+        self, new_price: float, size: float, escape: bool
+    ) -> RepositionDecision:
+        """
+        直近の計測値から再配置戦略を選択（adaptive 用）.
+
+        利用可能額はキャッシュ済みの値を使い、古ければバックグラウンドで更新する
+        （判断のために残高照会を待たない。未取得の間、通常の再配置は発注先行）。
+
+        Args:
+            new_price: 新しい価格
+            size: 注文サイズ
+            escape: 約定回避のための再配置か
+
+        Returns:
+            RepositionDecision: 選択した戦略と理由・入力
+        """
+        stale = time.monotonic() - self._balance_checked_at >= self.config.cache_ttl_balance_seconds
+        if stale and (self._balance_task is None or self._balance_task.done()):
+            self._balance_task = asyncio.create_task(self.refresh_balance())
+
+        inputs = RepositionInputs(
+            escape=escape,
+            place_latency=_recent_latency(self._place_latency),
+            cancel_latency=_recent_latency(self._cancel_latency),
+            available=self._available,
+            required_margin=new_price * size * self.config.adaptive_margin_ratio,
+        )
+        decision = choose_reposition_strategy(inputs, self.config.adaptive_escape_budget_ms / 1000)
+        self.last_reposition_decision = decision
+        return decision
+
+    async def refresh_balance(self) -> None:
+        """adaptive 戦略が参照する利用可能額を更新（失敗時は前回の値を維持）."""
+        self._balance_checked_at = time.monotonic()
+        try:
+            balance = await self.client.fetch_balance()
+        except Exception as e:
+            logger.warning(f"Failed to refresh balance for reposition strategy: {e}")
+            return
+        self._available = balance.available
+
     async def _place_order_unlocked(
         self,
         side: Side,
         price: float,
         size: float,
+        time_in_force: str = "alo",
     ) -> Order:
         """
         注文を発注（ロックなし、内部使用専用）.
@@ -162,33 +364,113 @@ class OrderManager:
             side: 注文サイド
             price: 注文価格
             size: 注文サイズ
+            time_in_force: 注文有効期限
 
         Returns:
             Order: 発注された注文情報
         """
+        started = time.perf_counter()
         response = await self.client.new_order(
             symbol=self.config.symbol,
             side=side.value.lower(),
             price=price,
             size=size,
             order_type="limit",
-            time_in_force="alo",
+            time_in_force=time_in_force,
             reduce_only=False,
         )
+        self._place_latency.record(time.perf_counter() - started)
 
-        return self._parse_order_response(response, side, price, size)
+        order = self._parse_order_response(response, side, price, size)
+        self._prepare_cancel_envelope(order)
+        return order
 
     async def _cancel_order_unlocked(self, order_id: str) -> None:
         """
         注文をキャンセル（ロックなし、内部使用専用）.
 
+        署名済みキャンセルが有効期間内にあれば、署名をせずにそのまま送信する。
+
         Args:
             order_id: キャンセルする注文ID
         """
+        started = time.perf_counter()
+        envelope = self._cancel_envelopes.pop(order_id, None)
+        if envelope is not None and envelope.age() < self._cancel_envelope_max_age():
+            try:
+                await self.client.send_prepared(envelope)
+                self._cancel_latency.record(time.perf_counter() - started)
+                return
+            except APIError as e:
+                # 署名の期限切れ・時刻ずれの拒否のみ署名し直して送信（注文なし等はそのまま返す）
+                if not is_stale_signature(e):
+                    raise
+                logger.warning(f"Pre-signed cancel rejected, re-signing: order_id={order_id}: {e}")
+
         await self.client.cancel_order(
             order_id=order_id,
             symbol=self.config.symbol,
         )
+        self._cancel_latency.record(time.perf_counter() - started)
+
+    async def _cancel_orders_unlocked(self, order_ids: Sequence[str]) -> list[CancelResult]:
+        """
+        複数の注文をキャンセル（ロックなし、内部使用専用）.
+
+        Args:
+            order_ids: キャンセルする注文IDのリスト
+
+        Returns:
+            list[CancelResult]: order_ids と同じ順序のキャンセル結果
+        """
+        for order_id in order_ids:
+            self._cancel_envelopes.pop(order_id, None)
+        return await self.client.cancel_orders(order_ids, self.config.symbol)
+
+    def _cancel_envelope_max_age(self) -> float:
+        """署名済みキャンセルを送信に使える最大経過秒数（更新が1回遅れても許容）."""
+        return self.config.cancel_presign_refresh_seconds * 2
+
+    def _prepare_cancel_envelope(self, order: Order) -> None:
+        """
+        板に載った注文の署名済みキャンセルを作成.
+
+        Args:
+            order: 発注された注文
+        """
+        if not self.config.cancel_presign_enabled or order.status != OrderStatus.OPEN:
+            return
+        self._cancel_envelopes[order.id] = self.client.prepare_cancel_order(
+            order.id, self.config.symbol
+        )
+
+    def refresh_cancel_envelopes(self) -> None:
+        """更新間隔を過ぎた署名済みキャンセルを再署名."""
+        refresh_after = self.config.cancel_presign_refresh_seconds
+        for order_id, envelope in list(self._cancel_envelopes.items()):
+            if envelope.age() >= refresh_after:
+                self._cancel_envelopes[order_id] = self.client.prepare_cancel_order(
+                    order_id, self.config.symbol
+                )
+
+    def forget_order(self, order_id: str) -> None:
+        """
+        約定・外部キャンセル等で板から消えた注文の署名済みキャンセルを破棄.
+
+        Args:
+            order_id: 注文ID
+        """
+        self._cancel_envelopes.pop(order_id, None)
+
+    async def run_cancel_envelope_refresh(self) -> None:
+        """署名済みキャンセルを定期的に再署名し続ける（タスクとして起動する）."""
+        interval = self.config.cancel_presign_refresh_seconds / 2
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.refresh_cancel_envelopes()
+            except Exception as e:
+                logger.error(f"Failed to refresh cancel envelopes: {e}")
 
     def _parse_order_response(
         self,
@@ -209,27 +491,11 @@ class OrderManager:
         Returns:
             Order: パースされた注文情報
         """
-        # StandX APIのレスポンス形式:
-        # {"code": 0, "message": "success", "request_id": "xxx"}
-        # または
-        # {"order_id": "xxx", "status": "OPEN", ...}
+        return decode_order_ack(response, self.config.symbol, side, price, size)
 
-        # order_id を取得（レスポンス形式によって異なる可能性がある）
-        order_id = response.get("order_id") or response.get("request_id", "unknown")
 
-        # status を取得（デフォルトはOPEN）
-        status_str = response.get("status", "OPEN")
-        try:
-            status = OrderStatus(status_str)
-        except ValueError:
-            status = OrderStatus.OPEN
-
-        return Order(
-            id=order_id,
-            symbol=self.config.symbol,
-            side=side,
-            price=price,
-            size=size,
-            order_type=OrderType.LIMIT,
-            status=status,
-        )
+def _recent_latency(window: LatencyWindow) -> float | None:
+    """直近レイテンシのパーセンタイル（サンプル不足時はNone）."""
+    if len(window) < LATENCY_MIN_SAMPLES:
+        return None
+    return window.percentile(LATENCY_PERCENTILE)
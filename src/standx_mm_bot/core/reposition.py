@@ -0,0 +1,103 @@
+"""再配置戦略の選択モジュール.
+
+このモジュールは注文の再配置を発注先行 (place_first) とキャンセル優先
+(cancel_first) のどちらで行うかを、直近のレイテンシと証拠金の余裕から決定します。
+
+- place_first: 空白時間ゼロだが、新規注文の分だけ証拠金が余分に必要。
+  旧注文は新規注文の確認後にキャンセルされるため、板に残る時間が長い
+- cancel_first: 必要証拠金は片側1本分だが、キャンセル〜発注の間は板から消える
+
+通常の再配置では証拠金不足が分かっている場合を除き place_first（空白時間ゼロ）。
+残高が未取得でも発注先行にする: 証拠金不足で拒否されても旧注文は板に残る。
+約定回避では旧注文が板に残る時間 (発注レイテンシ + キャンセルの片道) が
+予算内の場合のみ place_first を選ぶ。
+"""
+
+from dataclasses import dataclass
+from typing import Literal
+
+RepositionStrategy = Literal["place_first", "cancel_first"]
+
+
+@dataclass(frozen=True)
+class RepositionInputs:
+    """戦略選択の入力."""
+
+    escape: bool  # 約定回避のための再配置か
+    place_latency: float | None  # 直近の発注レイテンシ（秒、サンプル不足時None）
+    cancel_latency: float | None  # 直近のキャンセルレイテンシ（秒、サンプル不足時None）
+    available: float | None  # 利用可能額（未取得時None）
+    required_margin: float  # 新規注文に必要な証拠金
+
+    def format(self) -> str:
+        """ログ出力用の文字列."""
+
+        def ms(value: float | None) -> str:
+            return "n/a" if value is None else f"{value * 1000:.1f}ms"
+
+        available = "n/a" if self.available is None else f"{self.available:.2f}"
+        return (
+            f"escape={self.escape}, place={ms(self.place_latency)}, "
+            f"cancel={ms(self.cancel_latency)}, available={available}, "
+            f"required={self.required_margin:.2f}"
+        )
+
+
+@dataclass(frozen=True)
+class RepositionDecision:
+    """戦略選択の結果."""
+
+    strategy: RepositionStrategy
+    reason: str
+    inputs: RepositionInputs
+
+
+def choose_reposition_strategy(
+    inputs: RepositionInputs,
+    escape_budget: float,
+) -> RepositionDecision:
+    """再配置戦略を選択.
+
+    Args:
+        inputs: 直近のレイテンシ・証拠金・再配置の種類
+        escape_budget: 約定回避時に旧注文を板に残してよい時間 (秒)
+
+    Returns:
+        RepositionDecision: 選択した戦略と理由
+
+    Example:
+        >>> inputs = RepositionInputs(False, 0.03, 0.02, 100.0, 3.5)
+        >>> choose_reposition_strategy(inputs, 0.1).strategy
+        'place_first'
+    """
+
+    def decide(strategy: RepositionStrategy, reason: str) -> RepositionDecision:
+        return RepositionDecision(strategy, reason, inputs)
+
+    # 証拠金が足りなければ新規注文が拒否されるため、旧注文を先に外す
+    if inputs.available is not None and inputs.available < inputs.required_margin:
+        return decide("cancel_first", "insufficient margin headroom")
+
+    if not inputs.escape:
+        if inputs.available is None:
+            # 拒否されても旧注文が残るだけなので、残高の取得を待たずに発注先行
+            return decide("place_first", "routine reposition with balance unknown")
+        return decide("place_first", "routine reposition with margin headroom")
+
+    # 約定回避で発注が拒否されると約定しそうな旧注文が残るため、不明なら先に外す
+    if inputs.available is None:
+        return decide("cancel_first", "escape with balance unknown")
+
+    if inputs.place_latency is None or inputs.cancel_latency is None:
+        return decide("cancel_first", "escape without latency samples")
+    # place_first で旧注文が板から消えるまでの時間: 発注の往復 + キャンセルの片道
+    exposure = inputs.place_latency + inputs.cancel_latency / 2
+    if exposure > escape_budget:
+        return decide(
+            "cancel_first",
+            f"escape exposure {exposure * 1000:.1f}ms > budget {escape_budget * 1000:.1f}ms",
+        )
+    return decide(
+        "place_first",
+        f"escape exposure {exposure * 1000:.1f}ms <= budget {escape_budget * 1000:.1f}ms",
+    )
@@ -0,0 +1,12 @@
+"""オフライン負荷試験用のモック取引所."""
+
+from standx_mm_bot.mock_exchange.engine import MatchingEngine, OrderRejected, PriceProcess
+from standx_mm_bot.mock_exchange.server import MockExchange, MockExchangeConfig
+
+__all__ = [
+    "MockExchange",
+    "MockExchangeConfig",
+    "MatchingEngine",
+    "OrderRejected",
+    "PriceProcess",
+]
@@ -0,0 +1,65 @@
+"""モック取引所の起動.
+
+Usage:
+    python -m standx_mm_bot.mock_exchange [--port 8080] [--ticks-per-second 1000] ...
+
+表示される STANDX_*_URL を .env に設定すると、ボットがモック取引所に接続する。
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+
+from standx_mm_bot.mock_exchange.server import MockExchange, MockExchangeConfig
+
+
+def parse_args() -> argparse.Namespace:
+    """コマンドライン引数を解析."""
+    parser = argparse.ArgumentParser(description="StandX mock exchange for offline load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--symbol", default="ETH-USD")
+    parser.add_argument("--price", type=float, default=3000.0, help="initial mark price")
+    parser.add_argument("--ticks-per-second", type=float, default=10.0)
+    parser.add_argument("--volatility-bps", type=float, default=1.0, help="per tick")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/s (0: off)")
+    return parser.parse_args()
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """モック取引所を起動して停止されるまで待つ."""
+    config = MockExchangeConfig(
+        mark_prices={args.symbol: args.price},
+        ticks_per_second=args.ticks_per_second,
+        volatility_bps=args.volatility_bps,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_per_second=args.rate_limit,
+    )
+    exchange = MockExchange(config)
+    await exchange.start(args.host, args.port)
+    print(f"STANDX_API_URL={exchange.base_url}")
+    print(f"STANDX_AUTH_URL={exchange.base_url}")
+    print(f"STANDX_WS_URL={exchange.ws_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await exchange.stop()
+
+
+def main() -> None:
+    """エントリーポイント."""
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""モック取引所のマッチングエンジンとマーク価格プロセス.
+
+板の相手方は持たず、マーク価格を市場とみなす単純なモデル:
+
+- 指値は価格がマーク価格を跨いだ時点で全量約定する（買い: mark <= price、売り: mark >= price）
+- ALO (Add Liquidity Only) 注文は発注時点でマーク価格を跨いでいれば拒否する
+- IOC・成行はその場で約定させるか取り消す
+
+状態変化は (チャンネル, データ) のイベントとして返し、サーバーがWebSocketに配信する。
+"""
+
+import itertools
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+# WebSocketに配信するイベント (チャンネル, データ)
+Event = tuple[str, dict[str, Any]]
+
+# 終了済み（キャンセル不可）の注文ステータス
+_FINAL_STATUSES = ("FILLED", "CANCELED")
+
+
+class OrderRejected(Exception):
+    """発注・キャンセルの拒否（HTTP 400 として返す）."""
+
+
+class PriceProcess:
+    """
+    マーク価格の幾何ランダムウォーク.
+
+    ``seed`` を指定すると価格系列が再現可能になる。
+    """
+
+    def __init__(
+        self,
+        initial: float,
+        volatility_bps: float = 1.0,
+        drift_bps: float = 0.0,
+        seed: int | None = None,
+    ):
+        """
+        価格プロセスを初期化.
+
+        Args:
+            initial: 初期価格
+            volatility_bps: 1ティックあたりの変動の標準偏差 (bps)
+            drift_bps: 1ティックあたりの平均変動 (bps)
+            seed: 乱数シード
+        """
+        self.price = initial
+        self.volatility = volatility_bps / 10_000
+        self.drift = drift_bps / 10_000
+        self._rng = random.Random(seed)
+
+    def next(self) -> float:
+        """
+        1ティック進めた価格.
+
+        Returns:
+            float: 新しいマーク価格
+        """
+        self.price *= math.exp(self.drift + self.volatility * self._rng.gauss(0.0, 1.0))
+        return self.price
+
+
+@dataclass
+class MockOrder:
+    """モック取引所の注文."""
+
+    order_id: str
+    cl_ord_id: str | None
+    symbol: str
+    side: str  # buy / sell
+    order_type: str  # limit / market
+    price: float
+    qty: float
+    time_in_force: str
+    reduce_only: bool
+    status: str = "OPEN"
+    fill_qty: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """API形式（数値は文字列）に変換."""
+        return {
+            "order_id": self.order_id,
+            "cl_ord_id": self.cl_ord_id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "order_type": self.order_type,
+            "price": str(self.price),
+            "qty": str(self.qty),
+            "fill_qty": str(self.fill_qty),
+            "status": self.status,
+            "time_in_force": self.time_in_force,
+            "reduce_only": self.reduce_only,
+        }
+
+
+@dataclass
+class MockPosition:
+    """シンボルごとのポジション（数量は符号付き）."""
+
+    qty: float = 0.0
+    entry_price: float = 0.0
+
+
+class MatchingEngine:
+    """注文・ポジション・残高を管理するマッチングエンジン."""
+
+    def __init__(self, mark_prices: dict[str, float], initial_balance: float = 10_000.0):
+        """
+        エンジンを初期化.
+
+        Args:
+            mark_prices: シンボル -> 初期マーク価格
+            initial_balance: 初期残高
+        """
+        self.mark_prices = dict(mark_prices)
+        self.balance = initial_balance
+        self.orders: dict[str, MockOrder] = {}
+        self.positions: dict[str, MockPosition] = {}
+        self._by_client_id: dict[str, MockOrder] = {}
+        self._order_seq = itertools.count(1)
+        self._trade_seq = itertools.count(1)
+
+    def place(self, body: dict[str, Any]) -> tuple[MockOrder, list[Event]]:
+        """
+        new_order を処理.
+
+        Args:
+            body: リクエストボディ
+
+        Returns:
+            tuple: (注文, 発生したイベント)
+
+        Raises:
+            OrderRejected: 不正な注文、重複したクライアント注文ID、ALO注文が即時約定する
+        """
+        symbol = str(body.get("symbol", ""))
+        if symbol not in self.mark_prices:
+            raise OrderRejected(f"unknown symbol: {symbol}")
+        side = str(body.get("side", "")).lower()
+        if side not in ("buy", "sell"):
+            raise OrderRejected(f"invalid side: {body.get('side')}")
+        order_type = str(body.get("order_type", "limit")).lower()
+        try:
+            qty = float(body.get("qty", 0))
+            price = float(body.get("price") or 0)
+        except (TypeError, ValueError) as e:
+            raise OrderRejected(f"invalid qty or price: {e}") from e
+        if qty <= 0 or (order_type == "limit" and price <= 0):
+            raise OrderRejected("qty and price must be positive")
+
+        cl_ord_id = body.get("cl_ord_id")
+        if cl_ord_id is not None and cl_ord_id in self._by_client_id:
+            raise OrderRejected(f"duplicate cl_ord_id: {cl_ord_id}")
+
+        mark = self.mark_prices[symbol]
+        time_in_force = str(body.get("time_in_force", "gtc")).lower()
+        crosses = order_type == "market" or _crosses(side, price, mark)
+        if time_in_force == "alo" and crosses:
+            raise OrderRejected("post-only order would take liquidity")
+
+        order = MockOrder(
+            order_id=str(next(self._order_seq)),
+            cl_ord_id=cl_ord_id,
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            price=price if order_type == "limit" else mark,
+            qty=qty,
+            time_in_force=time_in_force,
+            reduce_only=bool(body.get("reduce_only", False)),
+        )
+        self.orders[order.order_id] = order
+        if cl_ord_id is not None:
+            self._by_client_id[cl_ord_id] = order
+
+        events: list[Event] = [("order", order.to_dict())]
+        if crosses:
+            events.extend(self._fill(order))
+        elif time_in_force == "ioc":
+            order.status = "CANCELED"
+            events.append(("order", order.to_dict()))
+        return order, events
+
+    def cancel(self, order_id: Any = None, cl_ord_id: Any = None) -> tuple[MockOrder, list[Event]]:
+        """
+        cancel_order を処理.
+
+        Args:
+            order_id: 注文ID
+            cl_ord_id: クライアント注文ID（order_id 未指定時）
+
+        Returns:
+            tuple: (注文, 発生したイベント)
+
+        Raises:
+            OrderRejected: 注文が存在しない、または終了済み
+        """
+        if order_id is not None:
+            order = self.orders.get(str(order_id))
+        else:
+            order = self._by_client_id.get(str(cl_ord_id))
+        if order is None:
+            raise OrderRejected(f"order not found: {order_id or cl_ord_id}")
+        if order.status in _FINAL_STATUSES:
+            raise OrderRejected(f"order already {order.status.lower()}: {order.order_id}")
+        order.status = "CANCELED"
+        return order, [("order", order.to_dict())]
+
+    def update_mark(self, symbol: str, price: float) -> list[Event]:
+        """
+        マーク価格を更新し、跨いだ指値を約定させる.
+
+        Args:
+            symbol: 取引ペア
+            price: 新しいマーク価格
+
+        Returns:
+            list[Event]: 約定で発生したイベント
+        """
+        self.mark_prices[symbol] = price
+        events: list[Event] = []
+        for order in list(self.open_orders(symbol)):
+            if _crosses(order.side, order.price, price):
+                events.extend(self._fill(order))
+        return events
+
+    def open_orders(self, symbol: str | None = None) -> list[MockOrder]:
+        """
+        未決注文.
+
+        Args:
+            symbol: 取引ペア（省略時は全シンボル）
+
+        Returns:
+            list[MockOrder]: 未決注文
+        """
+        return [
+            order
+            for order in self.orders.values()
+            if order.status == "OPEN" and (symbol is None or order.symbol == symbol)
+        ]
+
+    def position_dicts(self, symbol: str | None = None) -> list[dict[str, Any]]:
+        """
+        query_positions 形式のポジション（数量0は除外）.
+
+        Args:
+            symbol: 取引ペア（省略時は全シンボル）
+
+        Returns:
+            list[dict]: ポジション
+        """
+        return [
+            {
+                "symbol": sym,
+                "qty": str(position.qty),
+                "entry_price": str(position.entry_price),
+                "upnl": str(self._upnl(sym, position)),
+            }
+            for sym, position in self.positions.items()
+            if position.qty != 0 and (symbol is None or sym == symbol)
+        ]
+
+    def balance_dict(self) -> dict[str, Any]:
+        """query_balance 形式の残高."""
+        upnl = sum(self._upnl(sym, position) for sym, position in self.positions.items())
+        locked = sum(order.price * order.qty for order in self.open_orders())
+        equity = self.balance + upnl
+        return {
+            "balance": str(self.balance),
+            "equity": str(equity),
+            "cross_available": str(equity - locked),
+            "locked": str(locked),
+            "upnl": str(upnl),
+        }
+
+    def _fill(self, order: MockOrder) -> list[Event]:
+        """注文を全量約定させてポジション・残高を更新."""
+        order.fill_qty = order.qty
+        order.status = "FILLED"
+        signed = order.qty if order.side == "buy" else -order.qty
+        position = self.positions.setdefault(order.symbol, MockPosition())
+
+        if position.qty == 0 or (position.qty > 0) == (signed > 0):
+            # 建玉の追加: 平均建値を更新
+            total = position.qty + signed
+            position.entry_price = (
+                position.entry_price * abs(position.qty) + order.price * abs(signed)
+            ) / abs(total)
+            position.qty = total
+        else:
+            # 建玉の縮小・反転: 決済分の損益を残高に反映
+            closed = min(abs(position.qty), abs(signed))
+            direction = 1.0 if position.qty > 0 else -1.0
+            self.balance += (order.price - position.entry_price) * closed * direction
+            position.qty += signed
+            if position.qty == 0:
+                position.entry_price = 0.0
+            elif (position.qty > 0) != (direction > 0):
+                position.entry_price = order.price
+
+        trade = {
+            "trade_id": str(next(self._trade_seq)),
+            "order_id": order.order_id,
+            "cl_ord_id": order.cl_ord_id,
+            "symbol": order.symbol,
+            "side": order.side,
+            "price": str(order.price),
+            "qty": str(order.qty),
+            "fee": "0",
+            "time": int(time.time() * 1000),
+        }
+        return [("order", order.to_dict()), ("trade", trade)]
+
+    def _upnl(self, symbol: str, position: MockPosition) -> float:
+        """ポジションの未実現損益."""
+        return (self.mark_prices[symbol] - position.entry_price) * position.qty
+
+
+def _crosses(side: str, price: float, mark: float) -> bool:
+    """指値がマーク価格を跨いでいるか（即時約定する価格か）."""
+    return price >= mark if side == "buy" else price <= mark
@@ -0,0 +1,395 @@
+"""モック取引所サーバー (aiohttp.web).
+
+StandX と同じREST パス・WebSocketストリームを提供し、実APIなしで
+``StandXHTTPClient`` / ``StandXWebSocketClient`` をエンドツーエンドで動かす。
+
+- REST: /api/new_order, /api/cancel_order, /api/cancel_orders, /api/query_*、
+  認証 /v1/offchain/*
+- WebSocket: /ws-stream/v1（price / order / trade チャンネル）
+- 遅延注入（固定 + ジッター）、エラー注入（5xx）、レート制限 (429)
+
+署名ヘッダーは検証しない（Authorization の有無のみ確認する）。
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+from standx_mm_bot.mock_exchange.engine import (
+    Event,
+    MatchingEngine,
+    OrderRejected,
+    PriceProcess,
+)
+
+logger = logging.getLogger(__name__)
+
+WS_PATH = "/ws-stream/v1"
+
+# 認証なしで呼べるエンドポイント
+_PUBLIC_PATHS = ("/api/query_symbol_price",)
+
+# JWTの署名鍵（モック専用、クライアントは署名を検証しない）
+_JWT_SECRET = "standx-mock-exchange-not-a-real-secret"
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+@dataclass(frozen=True)
+class MockExchangeConfig:
+    """モック取引所の設定."""
+
+    mark_prices: dict[str, float] = field(default_factory=lambda: {"ETH-USD": 3000.0})
+    initial_balance: float = 10_000.0
+    ticks_per_second: float = 10.0  # マーク価格の更新頻度 (0で自動更新なし)
+    volatility_bps: float = 1.0  # 1ティックあたりの変動 (bps)
+    drift_bps: float = 0.0
+    seed: int | None = None  # 価格・遅延・エラー注入の乱数シード
+    latency_ms: float = 0.0  # REST応答の固定遅延
+    latency_jitter_ms: float = 0.0  # 固定遅延に加える一様乱数の上限
+    error_rate: float = 0.0  # 5xxを返す確率（注文処理前に返す）
+    rate_limit_per_second: float = 0.0  # 0でレート制限なし
+    rate_limit_burst: float = 20.0
+    jwt_expires_seconds: int = 3600
+    bulk_cancel: bool = True  # False で /api/cancel_orders を提供しない (404)
+
+
+class MockExchange:
+    """
+    モック取引所.
+
+    ``async with MockExchange(config) as exchange:`` で起動し、``base_url`` /
+    ``ws_url`` にクライアントを向ける。``set_mark_price()`` で価格を直接動かせる。
+    """
+
+    def __init__(self, config: MockExchangeConfig | None = None):
+        """
+        モック取引所を初期化.
+
+        Args:
+            config: 設定（省略時はデフォルト）
+        """
+        self.config = config or MockExchangeConfig()
+        self.engine = MatchingEngine(self.config.mark_prices, self.config.initial_balance)
+        self._rng = random.Random(self.config.seed)
+        self._prices = {
+            symbol: PriceProcess(
+                price,
+                volatility_bps=self.config.volatility_bps,
+                drift_bps=self.config.drift_bps,
+                seed=self._rng.randrange(2**32),
+            )
+            for symbol, price in self.config.mark_prices.items()
+        }
+        # WebSocket接続 -> 購読チャンネル（price は "price:<symbol>"）
+        self._subscribers: dict[web.WebSocketResponse, set[str]] = {}
+        self._tokens = self.config.rate_limit_burst
+        self._refilled_at = time.monotonic()
+        self._runner: web.AppRunner | None = None
+        self._ticker: asyncio.Task[None] | None = None
+        self.host = "127.0.0.1"
+        self.port = 0
+        self.requests = 0
+        self.ticks = 0
+        self.injected_errors = 0
+        self.rate_limited = 0
+
+    @property
+    def base_url(self) -> str:
+        """REST APIのベースURL（STANDX_API_URL / STANDX_AUTH_URL に設定）."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self) -> str:
+        """WebSocketのURL（STANDX_WS_URL に設定）."""
+        return f"ws://{self.host}:{self.port}{WS_PATH}"
+
+    async def __aenter__(self) -> "MockExchange":
+        """非同期コンテキストマネージャー (enter)."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """非同期コンテキストマネージャー (exit)."""
+        await self.stop()
+
+    def create_app(self) -> web.Application:
+        """
+        aiohttpアプリケーションを作成.
+
+        Returns:
+            web.Application: ルーティング済みアプリケーション
+        """
+        app = web.Application(middlewares=[self._inject_faults])
+        app.router.add_post("/api/new_order", self._new_order)
+        app.router.add_post("/api/cancel_order", self._cancel_order)
+        if self.config.bulk_cancel:
+            app.router.add_post("/api/cancel_orders", self._cancel_orders)
+        app.router.add_get("/api/query_open_orders", self._query_open_orders)
+        app.router.add_get("/api/query_positions", self._query_positions)
+        app.router.add_get("/api/query_balance", self._query_balance)
+        app.router.add_get("/api/query_symbol_price", self._query_symbol_price)
+        app.router.add_post("/v1/offchain/prepare-signin", self._prepare_signin)
+        app.router.add_post("/v1/offchain/login", self._login)
+        app.router.add_get(WS_PATH, self._websocket)
+        # warm_up / keep-alive 用
+        app.router.add_route("HEAD", "/", self._ping)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """
+        サーバーとマーク価格の更新を開始.
+
+        Args:
+            host: 待ち受けアドレス
+            port: 待ち受けポート（0で空きポート）
+        """
+        self._runner = web.AppRunner(self.create_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.host = host
+        self.port = self._runner.addresses[0][1]
+        if self.config.ticks_per_second > 0:
+            self._ticker = asyncio.create_task(self._tick_loop())
+        logger.info(f"Mock exchange listening on {self.base_url}")
+
+    async def stop(self) -> None:
+        """サーバーを停止."""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._ticker
+            self._ticker = None
+        for ws in list(self._subscribers):
+            await ws.close()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def set_mark_price(self, symbol: str, price: float) -> None:
+        """
+        マーク価格を設定して配信（跨いだ指値は約定する）.
+
+        Args:
+            symbol: 取引ペア
+            price: マーク価格
+        """
+        self._prices[symbol].price = price
+        await self._publish_price(symbol, price)
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        統計のスナップショット.
+
+        Returns:
+            dict: requests, ticks, injected_errors, rate_limited, open_orders
+        """
+        return {
+            "requests": self.requests,
+            "ticks": self.ticks,
+            "injected_errors": self.injected_errors,
+            "rate_limited": self.rate_limited,
+            "open_orders": len(self.engine.open_orders()),
+        }
+
+    async def _tick_loop(self) -> None:
+        """ticks_per_second でマーク価格を更新し続ける（遅れた分はまとめて処理）."""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.config.ticks_per_second
+        next_at = loop.time()
+        while True:
+            now = loop.time()
+            # 1秒以上遅れた場合は追いつこうとせずに捨てる
+            if now - next_at > 1.0:
+                next_at = now
+            while next_at <= now:
+                for symbol, process in self._prices.items():
+                    await self._publish_price(symbol, process.next())
+                next_at += interval
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+    async def _publish_price(self, symbol: str, price: float) -> None:
+        """価格を配信し、約定イベントを配信."""
+        self.ticks += 1
+        events = self.engine.update_mark(symbol, price)
+        data = {
+            "symbol": symbol,
+            "mark_price": f"{price:.2f}",
+            "index_price": f"{price:.2f}",
+            "time": int(time.time() * 1000),
+        }
+        await self._broadcast(
+            f"price:{symbol}", {"channel": "price", "symbol": symbol, "data": data}
+        )
+        await self._publish(events)
+
+    async def _publish(self, events: list[Event]) -> None:
+        """エンジンのイベントを購読者に配信."""
+        for channel, data in events:
+            await self._broadcast(channel, {"channel": channel, "data": data})
+
+    async def _broadcast(self, channel: str, message: dict[str, Any]) -> None:
+        """チャンネルの購読者にメッセージを送信."""
+        text: str | None = None
+        for ws, channels in list(self._subscribers.items()):
+            if channel not in channels or ws.closed:
+                continue
+            if text is None:
+                text = json.dumps(message, separators=(",", ":"))
+            try:
+                await ws.send_str(text)
+            except ConnectionError:
+                self._subscribers.pop(ws, None)
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        """REST APIに遅延・エラー・レート制限を注入し、認証ヘッダーを確認."""
+        if not request.path.startswith("/api/"):
+            return await handler(request)
+
+        self.requests += 1
+        config = self.config
+        delay = config.latency_ms + self._rng.uniform(0.0, config.latency_jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if config.rate_limit_per_second > 0 and not self._take_token():
+            self.rate_limited += 1
+            retry_after = (1.0 - self._tokens) / config.rate_limit_per_second
+            return web.json_response(
+                {"code": 429, "message": "rate limited"},
+                status=429,
+                headers={"Retry-After": f"{retry_after:.3f}"},
+            )
+        if config.error_rate > 0 and self._rng.random() < config.error_rate:
+            self.injected_errors += 1
+            return web.json_response({"code": 500, "message": "injected error"}, status=500)
+        if request.path not in _PUBLIC_PATHS and not request.headers.get(
+            "authorization", ""
+        ).startswith("Bearer "):
+            return web.json_response({"code": 401, "message": "unauthorized"}, status=401)
+        return await handler(request)
+
+    def _take_token(self) -> bool:
+        """レート制限のトークンを1つ消費（なければFalse）."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.config.rate_limit_burst,
+            self._tokens + (now - self._refilled_at) * self.config.rate_limit_per_second,
+        )
+        self._refilled_at = now
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    async def _new_order(self, request: web.Request) -> web.Response:
+        try:
+            _, events = self.engine.place(await request.json())
+        except OrderRejected as e:
+            return _rejected(e)
+        await self._publish(events)
+        return web.json_response({"code": 0, "message": "success", "request_id": str(uuid.uuid4())})
+
+    async def _cancel_order(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        try:
+            _, events = self.engine.cancel(body.get("order_id"), body.get("cl_ord_id"))
+        except OrderRejected as e:
+            return _rejected(e)
+        await self._publish(events)
+        return web.json_response({"code": 0, "message": "success", "request_id": str(uuid.uuid4())})
+
+    async def _cancel_orders(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        events: list[Event] = []
+        # 存在しない・終了済みの注文は無視する
+        for order_id in body.get("order_id_list") or []:
+            with contextlib.suppress(OrderRejected):
+                events.extend(self.engine.cancel(order_id)[1])
+        for cl_ord_id in body.get("cl_ord_id_list") or []:
+            with contextlib.suppress(OrderRejected):
+                events.extend(self.engine.cancel(cl_ord_id=cl_ord_id)[1])
+        await self._publish(events)
+        return web.json_response({"code": 0, "message": "success", "request_id": str(uuid.uuid4())})
+
+    async def _query_open_orders(self, request: web.Request) -> web.Response:
+        orders = self.engine.open_orders(request.query.get("symbol"))
+        return web.json_response({"result": [order.to_dict() for order in orders]})
+
+    async def _query_positions(self, request: web.Request) -> web.Response:
+        return web.json_response(self.engine.position_dicts(request.query.get("symbol")))
+
+    async def _query_balance(self, _request: web.Request) -> web.Response:
+        return web.json_response(self.engine.balance_dict())
+
+    async def _query_symbol_price(self, request: web.Request) -> web.Response:
+        symbol = request.query.get("symbol", "")
+        price = self.engine.mark_prices.get(symbol)
+        if price is None:
+            return _rejected(OrderRejected(f"unknown symbol: {symbol}"))
+        return web.json_response(
+            {
+                "symbol": symbol,
+                "mark_price": f"{price:.2f}",
+                "index_price": f"{price:.2f}",
+                "time": int(time.time() * 1000),
+            }
+        )
+
+    async def _prepare_signin(self, request: web.Request) -> web.Response:
+        import jwt as pyjwt
+
+        body = await request.json()
+        message = f"Sign in to StandX mock exchange: {body.get('requestId', '')}"
+        signed_data = pyjwt.encode(
+            {"message": message, "requestId": body.get("requestId")}, _JWT_SECRET
+        )
+        return web.json_response({"success": True, "signedData": signed_data})
+
+    async def _login(self, _request: web.Request) -> web.Response:
+        import jwt as pyjwt
+
+        expires_at = int(time.time()) + self.config.jwt_expires_seconds
+        token = pyjwt.encode({"sub": "mock", "exp": expires_at}, _JWT_SECRET)
+        return web.json_response({"token": token})
+
+    async def _ping(self, _request: web.Request) -> web.Response:
+        return web.Response()
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        channels: set[str] = set()
+        self._subscribers[ws] = channels
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    subscribe = json.loads(msg.data).get("subscribe", {})
+                except (ValueError, AttributeError):
+                    continue
+                channel = subscribe.get("channel")
+                if channel == "price":
+                    channels.add(f"price:{subscribe.get('symbol')}")
+                elif channel in ("order", "trade"):
+                    channels.add(channel)
+        finally:
+            self._subscribers.pop(ws, None)
+        return ws
+
+
+def _rejected(error: OrderRejected) -> web.Response:
+    """拒否をHTTP 400として返す."""
+    return web.json_response({"code": 400, "message": str(error)}, status=400)
@@ -49,6 +49,36 @@ class Order:
     status: OrderStatus
     filled_size: float = 0.0
     timestamp: datetime | None = None
+    client_order_id: str | None = None
+
+
+@dataclass
+class QuoteResult:
+    """片側クォートの発注結果."""
+
+    side: Side
+    price: float
+    size: float
+    order: Order | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """発注に成功したか."""
+        return self.order is not None
+
+
+@dataclass
+class CancelResult:
+    """1注文のキャンセル結果."""
+
+    order_id: str
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """キャンセルに成功したか（キャンセル済み・注文なしを含む）."""
+        return self.error is None
 
 
 @dataclass
@@ -62,6 +92,17 @@ class Position:
     unrealized_pnl: float = 0.0
 
 
+@dataclass
+class Balance:
+    """残高情報."""
+
+    balance: float  # 総資産
+    equity: float  # アカウント資産額
+    available: float  # 利用可能額 (クロス)
+    locked: float = 0.0  # オーダーロック額
+    upnl: float = 0.0  # 合計未実現損益
+
+
 @dataclass
 class PriceUpdate:
     """価格更新情報."""
@@ -1,11 +1,15 @@
 """auth.pyのテスト."""
 
 import base64
+import os
+import subprocess
+import sys
 
 import pytest
 from nacl.signing import SigningKey
 
 from standx_mm_bot.auth import (
+    RequestSigner,
     generate_auth_headers,
     generate_request_signature,
     sign_message,
@@ -235,3 +239,69 @@ def test_sign_message_evm_different_messages() -> None:
 
     # 異なるメッセージなら異なる署名
     assert sig1 != sig2
+
+
+def test_request_signer_headers() -> None:
+    """RequestSignerが署名ヘッダーを生成することを確認."""
+    signer = RequestSigner("0x" + "a" * 64)
+
+    headers = signer.sign(b'{"symbol":"ETH-USD"}')
+
+    assert headers["x-request-sign-version"] == "v1"
+    assert headers["x-request-timestamp"].isdigit()
+    assert len(base64.b64decode(headers["x-request-signature"])) == 64
+
+
+def test_request_signer_verification() -> None:
+    """RequestSignerの署名が署名メッセージに対して検証可能であることを確認."""
+    private_key = "0x" + "a" * 64
+    payload = b'{"symbol":"ETH-USD","side":"buy"}'
+    signer = RequestSigner(private_key)
+
+    headers = signer.sign(payload)
+
+    message = (
+        f"{headers['x-request-sign-version']},{headers['x-request-id']},"
+        f"{headers['x-request-timestamp']},"
+    ).encode() + payload
+    verify_key = SigningKey(bytes.fromhex(private_key.removeprefix("0x"))).verify_key
+    verify_key.verify(message, base64.b64decode(headers["x-request-signature"]))
+
+
+def test_request_signer_matches_sign_message() -> None:
+    """RequestSignerとsign_messageが同じ鍵で同じ署名を生成することを確認."""
+    private_key = "a" * 64
+    signer = RequestSigner(private_key)
+
+    headers = signer.sign()
+
+    message = f"v1,{headers['x-request-id']},{headers['x-request-timestamp']},"
+    assert headers["x-request-signature"] == sign_message(private_key, message)
+
+
+def test_request_signer_unique_request_ids() -> None:
+    """リクエスト毎に異なるrequest_idが生成されることを確認."""
+    signer = RequestSigner("0x" + "a" * 64)
+
+    assert signer.sign()["x-request-id"] != signer.sign()["x-request-id"]
+
+
+def test_request_signer_invalid_private_key() -> None:
+    """不正な秘密鍵で初期化時にエラーが発生することを確認."""
+    with pytest.raises(ValueError):
+        RequestSigner("0x1234")
+
+
+def test_import_does_not_load_login_backends() -> None:
+    """auth/HTTPクライアントのimport時にeth_account・PyJWTが読み込まれないことを確認."""
+    code = (
+        "import sys, standx_mm_bot.auth, standx_mm_bot.client.http; "
+        "print('eth_account' in sys.modules, 'jwt' in sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+    )
+
+    assert result.stdout.split() == ["False", "False"]
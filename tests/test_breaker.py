@@ -0,0 +1,94 @@
+"""breaker.pyのテスト."""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from standx_mm_bot.client import CircuitOpenError, CircuitState
+from standx_mm_bot.client.breaker import AdaptiveTimeouts, CircuitBreaker
+from standx_mm_bot.client.metrics import RequestMetrics
+
+
+def test_opens_after_consecutive_failures() -> None:
+    """連続失敗で開き、送信が即座に失敗することを確認."""
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_request()
+    assert exc_info.value.request_sent is False
+    assert 0 < exc_info.value.retry_in <= 5.0
+
+
+def test_half_open_probe() -> None:
+    """半開状態で試行リクエストを1つだけ通し、結果で閉じる/開くことを確認."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0)
+    breaker.record_failure()
+
+    later = time.monotonic() + 6.0
+    with patch("standx_mm_bot.client.breaker.time.monotonic", return_value=later):
+        assert breaker.state == CircuitState.HALF_OPEN
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        # 試行が失敗したら再び開く
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+    later += 6.0
+    with patch("standx_mm_bot.client.breaker.time.monotonic", return_value=later):
+        breaker.before_request()
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.before_request()
+
+
+def test_release_returns_probe_slot() -> None:
+    """中断された試行リクエストの枠が返却されることを確認."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.release()
+    breaker.before_request()
+
+
+def test_state_change_callbacks() -> None:
+    """状態変化がコールバックに通知されることを確認."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    states: list[CircuitState] = []
+    breaker.on_state_change(states.append)
+
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_success()
+
+    assert states == [CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.CLOSED]
+    assert breaker.snapshot()["opened"] == 1
+
+
+def test_adaptive_timeouts() -> None:
+    """サンプル不足時は上限、以降はパーセンタイル × 倍率を範囲内で使うことを確認."""
+    metrics = RequestMetrics()
+    timeouts = AdaptiveTimeouts(
+        metrics, percentile=99, multiplier=4, min_timeout=0.05, max_timeout=10.0, min_samples=10
+    )
+    assert timeouts.timeout("/api/new_order") == 10.0
+
+    for _ in range(10):
+        metrics.observe_network("/api/new_order", 200, 0.050)
+    metrics.observe_network("/api/new_order", 503, 5.0)
+    assert timeouts.timeout("/api/new_order") == pytest.approx(0.2, rel=0.05)
+
+    for _ in range(10):
+        metrics.observe_network("/api/cancel_order", 200, 0.001)
+    assert timeouts.timeout("/api/cancel_order") == 0.05
+    assert set(timeouts.snapshot()) == {"/api/new_order", "/api/cancel_order"}
@@ -0,0 +1,101 @@
+"""cache.pyのテスト."""
+
+import asyncio
+
+import pytest
+
+from standx_mm_bot.client.cache import ReadCache
+
+
+@pytest.mark.asyncio
+async def test_result_is_cached_within_ttl() -> None:
+    """TTL内の再取得はキャッシュから返されることを確認."""
+    cache = ReadCache()
+    calls = 0
+
+    async def fetch() -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        return {"value": calls}
+
+    assert await cache.get("/api/query_balance", 10.0, fetch) == {"value": 1}
+    assert await cache.get("/api/query_balance", 10.0, fetch) == {"value": 1}
+    assert calls == 1
+    assert cache.snapshot()["/api/query_balance"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_only_coalesces() -> None:
+    """TTL 0 ではキャッシュせず、同時呼び出しのみ集約されることを確認."""
+    cache = ReadCache()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(cache.get("/a", 0.0, fetch) for _ in range(3)))
+    assert results == [1, 1, 1]
+    assert await cache.get("/a", 0.0, fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_cached() -> None:
+    """取得失敗は待機中の全呼び出し元に伝わり、キャッシュされないことを確認."""
+    cache = ReadCache()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise RuntimeError("boom")
+        return calls
+
+    results = await asyncio.gather(
+        *(cache.get("/a", 10.0, fetch) for _ in range(2)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert await cache.get("/a", 10.0, fetch) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_fetch_discards_result() -> None:
+    """取得中に無効化された結果はキャッシュされないことを確認."""
+    cache = ReadCache()
+    calls = 0
+
+    async def fetch() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    pending = asyncio.ensure_future(cache.get("/api/query_positions?symbol=X", 10.0, fetch))
+    await asyncio.sleep(0)
+    cache.invalidate("/api/query_positions")
+    assert await pending == 1
+
+    assert await cache.get("/api/query_positions?symbol=X", 10.0, fetch) == 2
+    assert cache.snapshot()["/api/query_positions"]["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_caller_cancellation_does_not_cancel_shared_fetch() -> None:
+    """1呼び出し元のキャンセルで共有中の取得が止まらないことを確認."""
+    cache = ReadCache()
+
+    async def fetch() -> str:
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    first = asyncio.ensure_future(cache.get("/a", 10.0, fetch))
+    second = asyncio.ensure_future(cache.get("/a", 10.0, fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "ok"
+    assert await cache.get("/a", 10.0, fetch) == "ok"
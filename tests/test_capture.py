@@ -0,0 +1,219 @@
+"""通信の記録・再生のテスト."""
+
+import asyncio
+import contextlib
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from standx_mm_bot.client import NetworkError, StandXHTTPClient, StandXWebSocketClient
+from standx_mm_bot.client.capture import TrafficRecorder, read_capture
+from standx_mm_bot.client.replay import ReplayTransport, WebSocketReplayer
+from standx_mm_bot.config import Settings
+from standx_mm_bot.mock_exchange import MockExchange, MockExchangeConfig
+
+
+def make_config(**overrides: Any) -> Settings:
+    """テスト用設定を生成."""
+    return Settings(
+        _env_file=None,
+        standx_private_key="0x" + "a" * 64,
+        standx_wallet_address="0x1234567890abcdef",
+        standx_chain="bsc",
+        standx_request_signing_key="0x" + "c" * 64,
+        symbol="ETH-USD",
+        jwt_cache_path=None,
+        http_warmup_connections=0,
+        http_metrics_log_seconds=0,
+        **overrides,
+    )
+
+
+@pytest.mark.asyncio
+async def test_capture_and_replay_http(tmp_path: Path) -> None:
+    """RESTの通信を記録し、同じレスポンスを再生できることを確認."""
+    path = tmp_path / "capture.jsonl.gz"
+    async with MockExchange(MockExchangeConfig(ticks_per_second=0)) as exchange:
+        config = make_config(standx_api_url=exchange.base_url, capture_path=str(path))
+        async with StandXHTTPClient(config, jwt_token="secret_jwt") as client:
+            balance = await client.fetch_balance()
+            await client.new_order("ETH-USD", "buy", 2990.0, 0.1, time_in_force="alo")
+
+    records = list(read_capture(path))
+    assert [r["k"] for r in records] == ["start", "http", "http"]
+    assert records[1]["u"].endswith("/api/query_balance")
+    assert records[1]["s"] == 200
+    assert '"qty":"0.1"' in records[2]["q"]
+    # JWT・署名ヘッダーは記録しない
+    assert "secret_jwt" not in path.read_bytes().decode("latin-1")
+
+    transport = ReplayTransport(records)
+    async with StandXHTTPClient(make_config(), jwt_token="jwt", transport=transport) as client:
+        assert await client.fetch_balance() == balance
+        response = await client.new_order("ETH-USD", "buy", 2990.0, 0.1)
+        assert response["message"] == "success"
+        with pytest.raises(NetworkError, match="No recorded response"):
+            await client.fetch_position("ETH-USD")
+    assert transport.remaining() == 0
+
+
+@pytest.mark.asyncio
+async def test_replay_recorded_network_error() -> None:
+    """記録した通信エラーが再生されることを確認."""
+    records = [
+        {
+            "t": 0.1,
+            "k": "http",
+            "m": "GET",
+            "u": "https://x/api/query_balance",
+            "q": "",
+            "e": "Network error: timed out after 1.00s",
+            "n": True,
+        },
+    ]
+    transport = ReplayTransport(records)
+
+    with pytest.raises(NetworkError, match="timed out") as exc_info:
+        await transport.request("GET", "https://perps.standx.com/api/query_balance", {}, b"", 1)
+    assert exc_info.value.request_sent
+
+
+@pytest.mark.asyncio
+async def test_capture_websocket_frames(tmp_path: Path) -> None:
+    """受信したWebSocketフレームが記録されることを確認."""
+    path = tmp_path / "capture.jsonl"
+    async with MockExchange(MockExchangeConfig(ticks_per_second=0)) as exchange:
+        ws = StandXWebSocketClient(
+            make_config(standx_ws_url=exchange.ws_url, capture_path=str(path))
+        )
+        received = asyncio.Event()
+
+        async def on_price(_data: dict[str, Any]) -> None:
+            received.set()
+
+        ws.on_price_update(on_price)
+        task = asyncio.create_task(ws.connect())
+        try:
+            while not any(exchange._subscribers.values()):
+                await asyncio.sleep(0.01)
+            await exchange.set_mark_price("ETH-USD", 3001.0)
+            await asyncio.wait_for(received.wait(), timeout=2.0)
+        finally:
+            await ws.disconnect()
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    frames = [r for r in read_capture(path) if r["k"] == "ws"]
+    assert len(frames) == 1
+    assert '"mark_price":"3001.00"' in frames[0]["d"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_replay(config_frames: list[dict[str, Any]]) -> None:
+    """記録したフレームが順にディスパッチされることを確認."""
+    client = StandXWebSocketClient(make_config())
+    prices: list[str] = []
+    orders: list[str] = []
+
+    async def on_price(data: dict[str, Any]) -> None:
+        prices.append(data["mark_price"])
+
+    async def on_order(data: dict[str, Any]) -> None:
+        orders.append(data["status"])
+
+    client.on_price_update(on_price)
+    client.on_order_update(on_order)
+
+    stats = await WebSocketReplayer(client, config_frames).run(speed=None)
+
+    assert prices == ["3000.00", "3001.00", "3002.00"]
+    assert orders == ["FILLED"]
+    assert stats.frames == 4
+    assert stats.recorded_span == pytest.approx(0.2)
+    assert stats.queues["price"]["received"] == 3
+    assert stats.queues["order"]["received"] == 1
+    assert not client._consumers
+
+
+@pytest.mark.asyncio
+async def test_websocket_replay_conflates_slow_price(config_frames: list[dict[str, Any]]) -> None:
+    """キュー経由の再生では遅いコールバックの間の price が置き換わることを確認."""
+    client = StandXWebSocketClient(make_config())
+    prices: list[str] = []
+
+    async def on_price(data: dict[str, Any]) -> None:
+        prices.append(data["mark_price"])
+        await asyncio.sleep(0.05)
+
+    client.on_price_update(on_price)
+
+    stats = await WebSocketReplayer(client, config_frames).run(speed=None)
+
+    assert prices == ["3000.00", "3002.00"]
+    assert stats.queues["price"]["dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_websocket_replay_direct(config_frames: list[dict[str, Any]]) -> None:
+    """direct指定時はキューを経由せず全フレームのディスパッチ時間を記録することを確認."""
+    client = StandXWebSocketClient(make_config())
+    prices: list[str] = []
+
+    async def on_price(data: dict[str, Any]) -> None:
+        prices.append(data["mark_price"])
+        await asyncio.sleep(0.01)
+
+    client.on_price_update(on_price)
+
+    stats = await WebSocketReplayer(client, config_frames).run(speed=None, direct=True)
+
+    assert prices == ["3000.00", "3001.00", "3002.00"]
+    assert stats.dispatch.count == 4
+    assert stats.queues == {}
+
+
+@pytest.mark.asyncio
+async def test_websocket_replay_at_recorded_speed(config_frames: list[dict[str, Any]]) -> None:
+    """speed指定時は記録時の間隔（の倍率）で再生することを確認."""
+    client = StandXWebSocketClient(make_config())
+
+    stats = await WebSocketReplayer(client, config_frames).run(speed=2.0)
+
+    # 記録上の0.2秒を2倍速で再生
+    assert stats.elapsed >= 0.09
+
+
+def test_recorder_is_shared_per_path(tmp_path: Path) -> None:
+    """同じパスの記録先は共有され、最後の利用者で閉じることを確認."""
+    path = tmp_path / "capture.jsonl"
+    a = TrafficRecorder.shared(path)
+    b = TrafficRecorder.shared(str(path))
+    assert a is b
+
+    a.record_ws(b'{"channel":"price"}')
+    a.release()
+    b.record_ws('{"channel":"order"}')
+    b.release()
+    b.record_ws('{"channel":"trade"}')
+
+    assert [r.get("d") for r in read_capture(path)] == [
+        None,
+        '{"channel":"price"}',
+        '{"channel":"order"}',
+    ]
+
+
+@pytest.fixture
+def config_frames() -> list[dict[str, Any]]:
+    """2回分の記録（追記）に分かれたWebSocketフレーム."""
+    return [
+        {"t": 0.0, "k": "start", "time": 1700000000.0},
+        {"t": 0.1, "k": "ws", "d": '{"channel":"price","data":{"mark_price":"3000.00"}}'},
+        {"t": 0.2, "k": "ws", "d": '{"channel":"price","data":{"mark_price":"3001.00"}}'},
+        {"t": 0.2, "k": "http", "m": "GET", "u": "https://x/api/query_balance", "q": ""},
+        {"t": 0.0, "k": "start", "time": 1700000100.0},
+        {"t": 0.1, "k": "ws", "d": '{"channel":"order","data":{"status":"FILLED"}}'},
+        {"t": 0.1, "k": "ws", "d": '{"channel":"price","data":{"mark_price":"3002.00"}}'},
+    ]
@@ -0,0 +1,64 @@
+"""チャンネル別キューのテスト."""
+
+import asyncio
+
+import pytest
+
+from standx_mm_bot.client.channel import ChannelQueue
+
+
+@pytest.mark.asyncio
+async def test_conflating_queue_keeps_latest() -> None:
+    """conflate時は未処理のメッセージが最新の1件に置き換わることを確認."""
+    queue = ChannelQueue(conflate=True)
+    for price in ("3000", "3001", "3002"):
+        queue.put({"mark_price": price})
+
+    assert queue.depth == 1
+    assert await queue.get() == {"mark_price": "3002"}
+    assert queue.snapshot() == {"depth": 0, "max_depth": 1, "received": 3, "dropped": 2}
+
+
+@pytest.mark.asyncio
+async def test_lossless_queue_keeps_order() -> None:
+    """conflateしない場合は全件を受信順に返すことを確認."""
+    queue = ChannelQueue()
+    for status in ("NEW", "PARTIALLY_FILLED", "FILLED"):
+        queue.put({"status": status})
+
+    assert [(await queue.get())["status"] for _ in range(3)] == [
+        "NEW",
+        "PARTIALLY_FILLED",
+        "FILLED",
+    ]
+    assert queue.snapshot() == {"depth": 0, "max_depth": 3, "received": 3, "dropped": 0}
+
+
+@pytest.mark.asyncio
+async def test_get_waits_for_put() -> None:
+    """空のキューでは次のメッセージまで待つことを確認."""
+    queue = ChannelQueue()
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    assert not getter.done()
+
+    queue.put({"status": "FILLED"})
+
+    assert await asyncio.wait_for(getter, timeout=1.0) == {"status": "FILLED"}
+
+
+@pytest.mark.asyncio
+async def test_join_waits_for_task_done() -> None:
+    """join() は取り出したメッセージの task_done() まで待つことを確認."""
+    queue = ChannelQueue(conflate=True)
+    queue.put({"mark_price": "3000"})
+    queue.put({"mark_price": "3001"})
+
+    joiner = asyncio.create_task(queue.join())
+    await queue.get()
+    await asyncio.sleep(0)
+    assert not joiner.done()
+
+    # 置き換えた分は処理待ちに数えない
+    queue.task_done()
+    await asyncio.wait_for(joiner, timeout=1.0)
@@ -0,0 +1,100 @@
+"""clock.pyのテスト."""
+
+import time
+from datetime import UTC, datetime
+from email.utils import format_datetime
+
+import pytest
+
+from standx_mm_bot.client.clock import ClockSync, parse_server_time_ms
+
+
+def _http_date(unix_ms: float) -> str:
+    """UNIXミリ秒をHTTP Dateヘッダー形式（秒精度）に変換."""
+    return format_datetime(datetime.fromtimestamp(unix_ms // 1000, tz=UTC), usegmt=True)
+
+
+def test_no_samples_uses_local_time() -> None:
+    """サンプルがない場合はローカル時刻を返すことを確認."""
+    clock = ClockSync()
+
+    assert clock.offset_ms == 0.0
+    assert clock.rtt_ms is None
+    assert abs(clock.now_ms() - time.time() * 1000) < 50
+
+
+def test_http_date_offset_estimate() -> None:
+    """Dateヘッダーのサンプルからオフセットを推定できることを確認."""
+    clock = ClockSync()
+    local = 1_700_000_000_000.0
+    true_offset = 5_300.0
+
+    # 秒の位相をずらした複数サンプルで範囲が狭まる
+    for phase in range(0, 1000, 100):
+        sent = local + phase * 7
+        received = sent + 20
+        server = (sent + received) / 2 + true_offset
+        clock.observe_http_date(_http_date(server), sent, received)
+
+    assert clock.offset_ms == pytest.approx(true_offset, abs=60)
+    assert clock.rtt_ms == pytest.approx(20)
+    assert clock.snapshot()["samples"] == 10
+
+
+def test_single_http_date_uncertainty() -> None:
+    """1サンプルでは秒精度分の不確かさが残ることを確認."""
+    clock = ClockSync()
+    clock.observe_http_date(_http_date(1_700_000_000_000.0), 1_700_000_000_000.0, 1_700_000_000_010)
+
+    snapshot = clock.snapshot()
+    assert snapshot["uncertainty_ms"] == pytest.approx(505)
+
+
+def test_drift_discards_inconsistent_samples() -> None:
+    """時計のドリフトで矛盾したサンプルより古いものは使わないことを確認."""
+    clock = ClockSync()
+    local = 1_700_000_000_000.0
+
+    clock.observe_http_date(_http_date(local), local, local + 10)
+    # ローカル時計が10秒ずれた
+    clock.observe_http_date(_http_date(local + 20_000), local + 10_000, local + 10_010)
+
+    assert clock.offset_ms == pytest.approx(10_000, abs=600)
+
+
+def test_server_time_lower_bound() -> None:
+    """片方向メッセージの時刻は下限として使われることを確認."""
+    clock = ClockSync()
+
+    clock.observe_server_time(1_700_000_002_000.0, 1_700_000_000_000.0)
+
+    assert clock.offset_ms == pytest.approx(2_000)
+    # 古い（遅い）時刻ではオフセットを下げない
+    clock.observe_server_time(1_700_000_000_500.0, 1_700_000_000_000.0)
+    assert clock.offset_ms == pytest.approx(2_000)
+
+
+def test_invalid_http_date_ignored() -> None:
+    """解釈できないDateヘッダーは無視されることを確認."""
+    clock = ClockSync()
+
+    clock.observe_http_date("not a date", 0.0, 10.0)
+
+    assert clock.snapshot()["samples"] == 0
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (1_700_000_000, 1_700_000_000_000.0),
+        (1_700_000_000_123, 1_700_000_000_123.0),
+        ("2023-11-14T22:13:20Z", 1_700_000_000_000.0),
+        ("2023-11-14T22:13:20.5+00:00", 1_700_000_000_500.0),
+        ("garbage", None),
+        (None, None),
+        (True, None),
+    ],
+)
+def test_parse_server_time_ms(value: object, expected: float | None) -> None:
+    """サーバー時刻表現のパースを確認."""
+    assert parse_server_time_ms(value) == expected
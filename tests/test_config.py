@@ -101,3 +101,16 @@ def test_settings_missing_required_fields() -> None:
     # _env_file=Noneで.envファイルを無視
     with pytest.raises(ValidationError):
         Settings(_env_file=None)
+
+
+def test_settings_validation_order_update_strategy() -> None:
+    """order_update_strategyが未対応の値の場合にエラーが発生することを確認."""
+    with pytest.raises(ValidationError) as exc_info:
+        Settings(
+            _env_file=None,
+            standx_private_key="0xtest",
+            standx_wallet_address="0xtest",
+            order_update_strategy="cancel_last",
+        )
+
+    assert "order_update_strategy must be one of" in str(exc_info.value)
@@ -0,0 +1,106 @@
+"""decode.pyのテスト."""
+
+from standx_mm_bot.client.decode import (
+    decode_balance,
+    decode_cancel_results,
+    decode_open_orders,
+    decode_order_ack,
+    decode_position,
+    loads,
+)
+from standx_mm_bot.models import OrderStatus, OrderType, Side
+
+
+def test_loads_bytes() -> None:
+    """バイト列を直接デコードできることを確認."""
+    assert loads(b'{"order_id":"1","qty":"0.1"}') == {"order_id": "1", "qty": "0.1"}
+
+
+def test_decode_order_ack_id_fallback() -> None:
+    """注文IDが order_id → cl_ord_id → request_id の順で採用されることを確認."""
+    args = ("ETH-USD", Side.BUY, 3500.0, 0.001)
+    assert decode_order_ack({"order_id": "o1", "cl_ord_id": "c1"}, *args).id == "o1"
+    assert decode_order_ack({"cl_ord_id": "c1", "request_id": "r1"}, *args).id == "c1"
+    assert decode_order_ack({"request_id": "r1"}, *args).id == "r1"
+    assert decode_order_ack({}, *args).id == "unknown"
+
+
+def test_decode_order_ack_status() -> None:
+    """ステータスの変換（不明な値はOPEN）を確認."""
+    args = ("ETH-USD", Side.SELL, 3500.0, 0.001)
+    assert decode_order_ack({"order_id": "1", "status": "FILLED"}, *args).status == (
+        OrderStatus.FILLED
+    )
+    assert decode_order_ack({"order_id": "1", "status": "new"}, *args).status == OrderStatus.OPEN
+
+
+def test_decode_open_orders() -> None:
+    """result/data/配列のいずれの形式でも注文一覧を変換できることを確認."""
+    item = {
+        "order_id": 42,
+        "side": "sell",
+        "price": "3510.5",
+        "qty": "0.002",
+        "status": "PARTIALLY_FILLED",
+        "fill_qty": "0.001",
+        "cl_ord_id": "mm1",
+    }
+    for data in ({"result": [item]}, {"data": [item]}, [item]):
+        (order,) = decode_open_orders(data, "ETH-USD")
+        assert order.id == "42"
+        assert order.symbol == "ETH-USD"
+        assert order.side == Side.SELL
+        assert order.price == 3510.5
+        assert order.size == 0.002
+        assert order.filled_size == 0.001
+        assert order.order_type == OrderType.LIMIT
+        assert order.status == OrderStatus.PARTIALLY_FILLED
+        assert order.client_order_id == "mm1"
+
+    assert decode_open_orders({"result": []}, "ETH-USD") == []
+
+
+def test_decode_position() -> None:
+    """符号付きサイズからポジションを変換できることを確認."""
+    short = decode_position(
+        [{"symbol": "ETH-USD", "qty": "-0.5", "entry_price": "3500", "upnl": "1.5"}], "ETH-USD"
+    )
+    assert short is not None
+    assert short.side == Side.SELL
+    assert short.size == 0.5
+    assert short.entry_price == 3500.0
+    assert short.unrealized_pnl == 1.5
+
+    assert decode_position([], "ETH-USD") is None
+    assert decode_position({"symbol": "ETH-USD", "size": "0"}, "ETH-USD") is None
+    assert decode_position([{"symbol": "BTC-USD", "qty": "1"}], "ETH-USD") is None
+
+
+def test_decode_balance() -> None:
+    """残高の変換を確認."""
+    balance = decode_balance(
+        {"balance": "100.5", "equity": "101", "cross_available": "90", "locked": "10", "upnl": ""}
+    )
+    assert balance.balance == 100.5
+    assert balance.equity == 101.0
+    assert balance.available == 90.0
+    assert balance.locked == 10.0
+    assert balance.upnl == 0.0
+
+
+def test_decode_cancel_results() -> None:
+    """一括キャンセルの注文ごとの結果を取り出せることを確認."""
+    results = decode_cancel_results(
+        {
+            "code": 0,
+            "data": [
+                {"order_id": "1", "code": 0},
+                {"cl_ord_id": "mm1", "code": "400", "message": "order not found: mm1"},
+                {"message": "no id"},
+            ],
+        }
+    )
+    assert results == {"1": (0, ""), "mm1": (400, "order not found: mm1")}
+
+    # 注文ごとの結果を含まないレスポンス
+    assert decode_cancel_results({"code": 0, "message": "success"}) == {}
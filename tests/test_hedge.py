@@ -0,0 +1,76 @@
+"""hedge.pyのテスト."""
+
+import json
+
+from standx_mm_bot.client import APIError, NetworkError, RateLimitError
+from standx_mm_bot.client.hedge import (
+    HedgePolicy,
+    HedgeStats,
+    LatencyWindow,
+    is_already_cancelled,
+)
+
+
+def _rejection(status: int, message: str) -> APIError:
+    body = json.dumps({"code": status, "message": message})
+    return APIError(f"HTTP {status}: {body}", status=status)
+
+
+def test_is_already_cancelled() -> None:
+    """重複キャンセルの拒否を判定できることを確認."""
+    assert is_already_cancelled(_rejection(400, "order not found: 123"))
+    assert is_already_cancelled(_rejection(400, "order already canceled: 123"))
+    assert is_already_cancelled(_rejection(400, "Order already cancelled"))
+
+
+def test_is_already_cancelled_rejects_other_errors() -> None:
+    """キャンセル済み以外の拒否・汎用エラーは重複とみなさないことを確認."""
+    assert not is_already_cancelled(_rejection(400, "invalid symbol"))
+    assert not is_already_cancelled(_rejection(400, "order cannot be cancelled"))
+    assert not is_already_cancelled(_rejection(400, "order already filled: 123"))
+    assert not is_already_cancelled(_rejection(503, "order not found"))
+    # ルーティング誤り・プロキシの汎用404
+    assert not is_already_cancelled(APIError("HTTP 404: 404: Not Found", status=404))
+    assert not is_already_cancelled(_rejection(404, "order not found"))
+    # JSONでないボディ
+    assert not is_already_cancelled(APIError("HTTP 400: order not found", status=400))
+    assert not is_already_cancelled(RateLimitError("Rate limited (429)"))
+    assert not is_already_cancelled(NetworkError("Network error: not found"))
+
+
+def test_latency_window_percentile() -> None:
+    """直近のサンプルのみでパーセンタイルを計算することを確認."""
+    window = LatencyWindow(size=10)
+    assert window.percentile(95) == 0.0
+    for i in range(100):
+        window.record(i / 1000)
+
+    assert len(window) == 10
+    assert window.percentile(0) == 0.090
+    assert window.percentile(95) == 0.099
+
+
+def test_policy_delay() -> None:
+    """サンプル不足時は上限、以降はパーセンタイルを範囲内で使うことを確認."""
+    policy = HedgePolicy(percentile=90, min_delay=0.005, max_delay=0.25, min_samples=5)
+    window = LatencyWindow()
+    for _ in range(4):
+        window.record(0.020)
+    assert policy.delay(window) == 0.25
+
+    window.record(0.020)
+    assert policy.delay(window) == 0.020
+
+    fast = LatencyWindow()
+    for _ in range(5):
+        fast.record(0.001)
+    assert policy.delay(fast) == 0.005
+
+
+def test_stats_snapshot() -> None:
+    """ヘッジ率・勝率の計算を確認."""
+    stats = HedgeStats(requests=10, hedged=2, hedge_wins=1)
+    snapshot = stats.snapshot()
+    assert snapshot["hedge_rate"] == 0.2
+    assert snapshot["win_rate"] == 0.5
+    assert HedgeStats().snapshot()["win_rate"] == 0.0
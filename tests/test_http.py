@@ -1,15 +1,30 @@
 """REST APIクライアントのテスト."""
 
-from unittest.mock import patch
+import asyncio
+import base64
+import json
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
 
+import aiohttp
 import pytest
-from aioresponses import aioresponses
+from aioresponses import CallbackResult, aioresponses
+from nacl.signing import SigningKey
+from yarl import URL
 
 from standx_mm_bot.client import (
     APIError,
     AuthenticationError,
+    CircuitOpenError,
+    CircuitState,
+    NetworkError,
+    RateLimitError,
     StandXHTTPClient,
 )
+from standx_mm_bot.client.http import is_stale_signature
+from standx_mm_bot.client.token_store import CachedToken, TokenStore
 from standx_mm_bot.config import Settings
 
 
@@ -20,8 +35,12 @@ def config() -> Settings:
         standx_private_key="0x" + "a" * 64,
         standx_wallet_address="0x1234567890abcdef",
         standx_chain="bsc",
+        standx_request_signing_key="0x" + "c" * 64,
         symbol="ETH_USDC",
         order_size=0.1,
+        jwt_cache_path=None,
+        http_warmup_connections=0,
+        http_metrics_log_seconds=0,
     )
 
 
@@ -34,6 +53,59 @@ async def test_context_manager(config: Settings) -> None:
 
     # コンテキスト終了後はセッションがクローズされる
     assert client.session.closed
+    assert client.auth_session is not None
+    assert client.auth_session.closed
+
+
+@pytest.mark.asyncio
+async def test_connector_settings(config: Settings) -> None:
+    """取引用・認証用で別のチューニング済みプールが使われることを確認."""
+    config.http_pool_size = 4
+
+    async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+        assert client.session is not None
+        assert client.auth_session is not None
+        connector = client.session.connector
+        assert isinstance(connector, aiohttp.TCPConnector)
+        assert connector.limit == 4
+        assert connector.limit_per_host == 4
+        assert connector.use_dns_cache
+        assert client.auth_session.connector is not connector
+
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_connections(config: Settings) -> None:
+    """warm_upが指定数のリクエストを同時に送ることを確認."""
+    with aioresponses() as mocked:
+        mocked.head("https://perps.standx.com/", repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            await client.warm_up(connections=3)
+
+        assert len(mocked.requests[("HEAD", URL("https://perps.standx.com/"))]) == 3
+
+
+@pytest.mark.asyncio
+async def test_warm_up_failure_is_ignored(config: Settings) -> None:
+    """warm_upの失敗が例外にならないことを確認."""
+    with aioresponses():
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            await client.warm_up(connections=2)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_on_enter(config: Settings) -> None:
+    """起動時にバックグラウンドでwarm_upが実行されることを確認."""
+    config.http_warmup_connections = 2
+
+    with aioresponses() as mocked:
+        mocked.head("https://perps.standx.com/", repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token"):
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        assert len(mocked.requests[("HEAD", URL("https://perps.standx.com/"))]) == 2
 
 
 @pytest.mark.asyncio
@@ -242,3 +314,785 @@ async def test_session_not_initialized(config: Settings) -> None:
 
     with pytest.raises(RuntimeError, match="Session not initialized"):
         await client.get_symbol_price("ETH_USDC")
+
+
+@pytest.mark.asyncio
+async def test_cached_jwt_skips_login(config: Settings, tmp_path: Path) -> None:
+    """キャッシュ済みJWTがあればログインを省略することを確認."""
+    config.jwt_cache_path = str(tmp_path / "jwt.json")
+    TokenStore(config.jwt_cache_path).save(
+        CachedToken(
+            token="cached_jwt",
+            expires_at=time.time() + 3 * 86400,
+            address=config.standx_wallet_address,
+            chain=config.standx_chain,
+            auth_url=config.standx_auth_url,
+        )
+    )
+
+    with patch.object(StandXHTTPClient, "_obtain_jwt", new_callable=AsyncMock) as obtain:
+        async with StandXHTTPClient(config) as client:
+            assert client.jwt_token == "cached_jwt"
+
+    obtain.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_obtained_jwt_is_cached(config: Settings, tmp_path: Path) -> None:
+    """取得したJWTがキャッシュに保存されることを確認."""
+    config.jwt_cache_path = str(tmp_path / "jwt.json")
+
+    with patch.object(
+        StandXHTTPClient, "_obtain_jwt", new_callable=AsyncMock, return_value="fresh_jwt"
+    ):
+        async with StandXHTTPClient(config) as client:
+            assert client.jwt_token == "fresh_jwt"
+
+    cached = TokenStore(config.jwt_cache_path).load(
+        config.standx_wallet_address, config.standx_chain, config.standx_auth_url
+    )
+    assert cached is not None
+    assert cached.token == "fresh_jwt"
+
+
+@pytest.mark.asyncio
+async def test_login_failure_cleans_up(config: Settings) -> None:
+    """ログイン失敗時にバックグラウンドタスクとセッションが片付くことを確認."""
+    config.http_metrics_log_seconds = 60
+    client = StandXHTTPClient(config)
+
+    with (
+        patch.object(
+            StandXHTTPClient,
+            "_obtain_jwt",
+            new_callable=AsyncMock,
+            side_effect=AuthenticationError("login failed"),
+        ),
+        pytest.raises(AuthenticationError),
+    ):
+        async with client:
+            pass
+
+    assert client._background_tasks == []
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+    assert client.session is not None
+    assert client.session.closed
+    assert client.auth_session is not None
+    assert client.auth_session.closed
+
+
+@pytest.mark.asyncio
+async def test_background_jwt_refresh(config: Settings, tmp_path: Path) -> None:
+    """有効期限が近いJWTがバックグラウンドで更新されることを確認."""
+    config.jwt_cache_path = str(tmp_path / "jwt.json")
+    config.jwt_refresh_margin_seconds = 3600
+    # 更新マージン内（残り10分）のキャッシュ済みトークン
+    TokenStore(config.jwt_cache_path).save(
+        CachedToken(
+            token="old_jwt",
+            expires_at=time.time() + 600,
+            address=config.standx_wallet_address,
+            chain=config.standx_chain,
+            auth_url=config.standx_auth_url,
+        )
+    )
+
+    with patch.object(
+        StandXHTTPClient, "_obtain_jwt", new_callable=AsyncMock, return_value="new_jwt"
+    ) as obtain:
+        async with StandXHTTPClient(config) as client:
+            # 起動時はキャッシュを即座に使う
+            assert client.jwt_token == "old_jwt"
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert client.jwt_token == "new_jwt"
+
+    obtain.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_new_order_signs_exact_body_bytes(config: Settings) -> None:
+    """署名したバイト列と送信するバイト列が同一であることを確認."""
+    url = "https://perps.standx.com/api/new_order"
+    with aioresponses() as mocked:
+        mocked.post(url, payload={"order_id": "order_123"})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            response = await client.new_order(symbol="ETH_USDC", side="BUY", price=3500.0, size=0.1)
+
+        request = mocked.requests[("POST", URL(url))][0]
+
+    sent = request.kwargs["data"]
+    headers = request.kwargs["headers"]
+    assert isinstance(sent, bytes)
+    assert json.loads(sent) == {
+        "symbol": "ETH_USDC",
+        "side": "buy",
+        "order_type": "limit",
+        "qty": "0.1",
+        "price": "3500.0",
+        "time_in_force": "gtc",
+        "reduce_only": False,
+        "cl_ord_id": response["cl_ord_id"],
+    }
+
+    message = f"v1,{headers['x-request-id']},{headers['x-request-timestamp']},".encode() + sent
+    assert config.standx_request_signing_key is not None
+    verify_key = SigningKey(bytes.fromhex(config.standx_request_signing_key[2:])).verify_key
+    verify_key.verify(message, base64.b64decode(headers["x-request-signature"]))
+
+
+@pytest.mark.asyncio
+async def test_date_header_corrects_request_timestamp(config: Settings) -> None:
+    """Dateヘッダーから推定したオフセットで署名タイムスタンプが補正されることを確認."""
+    url = "https://perps.standx.com/api/query_balance"
+    server_now = time.time() + 3600  # サーバー時計が1時間進んでいる
+    date_header = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(server_now))
+
+    with aioresponses() as mocked:
+        mocked.get(url, payload={}, headers={"Date": date_header})
+        mocked.get(url, payload={})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            await client.get_balance()
+            client.invalidate_order_state()
+            await client.get_balance()
+
+        second = mocked.requests[("GET", URL(url))][1]
+
+    timestamp_ms = int(second.kwargs["headers"]["x-request-timestamp"])
+    assert abs(timestamp_ms - server_now * 1000) < 2000
+    assert client.metrics()["clock"]["samples"] == 1
+
+
+@pytest.mark.asyncio
+async def test_send_prepared_cancel(config: Settings) -> None:
+    """事前署名したキャンセルが署名時のヘッダーとボディで送信されることを確認."""
+    url = "https://perps.standx.com/api/cancel_order"
+    with aioresponses() as mocked:
+        mocked.post(url, payload={"status": "CANCELED"})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            prepared = client.prepare_cancel_order("order_123", "ETH_USDC")
+            response = await client.send_prepared(prepared)
+
+        request = mocked.requests[("POST", URL(url))][0]
+
+    assert response["status"] == "CANCELED"
+    assert request.kwargs["data"] == b'{"order_id":"order_123","symbol":"ETH_USDC"}'
+    assert request.kwargs["headers"]["x-request-id"] == prepared.headers["x-request-id"]
+    assert request.kwargs["headers"]["authorization"] == "Bearer test_jwt_token"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_penalizes_limiter(config: Settings) -> None:
+    """429受信時にRetry-Afterがレートリミッターに反映されることを確認."""
+    url = "https://perps.standx.com/api/query_symbol_price?symbol=ETH_USDC"
+    with aioresponses() as mocked:
+        mocked.get(url, status=429, headers={"Retry-After": "0.01"})
+        mocked.get(url, payload={"mark_price": 3500.0})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            response = await client.get_symbol_price("ETH_USDC")
+
+    assert response["mark_price"] == 3500.0
+    assert client.metrics()["rate_limit"]["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_query_retries_server_error(config: Settings) -> None:
+    """照会が5xxエラーをリトライして成功することを確認."""
+    url = "https://perps.standx.com/api/query_balance"
+    with aioresponses() as mocked:
+        mocked.get(url, status=503)
+        mocked.get(url, status=502)
+        mocked.get(url, payload={"equity": 1.0})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            response = await client.get_balance()
+
+    assert response["equity"] == 1.0
+    retry = client.metrics()["retry"]["query"]
+    assert retry["retries"] == 2
+    assert retry["recovered"] == 1
+
+
+@pytest.mark.asyncio
+async def test_place_does_not_retry_server_error(config: Settings) -> None:
+    """クライアント注文IDのない発注は5xxエラーをリトライしないことを確認（二重発注防止）."""
+    with aioresponses() as mocked:
+        mocked.post("https://perps.standx.com/api/new_order", status=502)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            with pytest.raises(APIError, match="HTTP 502"):
+                await client._request("POST", "/api/new_order", {"symbol": "ETH_USDC"})
+
+    assert client.metrics()["retry"]["place"]["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_place_retries_server_error_with_same_client_order_id(config: Settings) -> None:
+    """クライアント注文ID付きの発注は5xxでも同じIDでリトライされることを確認."""
+    url = "https://perps.standx.com/api/new_order"
+    with aioresponses() as mocked:
+        mocked.post(url, status=504)
+        mocked.post(url, payload={"order_id": "order_123"})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            response = await client.new_order(symbol="ETH_USDC", side="buy", price=3500.0, size=0.1)
+
+        requests = mocked.requests[("POST", URL(url))]
+
+    first, second = (json.loads(r.kwargs["data"]) for r in requests)
+    assert first["cl_ord_id"] == second["cl_ord_id"] == response["cl_ord_id"]
+    assert client.order_ids.exchange_id(response["cl_ord_id"]) == "order_123"
+
+
+@pytest.mark.asyncio
+async def test_place_retry_rejected_as_duplicate(config: Settings) -> None:
+    """リトライが重複として拒否された場合は受付済みとして扱うことを確認."""
+    url = "https://perps.standx.com/api/new_order"
+    with aioresponses() as mocked:
+        mocked.post(url, exception=TimeoutError())
+        mocked.post(url, status=400, body="duplicate cl_ord_id")
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            response = await client.new_order(
+                symbol="ETH_USDC", side="buy", price=3500.0, size=0.1, cl_ord_id="my_order_1"
+            )
+
+    assert response["cl_ord_id"] == "my_order_1"
+    assert "order_id" not in response
+
+
+@pytest.mark.asyncio
+async def test_cancel_by_client_order_id(config: Settings) -> None:
+    """クライアント注文IDのキャンセルは取引所注文IDに解決されることを確認."""
+    url = "https://perps.standx.com/api/cancel_order"
+    with aioresponses() as mocked:
+        mocked.post(url, payload={})
+        mocked.post(url, payload={})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            unknown = client.order_ids.new_id()
+            known = client.order_ids.new_id()
+            await client.handle_order_event({"cl_ord_id": known, "id": "order_999"})
+            await client.cancel_order(order_id=unknown, symbol="ETH_USDC")
+            await client.cancel_order(order_id=known, symbol="ETH_USDC")
+
+        first, second = (r.kwargs["data"] for r in mocked.requests[("POST", URL(url))])
+
+    assert json.loads(first) == {"cl_ord_id": unknown, "symbol": "ETH_USDC"}
+    assert json.loads(second) == {"order_id": "order_999", "symbol": "ETH_USDC"}
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_bulk(config: Settings) -> None:
+    """複数注文のキャンセルが一括キャンセルAPIで送信されることを確認."""
+    url = "https://perps.standx.com/api/cancel_orders"
+    open_orders_url = "https://perps.standx.com/api/query_open_orders?symbol=ETH_USDC"
+    with aioresponses() as mocked:
+        mocked.post(url, payload={"code": 0}, repeat=True)
+        mocked.get(open_orders_url, payload={"result": []})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            unknown = client.order_ids.new_id()
+            known = client.order_ids.new_id()
+            await client.handle_order_event({"cl_ord_id": known, "id": "order_3"})
+            results = await client.cancel_orders(["order_1", unknown, known], "ETH_USDC")
+
+        bodies = [json.loads(r.kwargs["data"]) for r in mocked.requests[("POST", URL(url))]]
+        # 注文ごとの結果がないレスポンスは未決注文の照会で確認する
+        assert len(mocked.requests[("GET", URL(open_orders_url))]) == 1
+
+    assert [(r.order_id, r.ok) for r in results] == [
+        ("order_1", True),
+        (unknown, True),
+        (known, True),
+    ]
+    # 取引所注文IDとクライアント注文IDは別々に（並行して）送信する
+    assert len(bodies) == 2
+    assert {"order_id_list": ["order_1", "order_3"]} in bodies
+    assert {"cl_ord_id_list": [unknown]} in bodies
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_bulk_per_order_results(config: Settings) -> None:
+    """一括キャンセルのレスポンスに含まれる注文ごとの結果を採用することを確認."""
+    url = "https://perps.standx.com/api/cancel_orders"
+    with aioresponses() as mocked:
+        mocked.post(
+            url,
+            payload={
+                "code": 0,
+                "result": [
+                    {"order_id": "order_1", "code": 0},
+                    {"order_id": "order_2", "code": 400, "message": "order not found: order_2"},
+                    {"order_id": "order_3", "code": 400, "message": "order cannot be cancelled"},
+                ],
+            },
+        )
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            results = await client.cancel_orders(["order_1", "order_2", "order_3"], "ETH_USDC")
+
+        # 全注文の結果があるため未決注文は照会しない
+        assert [method for method, _ in mocked.requests] == ["POST"]
+
+    assert [(r.order_id, r.ok) for r in results] == [
+        ("order_1", True),
+        ("order_2", True),
+        ("order_3", False),
+    ]
+    assert isinstance(results[2].error, APIError)
+    assert "cannot be cancelled" in str(results[2].error)
+    assert results[2].error.status == 200
+    assert results[2].error.code == 400
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_bulk_resends_orders_still_open(config: Settings) -> None:
+    """一括キャンセル後も未決注文に残っている注文は個別に送り直すことを確認."""
+    bulk_url = "https://perps.standx.com/api/cancel_orders"
+    url = "https://perps.standx.com/api/cancel_order"
+    with aioresponses() as mocked:
+        mocked.post(bulk_url, payload={"code": 0, "message": "success"})
+        mocked.get(
+            "https://perps.standx.com/api/query_open_orders?symbol=ETH_USDC",
+            payload={"result": [{"order_id": "order_2", "side": "buy", "price": "3500"}]},
+        )
+        mocked.post(url, payload={"code": 0})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            results = await client.cancel_orders(["order_1", "order_2"], "ETH_USDC")
+
+        resent = [json.loads(r.kwargs["data"]) for r in mocked.requests[("POST", URL(url))]]
+
+    assert [(r.order_id, r.ok) for r in results] == [("order_1", True), ("order_2", True)]
+    assert [body["order_id"] for body in resent] == ["order_2"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_retries_bulk_after_404(config: Settings) -> None:
+    """一括キャンセルAPIの404後は一定時間個別送信し、その後再び一括キャンセルを試すことを確認."""
+    config.cancel_bulk_retry_seconds = 60
+    bulk_url = "https://perps.standx.com/api/cancel_orders"
+    url = "https://perps.standx.com/api/cancel_order"
+    with aioresponses() as mocked:
+        mocked.post(bulk_url, status=404)
+        mocked.post(bulk_url, payload={"code": 0, "result": [{"order_id": "order_3", "code": 0}]})
+        mocked.post(url, payload={"code": 0}, repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            await client.cancel_orders(["order_1"], "ETH_USDC")
+            await client.cancel_orders(["order_2"], "ETH_USDC")
+            assert len(mocked.requests[("POST", URL(bulk_url))]) == 1
+
+            client._bulk_cancel_retry_at = time.monotonic()
+            results = await client.cancel_orders(["order_3"], "ETH_USDC")
+
+        assert len(mocked.requests[("POST", URL(bulk_url))]) == 2
+        assert len(mocked.requests[("POST", URL(url))]) == 2
+
+    assert results[0].ok
+
+
+@pytest.mark.asyncio
+async def test_cancel_orders_falls_back_to_per_order(config: Settings) -> None:
+    """一括キャンセルAPIがない場合は注文ごとに並行送信し、結果を注文ごとに返すことを確認."""
+    config.cancel_max_concurrency = 2
+    bulk_url = "https://perps.standx.com/api/cancel_orders"
+    url = "https://perps.standx.com/api/cancel_order"
+    in_flight = 0
+    max_in_flight = 0
+
+    async def cancel(_url: URL, **kwargs: Any) -> CallbackResult:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        order_id = json.loads(kwargs["data"])["order_id"]
+        if order_id == "order_2":
+            return CallbackResult(
+                status=400, payload={"code": 400, "message": "order not found: order_2"}
+            )
+        if order_id == "order_3":
+            return CallbackResult(status=400, body="invalid symbol")
+        return CallbackResult(payload={"code": 0})
+
+    with aioresponses() as mocked:
+        mocked.post(bulk_url, status=404)
+        mocked.post(url, callback=cancel, repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            ids = ["order_1", "order_2", "order_3", "order_4"]
+            results = await client.cancel_orders(ids, "ETH_USDC")
+            # 404の後は再試行時間まで一括キャンセルAPIを試さない
+            await client.cancel_orders(["order_5"], "ETH_USDC")
+
+        assert len(mocked.requests[("POST", URL(bulk_url))]) == 1
+        assert len(mocked.requests[("POST", URL(url))]) == 5
+
+    assert [r.order_id for r in results] == ids
+    # 注文なし (重複キャンセル) は成功扱い
+    assert [r.ok for r in results] == [True, True, False, True]
+    assert isinstance(results[2].error, APIError)
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_place_retries_connection_error(config: Settings) -> None:
+    """発注は接続確立前のエラーをリトライすることを確認."""
+    url = "https://perps.standx.com/api/new_order"
+    connect_error = aiohttp.ClientConnectorError(Mock(), OSError("Connection refused"))
+    with aioresponses() as mocked:
+        mocked.post(url, exception=connect_error)
+        mocked.post(url, payload={"order_id": "order_123"})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            response = await client.new_order(symbol="ETH_USDC", side="buy", price=3500.0, size=0.1)
+
+        requests = mocked.requests[("POST", URL(url))]
+
+    assert response["order_id"] == "order_123"
+    # リトライは再署名される
+    assert (
+        requests[0].kwargs["headers"]["x-request-id"]
+        != (requests[1].kwargs["headers"]["x-request-id"])
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up_after_max_attempts(config: Settings) -> None:
+    """最大試行回数でリトライを打ち切ることを確認."""
+    config.retry_max_attempts = 3
+    url = "https://perps.standx.com/api/cancel_order"
+    with aioresponses() as mocked:
+        mocked.post(url, status=503, repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            with pytest.raises(APIError, match="HTTP 503"):
+                await client.cancel_order(order_id="order_123", symbol="ETH_USDC")
+
+        assert len(mocked.requests[("POST", URL(url))]) == 3
+
+    cancel = client.metrics()["retry"]["cancel"]
+    assert cancel["retries"] == 2
+    assert cancel["exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_respects_deadline(config: Settings) -> None:
+    """合計期限を超えるリトライは行わないことを確認."""
+    config.retry_deadline_seconds = 0.5
+    url = "https://perps.standx.com/api/query_symbol_price?symbol=ETH_USDC"
+    with aioresponses() as mocked:
+        mocked.get(url, status=429, headers={"Retry-After": "5"})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            with pytest.raises(RateLimitError):
+                await client.get_symbol_price("ETH_USDC")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_are_coalesced(config: Settings) -> None:
+    """同時の同一照会が1回の送信に集約されることを確認."""
+    url = "https://perps.standx.com/api/query_symbol_price?symbol=ETH_USDC"
+    with aioresponses() as mocked:
+        mocked.get(url, payload={"mark_price": "3500"})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            results = await asyncio.gather(*(client.get_symbol_price("ETH_USDC") for _ in range(5)))
+
+        assert len(mocked.requests[("GET", URL(url))]) == 1
+
+    assert all(r["mark_price"] == "3500" for r in results)
+    stats = client.metrics()["cache"]["/api/query_symbol_price"]
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_order_placement_invalidates_read_cache(config: Settings) -> None:
+    """発注成功で未決注文照会のキャッシュが破棄されることを確認."""
+    orders_url = "https://perps.standx.com/api/query_open_orders?symbol=ETH_USDC"
+    with aioresponses() as mocked:
+        mocked.get(orders_url, payload={"result": []})
+        mocked.post("https://perps.standx.com/api/new_order", payload={"order_id": "order_1"})
+        mocked.get(orders_url, payload={"result": [{"id": "order_1"}]})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            first = await client.get_open_orders("ETH_USDC")
+            cached = await client.get_open_orders("ETH_USDC")
+            await client.new_order("ETH_USDC", "buy", 3500.0, 0.1)
+            after = await client.get_open_orders("ETH_USDC")
+
+    assert first == cached == {"result": []}
+    assert after == {"result": [{"id": "order_1"}]}
+    stats = client.metrics()["cache"]["/api/query_open_orders"]
+    assert stats["hits"] == 1
+    assert stats["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_latency_metrics_recorded(config: Settings) -> None:
+    """署名・送信待ち・ネットワーク時間がエンドポイント別に記録されることを確認."""
+    with aioresponses() as mocked:
+        mocked.post("https://perps.standx.com/api/new_order", payload={"order_id": "order_1"})
+        mocked.post("https://perps.standx.com/api/new_order", status=400, body="bad")
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            await client.new_order("ETH_USDC", "buy", 3500.0, 0.1)
+            with pytest.raises(APIError):
+                await client.new_order("ETH_USDC", "buy", 3500.0, 0.1)
+
+    latency = client.metrics()["latency"]["/api/new_order"]
+    assert latency["sign"]["count"] == 2
+    assert latency["queue"]["count"] == 2
+    assert latency["network"]["2xx"]["count"] == 1
+    assert latency["network"]["4xx"]["count"] == 1
+    assert latency["network"]["2xx"]["p99_ms"] > 0
+
+
+def _fake_send_once(delays: list[float], errors: dict[int, Exception] | None = None) -> Any:
+    """呼び出し順ごとに遅延・エラーを返す _send_once の代替."""
+    calls = 0
+
+    async def send_once(*_args: Any) -> dict[str, Any]:
+        nonlocal calls
+        index = calls
+        calls += 1
+        await asyncio.sleep(delays[index])
+        if errors and index in errors:
+            raise errors[index]
+        return {"code": 0, "attempt": index}
+
+    return send_once
+
+
+@pytest.mark.asyncio
+async def test_hedged_cancel_wins_over_slow_primary(config: Settings) -> None:
+    """応答の遅いキャンセルにヘッジが送信され、先に成功した方が採用されることを確認."""
+    config.cancel_hedge_enabled = True
+    config.cancel_hedge_max_delay_seconds = 0.01
+    async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+        with patch.object(client, "_send_once", side_effect=_fake_send_once([1.0, 0.0])):
+            response = await client.cancel_order(order_id="order_123", symbol="ETH_USDC")
+
+    assert response["attempt"] == 1
+    hedge = client.metrics()["hedge"]
+    assert hedge["hedged"] == 1
+    assert hedge["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_cancel_is_not_hedged(config: Settings) -> None:
+    """待機時間内に応答したキャンセルはヘッジされないことを確認."""
+    config.cancel_hedge_enabled = True
+    config.cancel_hedge_max_delay_seconds = 0.5
+    async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+        with patch.object(client, "_send_once", side_effect=_fake_send_once([0.0])):
+            response = await client.cancel_order(order_id="order_123", symbol="ETH_USDC")
+
+    assert response["attempt"] == 0
+    assert client.metrics()["hedge"]["requests"] == 1
+    assert client.metrics()["hedge"]["hedged"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedged_cancel_ignores_duplicate_rejection(config: Settings) -> None:
+    """重複キャンセルの拒否が先に返っても、もう片方の成功を待つことを確認."""
+    config.cancel_hedge_enabled = True
+    config.cancel_hedge_max_delay_seconds = 0.01
+    duplicate = APIError(
+        'HTTP 400: {"code": 400, "message": "order not found: order_123"}', status=400
+    )
+    async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+        with patch.object(
+            client, "_send_once", side_effect=_fake_send_once([0.05, 0.0], {1: duplicate})
+        ):
+            response = await client.cancel_order(order_id="order_123", symbol="ETH_USDC")
+
+    assert response["attempt"] == 0
+    assert client.metrics()["hedge"]["hedge_wins"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedged_cancel_duplicate_with_lost_primary(config: Settings) -> None:
+    """1本目が通信エラー・ヘッジが重複拒否の場合はキャンセル済みとみなすことを確認."""
+    config.cancel_hedge_enabled = True
+    config.cancel_hedge_max_delay_seconds = 0.01
+    config.retry_max_attempts = 1
+    errors: dict[int, Exception] = {
+        0: NetworkError("Network error: timeout"),
+        1: APIError(
+            'HTTP 400: {"code": 400, "message": "order already canceled: order_123"}',
+            status=400,
+        ),
+    }
+    async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+        with patch.object(client, "_send_once", side_effect=_fake_send_once([0.05, 0.0], errors)):
+            response = await client.cancel_order(order_id="order_123", symbol="ETH_USDC")
+
+    assert response["code"] == 0
+    assert client.metrics()["hedge"]["duplicate_rejections"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_typed_models(config: Settings) -> None:
+    """照会結果がモデルに変換されることを確認."""
+    with aioresponses() as mocked:
+        mocked.get(
+            "https://perps.standx.com/api/query_open_orders?symbol=ETH_USDC",
+            payload={"result": [{"order_id": "1", "side": "buy", "price": "3500", "qty": "0.1"}]},
+        )
+        mocked.get(
+            "https://perps.standx.com/api/query_positions?symbol=ETH_USDC",
+            payload=[{"symbol": "ETH_USDC", "qty": "0.1", "entry_price": "3500"}],
+        )
+        mocked.get(
+            "https://perps.standx.com/api/query_balance",
+            payload={"balance": "100", "equity": "100", "cross_available": "80"},
+        )
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            orders = await client.fetch_open_orders("ETH_USDC")
+            position = await client.fetch_position("ETH_USDC")
+            balance = await client.fetch_balance()
+
+    assert [o.id for o in orders] == ["1"]
+    assert position is not None and position.size == 0.1
+    assert balance.available == 80.0
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast(config: Settings) -> None:
+    """連続した5xxでブレーカーが開き、以降は送信せずに失敗することを確認."""
+    config.circuit_failure_threshold = 2
+    config.retry_max_attempts = 1
+    url = "https://perps.standx.com/api/query_balance"
+    with aioresponses() as mocked:
+        mocked.get(url, status=503, repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            for _ in range(2):
+                with pytest.raises(APIError, match="HTTP 503"):
+                    await client.get_balance()
+            assert client.circuit_state == CircuitState.OPEN
+
+            with pytest.raises(CircuitOpenError):
+                await client.get_balance()
+
+        assert len(mocked.requests[("GET", URL(url))]) == 2
+
+    assert client.metrics()["circuit"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_non_json_200_is_network_error(config: Settings) -> None:
+    """JSONでない200応答（プロキシのエラーページ）がNetworkErrorになり、障害として記録されることを確認."""
+    config.circuit_failure_threshold = 2
+    config.retry_max_attempts = 1
+    url = "https://perps.standx.com/api/query_balance"
+    with aioresponses() as mocked:
+        mocked.get(url, status=200, body="<html>502 Bad Gateway</html>", repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            for _ in range(2):
+                with pytest.raises(NetworkError, match="Invalid JSON response"):
+                    await client.get_balance()
+
+            assert client.circuit_state == CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_request_uses_endpoint_timeout(config: Settings) -> None:
+    """リクエストにエンドポイント別のタイムアウトが設定されることを確認."""
+    config.http_timeout_seconds = 3.0
+    url = "https://perps.standx.com/api/query_balance"
+    with aioresponses() as mocked:
+        mocked.get(url, payload={})
+
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            await client.get_balance()
+
+        request = mocked.requests[("GET", URL(url))][0]
+
+    assert request.kwargs["timeout"].total == 3.0
+
+
+@pytest.mark.asyncio
+async def test_401_relogins_and_replays(config: Settings) -> None:
+    """401応答で再ログインし、新しいトークンで再署名・再送されることを確認."""
+    url = "https://perps.standx.com/api/query_balance"
+    with aioresponses() as mocked:
+        mocked.get(url, status=401)
+        mocked.get(url, payload={"equity": "100"})
+
+        async with StandXHTTPClient(config, jwt_token="expired_token") as client:
+            with patch.object(client, "_obtain_jwt", AsyncMock(return_value="fresh_token")):
+                response = await client.get_balance()
+
+        first, second = mocked.requests[("GET", URL(url))]
+
+    assert response == {"equity": "100"}
+    assert first.kwargs["headers"]["authorization"] == "Bearer expired_token"
+    assert second.kwargs["headers"]["authorization"] == "Bearer fresh_token"
+    assert first.kwargs["headers"]["x-request-id"] != second.kwargs["headers"]["x-request-id"]
+    assert client.metrics()["auth"] == {"relogins": 1, "replays": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_401s_share_one_login(config: Settings) -> None:
+    """同時の401応答で再ログインが1回だけ実行されることを確認."""
+
+    async def obtain_jwt() -> str:
+        await asyncio.sleep(0.01)
+        return "fresh_token"
+
+    with aioresponses() as mocked:
+        for path in ("query_balance", "query_positions?symbol=ETH_USDC"):
+            mocked.get(f"https://perps.standx.com/api/{path}", status=401)
+            mocked.get(f"https://perps.standx.com/api/{path}", payload={})
+
+        async with StandXHTTPClient(config, jwt_token="expired_token") as client:
+            login = AsyncMock(side_effect=obtain_jwt)
+            with patch.object(client, "_obtain_jwt", login):
+                await asyncio.gather(client.get_balance(), client.get_position("ETH_USDC"))
+
+    login.assert_awaited_once()
+    assert client.jwt_token == "fresh_token"
+
+
+@pytest.mark.asyncio
+async def test_401_after_relogin_is_raised(config: Settings) -> None:
+    """再ログイン後も401の場合は再送を繰り返さずにエラーになることを確認."""
+    url = "https://perps.standx.com/api/query_balance"
+    with aioresponses() as mocked:
+        mocked.get(url, status=401, repeat=True)
+
+        async with StandXHTTPClient(config, jwt_token="expired_token") as client:
+            with (
+                patch.object(client, "_obtain_jwt", AsyncMock(return_value="fresh_token")),
+                pytest.raises(AuthenticationError, match="JWT expired or invalid"),
+            ):
+                await client.get_balance()
+
+        assert len(mocked.requests[("GET", URL(url))]) == 2
+
+
+def test_is_stale_signature() -> None:
+    """署名の期限切れ・時刻ずれの拒否のみ署名し直す対象になることを確認."""
+
+    def rejection(status: int, message: str) -> APIError:
+        body = json.dumps({"code": status, "message": message})
+        return APIError(f"HTTP {status}: {body}", status=status)
+
+    assert is_stale_signature(rejection(400, "request timestamp expired"))
+    assert is_stale_signature(rejection(403, "invalid signature"))
+    assert is_stale_signature(APIError("HTTP 400: stale timestamp", status=400))
+    assert not is_stale_signature(rejection(400, "order not found: 123"))
+    assert not is_stale_signature(rejection(400, "order already filled: 123"))
+    assert not is_stale_signature(rejection(500, "signature service invalid"))
+    assert not is_stale_signature(NetworkError("Network error: timestamp"))
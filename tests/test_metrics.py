@@ -0,0 +1,137 @@
+"""metrics.pyのテスト."""
+
+import asyncio
+
+import pytest
+
+from standx_mm_bot.client import StandXHTTPClient
+from standx_mm_bot.client.metrics import LatencyHistogram, RequestMetrics, status_class
+from standx_mm_bot.config import Settings
+from standx_mm_bot.mock_exchange import MockExchange, MockExchangeConfig
+
+
+def test_empty_histogram() -> None:
+    """記録がない場合はパーセンタイルが0になることを確認."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    assert histogram.snapshot()["count"] == 0
+
+
+def test_percentiles_within_relative_error() -> None:
+    """パーセンタイルが約3%の相対誤差で求まることを確認."""
+    histogram = LatencyHistogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.500, rel=0.04)
+    assert histogram.percentile(99) == pytest.approx(0.990, rel=0.04)
+    assert histogram.percentile(100) == pytest.approx(1.0)
+    assert histogram.snapshot()["min_ms"] == pytest.approx(1.0)
+    assert histogram.snapshot()["max_ms"] == pytest.approx(1000.0)
+
+
+def test_small_values_are_exact() -> None:
+    """サブバケット数未満のマイクロ秒値は正確に記録されることを確認."""
+    histogram = LatencyHistogram()
+    for us in (3, 7, 11):
+        histogram.record(us / 1_000_000)
+    assert histogram.percentile(50) == pytest.approx(7e-6)
+
+
+def test_merge() -> None:
+    """ヒストグラムの合算を確認."""
+    a = LatencyHistogram()
+    b = LatencyHistogram()
+    a.record(0.001)
+    b.record(0.100)
+
+    merged = LatencyHistogram()
+    merged.merge([a, b])
+
+    assert merged.count == 2
+    assert merged.min_us == 1000
+    assert merged.max_us == 100_000
+
+
+def test_status_class() -> None:
+    """ステータス分類を確認."""
+    assert status_class(200) == "2xx"
+    assert status_class(429) == "429"
+    assert status_class(503) == "5xx"
+    assert status_class(None) == "network"
+
+
+def test_request_metrics_snapshot_and_summary() -> None:
+    """エンドポイント・フェーズ別の集計とサマリーを確認."""
+    metrics = RequestMetrics()
+    metrics.observe_sign("/api/new_order", 0.00006)
+    metrics.observe_queue("/api/new_order", 0.0)
+    metrics.observe_network("/api/new_order", 200, 0.020)
+    metrics.observe_network("/api/new_order", 503, 0.050)
+
+    snapshot = metrics.snapshot()["/api/new_order"]
+    assert snapshot["sign"]["count"] == 1
+    assert snapshot["network"]["2xx"]["count"] == 1
+    assert snapshot["network"]["5xx"]["count"] == 1
+    assert metrics.network_histogram("/api/new_order").count == 2
+
+    summary = metrics.format_summary()
+    assert summary.startswith("/api/new_order: n=2")
+    assert "errors=1" in summary
+
+
+def test_phase_snapshot_and_summary() -> None:
+    """接続フェーズの集計とサマリーを確認."""
+    metrics = RequestMetrics()
+    metrics.observe_network("/api/new_order", 200, 0.030)
+    metrics.observe_phase("/api/new_order", "pool", 0.012)
+    metrics.observe_phase("/api/new_order", "connect", 0.008)
+    metrics.observe_phase("/api/new_order", "ttfb", 0.015)
+    metrics.observe_reused_connection("/api/new_order")
+    metrics.observe_phase("/", "connect", 0.009)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["/api/new_order"]["phases"]["pool"]["count"] == 1
+    assert snapshot["/api/new_order"]["connections"] == {"new": 1, "reused": 1}
+    assert snapshot["/"]["connections"] == {"new": 1, "reused": 0}
+
+    lines = metrics.format_summary().splitlines()
+    assert lines[0] == "/: n=0 connect p99=9.0ms new_conn=1"
+    assert "pool p99=12.0ms connect p99=8.0ms ttfb p99=15.0ms new_conn=1" in lines[1]
+    assert "dns" not in lines[1]
+
+
+@pytest.mark.asyncio
+async def test_trace_phases_recorded() -> None:
+    """トレースフックでプール待ち・接続・TTFBが記録されることを確認."""
+    async with MockExchange(MockExchangeConfig(ticks_per_second=0, latency_ms=20)) as exchange:
+        config = Settings(
+            _env_file=None,
+            standx_private_key="0x" + "a" * 64,
+            standx_wallet_address="0x1234567890abcdef",
+            standx_chain="bsc",
+            standx_request_signing_key="0x" + "c" * 64,
+            standx_api_url=exchange.base_url,
+            jwt_cache_path=None,
+            http_warmup_connections=0,
+            http_metrics_log_seconds=0,
+            http_pool_size=1,
+            http_trace_phases=True,
+        )
+        async with StandXHTTPClient(config, jwt_token="jwt") as client:
+            await asyncio.gather(
+                *(client.new_order("ETH-USD", "buy", 2900.0 + i, 0.1) for i in range(3))
+            )
+
+    phases = client.request_metrics.snapshot()["/api/new_order"]["phases"]
+    assert phases["pool"]["count"] == 3
+    # 接続1本を順番に使うため、後続のリクエストはプールの空きを待つ
+    assert phases["pool"]["max_ms"] >= 15
+    assert phases["connect"]["count"] == 1
+    assert phases["ttfb"]["count"] == 3
+    assert phases["ttfb"]["min_ms"] >= 15
+    assert client.request_metrics.snapshot()["/api/new_order"]["connections"] == {
+        "new": 1,
+        "reused": 2,
+    }
@@ -0,0 +1,211 @@
+"""モック取引所のテスト."""
+
+import asyncio
+import contextlib
+from typing import Any
+
+import pytest
+
+from standx_mm_bot.client import APIError, RateLimitError, StandXHTTPClient, StandXWebSocketClient
+from standx_mm_bot.config import Settings
+from standx_mm_bot.core.order import OrderManager
+from standx_mm_bot.mock_exchange import (
+    MatchingEngine,
+    MockExchange,
+    MockExchangeConfig,
+    OrderRejected,
+    PriceProcess,
+)
+from standx_mm_bot.models import Side
+
+
+def limit_order(side: str, price: float, **extra: Any) -> dict[str, Any]:
+    """new_order ボディを生成."""
+    return {
+        "symbol": "ETH-USD",
+        "side": side,
+        "order_type": "limit",
+        "qty": "0.1",
+        "price": str(price),
+        "time_in_force": "alo",
+        "reduce_only": False,
+        **extra,
+    }
+
+
+def client_config(exchange: MockExchange, **overrides: Any) -> Settings:
+    """モック取引所に接続する設定を生成."""
+    return Settings(
+        _env_file=None,
+        standx_private_key="0x" + "a" * 64,
+        standx_wallet_address="0x1234567890abcdef",
+        standx_chain="bsc",
+        standx_request_signing_key="0x" + "c" * 64,
+        standx_api_url=exchange.base_url,
+        standx_auth_url=exchange.base_url,
+        standx_ws_url=exchange.ws_url,
+        symbol="ETH-USD",
+        jwt_cache_path=None,
+        http_warmup_connections=0,
+        http_metrics_log_seconds=0,
+        **overrides,
+    )
+
+
+def test_price_process_is_reproducible() -> None:
+    """同じシードなら同じ価格系列になることを確認."""
+    a = PriceProcess(3000.0, volatility_bps=2.0, seed=42)
+    b = PriceProcess(3000.0, volatility_bps=2.0, seed=42)
+
+    assert [a.next() for _ in range(100)] == [b.next() for _ in range(100)]
+
+
+def test_alo_order_rejected_when_crossing() -> None:
+    """マーク価格を跨ぐALO注文が拒否されることを確認."""
+    engine = MatchingEngine({"ETH-USD": 3000.0})
+
+    with pytest.raises(OrderRejected, match="post-only"):
+        engine.place(limit_order("buy", 3001.0))
+
+    order, events = engine.place(limit_order("buy", 2999.0))
+    assert order.status == "OPEN"
+    assert events == [("order", order.to_dict())]
+
+
+def test_resting_order_fills_when_mark_crosses() -> None:
+    """マーク価格が指値を跨ぐと約定してポジションが建つことを確認."""
+    engine = MatchingEngine({"ETH-USD": 3000.0}, initial_balance=1000.0)
+    order, _ = engine.place(limit_order("buy", 2990.0))
+
+    assert engine.update_mark("ETH-USD", 2995.0) == []
+    events = engine.update_mark("ETH-USD", 2989.0)
+
+    assert [channel for channel, _ in events] == ["order", "trade"]
+    assert order.status == "FILLED"
+    assert engine.position_dicts("ETH-USD") == [
+        {"symbol": "ETH-USD", "qty": "0.1", "entry_price": "2990.0", "upnl": "-0.1"}
+    ]
+
+    # 反対売買で決済すると実現損益が残高に反映される
+    engine.place(limit_order("sell", 3000.0, time_in_force="gtc", order_type="market"))
+    assert engine.position_dicts("ETH-USD") == []
+    assert engine.balance == pytest.approx(1000.0 - 0.1)
+
+
+def test_cancel_and_duplicate_client_id() -> None:
+    """キャンセル・重複したクライアント注文IDの拒否を確認."""
+    engine = MatchingEngine({"ETH-USD": 3000.0})
+    order, _ = engine.place(limit_order("sell", 3010.0, cl_ord_id="mm1"))
+
+    with pytest.raises(OrderRejected, match="duplicate"):
+        engine.place(limit_order("sell", 3010.0, cl_ord_id="mm1"))
+
+    cancelled, _ = engine.cancel(cl_ord_id="mm1")
+    assert cancelled is order
+    assert order.status == "CANCELED"
+    with pytest.raises(OrderRejected, match="already canceled"):
+        engine.cancel(order.order_id)
+    with pytest.raises(OrderRejected, match="not found"):
+        engine.cancel("999")
+
+
+@pytest.mark.asyncio
+async def test_http_client_round_trip() -> None:
+    """ログイン・発注・照会・キャンセルがモック取引所で動作することを確認."""
+    async with MockExchange(MockExchangeConfig(ticks_per_second=0)) as exchange:
+        async with StandXHTTPClient(client_config(exchange)) as client:
+            response = await client.new_order("ETH-USD", "buy", 2990.0, 0.1, time_in_force="alo")
+            orders = await client.fetch_open_orders("ETH-USD")
+            assert [(o.side, o.price, o.client_order_id) for o in orders] == [
+                (Side.BUY, 2990.0, response["cl_ord_id"])
+            ]
+
+            await client.cancel_order(response["cl_ord_id"], "ETH-USD")
+            assert await client.fetch_open_orders("ETH-USD") == []
+
+            with pytest.raises(APIError, match="post-only"):
+                await client.new_order("ETH-USD", "sell", 2990.0, 0.1, time_in_force="alo")
+
+        assert exchange.snapshot()["requests"] == 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_and_error_injection() -> None:
+    """レート制限 (429) とエラー注入 (5xx) を確認."""
+    config = MockExchangeConfig(ticks_per_second=0, rate_limit_per_second=1, rate_limit_burst=1)
+    async with MockExchange(config) as exchange:
+        async with StandXHTTPClient(
+            client_config(exchange, retry_max_attempts=1), jwt_token="jwt"
+        ) as client:
+            await client.get_balance()
+            with pytest.raises(RateLimitError):
+                await client.get_position("ETH-USD")
+        assert exchange.rate_limited == 1
+
+    config = MockExchangeConfig(ticks_per_second=0, error_rate=1.0)
+    async with MockExchange(config) as exchange:
+        async with StandXHTTPClient(
+            client_config(exchange, retry_max_attempts=1), jwt_token="jwt"
+        ) as client:
+            with pytest.raises(APIError, match="HTTP 500"):
+                await client.get_balance()
+        assert exchange.injected_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_websocket_stream() -> None:
+    """価格の配信と約定イベントがWebSocketクライアントに届くことを確認."""
+    async with MockExchange(MockExchangeConfig(ticks_per_second=0)) as exchange:
+        ws = StandXWebSocketClient(client_config(exchange))
+        prices: list[dict[str, Any]] = []
+        trades: list[dict[str, Any]] = []
+        filled = asyncio.Event()
+
+        async def on_price(data: dict[str, Any]) -> None:
+            prices.append(data)
+
+        async def on_trade(data: dict[str, Any]) -> None:
+            trades.append(data)
+            filled.set()
+
+        ws.on_price_update(on_price)
+        ws.on_trade(on_trade)
+        task = asyncio.create_task(ws.connect())
+        try:
+            # 購読が完了するまで待つ
+            while not any(len(c) == 3 for c in exchange._subscribers.values()):
+                await asyncio.sleep(0.01)
+
+            exchange.engine.place(limit_order("sell", 3010.0))
+            await exchange.set_mark_price("ETH-USD", 3011.0)
+            await asyncio.wait_for(filled.wait(), timeout=2.0)
+        finally:
+            await ws.disconnect()
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    assert prices[-1]["mark_price"] == "3011.00"
+    assert trades[0]["side"] == "sell"
+    assert trades[0]["price"] == "3010.0"
+
+
+@pytest.mark.parametrize("bulk_cancel", [True, False])
+@pytest.mark.asyncio
+async def test_cancel_all_flattens_book(bulk_cancel: bool) -> None:
+    """cancel_all で未決注文がすべてキャンセルされることを確認（一括APIの有無とも）."""
+    config = MockExchangeConfig(ticks_per_second=0, bulk_cancel=bulk_cancel)
+    async with MockExchange(config) as exchange:
+        async with StandXHTTPClient(client_config(exchange), jwt_token="jwt") as client:
+            manager = OrderManager(client, client.config)
+            await manager.place_quotes([(Side.BUY, 2990.0 - i, 0.1) for i in range(4)])
+            requests_before = exchange.requests
+
+            results = await manager.cancel_all()
+
+            assert len(results) == 4
+            assert all(result.ok for result in results)
+            assert await client.fetch_open_orders("ETH-USD") == []
+
+        # 照会1回 + 一括キャンセル1回（非対応なら 404 の1回 + 注文ごとの4回）
+        assert exchange.requests - requests_before == (2 if bulk_cancel else 6) + 1
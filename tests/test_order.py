@@ -1,14 +1,17 @@
 """注文管理モジュールのテスト."""
 
 import asyncio
+import logging
+from typing import Any
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
-from standx_mm_bot.client import StandXHTTPClient
+from standx_mm_bot.client import APIError, StandXHTTPClient
+from standx_mm_bot.client.http import PreparedRequest
 from standx_mm_bot.config import Settings
 from standx_mm_bot.core.order import OrderManager
-from standx_mm_bot.models import OrderStatus, Side
+from standx_mm_bot.models import Balance, CancelResult, OrderStatus, Side
 
 
 @pytest.fixture
@@ -92,6 +95,23 @@ class TestPlaceOrder:
         assert order.side == Side.SELL
         assert order.status == OrderStatus.OPEN  # デフォルト
 
+    @pytest.mark.asyncio
+    async def test_place_order_with_client_order_id(
+        self, mock_client: Mock, config: Settings
+    ) -> None:
+        """order_idがない場合はクライアント注文IDで追跡されることを確認."""
+        mock_client.new_order.return_value = {
+            "code": 0,
+            "request_id": "req456",
+            "cl_ord_id": "mm_client_1",
+        }
+
+        order_mgr = OrderManager(mock_client, config)
+        order = await order_mgr.place_order(side=Side.BUY, price=3500.0, size=0.001)
+
+        assert order.id == "mm_client_1"
+        assert order.client_order_id == "mm_client_1"
+
 
 class TestCancelOrder:
     """cancel_order のテスト."""
@@ -111,6 +131,57 @@ class TestCancelOrder:
         )
 
 
+class TestCancelOrders:
+    """cancel_orders / cancel_all のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_orders_drops_presigned_cancels(
+        self, mock_client: Mock, config: Settings
+    ) -> None:
+        """まとめてキャンセルした注文の署名済みキャンセルが破棄されることを確認."""
+        config.cancel_presign_enabled = True
+        mock_client.new_order.side_effect = [
+            {"order_id": "a", "status": "OPEN"},
+            {"order_id": "b", "status": "OPEN"},
+        ]
+        mock_client.prepare_cancel_order = Mock(return_value=Mock(spec=PreparedRequest))
+        mock_client.cancel_orders = AsyncMock(
+            return_value=[CancelResult("a"), CancelResult("b", error=APIError("boom"))]
+        )
+
+        order_mgr = OrderManager(mock_client, config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+        await order_mgr.place_order(Side.SELL, 3510.0, 0.001)
+        results = await order_mgr.cancel_orders(["a", "b"])
+
+        mock_client.cancel_orders.assert_awaited_once_with(["a", "b"], "ETH-USD")
+        assert [r.ok for r in results] == [True, False]
+        assert order_mgr._cancel_envelopes == {}
+
+    @pytest.mark.asyncio
+    async def test_cancel_all_holds_lock_once(self, mock_client: Mock, config: Settings) -> None:
+        """cancel_all の間は他の注文操作が待たされることを確認."""
+        calls: list[str] = []
+
+        async def cancel_all(symbol: str) -> list[CancelResult]:
+            calls.append(f"cancel_all:{symbol}")
+            await asyncio.sleep(0.01)
+            calls.append("cancel_all:done")
+            return [CancelResult("a")]
+
+        async def new_order(**_kwargs: Any) -> dict[str, str]:
+            calls.append("new_order")
+            return {"order_id": "c", "status": "OPEN"}
+
+        mock_client.cancel_all = AsyncMock(side_effect=cancel_all)
+        mock_client.new_order.side_effect = new_order
+
+        order_mgr = OrderManager(mock_client, config)
+        await asyncio.gather(order_mgr.cancel_all(), order_mgr.place_order(Side.BUY, 3500.0, 0.001))
+
+        assert calls == ["cancel_all:ETH-USD", "cancel_all:done", "new_order"]
+
+
 class TestRepositionOrder:
     """reposition_order のテスト."""
 
@@ -201,6 +272,133 @@ class TestRepositionOrder:
         assert mock_client.cancel_order.call_count == 0
 
 
+class TestAdaptiveReposition:
+    """adaptive 戦略の再配置のテスト."""
+
+    @staticmethod
+    def adaptive_client(mock_client: Mock, available: float, place_delay: float) -> Mock:
+        """発注に place_delay 秒かかり、利用可能額が available のクライアント."""
+
+        async def new_order(**kwargs: Any) -> dict[str, Any]:
+            await asyncio.sleep(place_delay)
+            return {"order_id": f"order{kwargs['price']}", "status": "OPEN"}
+
+        mock_client.new_order.side_effect = new_order
+        mock_client.cancel_order.return_value = {"status": "CANCELLED"}
+        mock_client.fetch_balance = AsyncMock(
+            return_value=Balance(balance=available, equity=available, available=available)
+        )
+        return mock_client
+
+    @staticmethod
+    def call_names(mock_client: Mock) -> list[str]:
+        """発注・キャンセルの呼び出し順."""
+        return [c[0] for c in mock_client.method_calls if c[0] in ("new_order", "cancel_order")]
+
+    @pytest.mark.asyncio
+    async def test_routine_with_headroom_places_first(
+        self, mock_client: Mock, config: Settings
+    ) -> None:
+        """証拠金に余裕がある通常の再配置は発注先行になることを確認."""
+        config.order_update_strategy = "adaptive"
+        client = self.adaptive_client(mock_client, available=100.0, place_delay=0)
+        order_mgr = OrderManager(client, config)
+        await order_mgr.refresh_balance()
+
+        await order_mgr.reposition_order("old", 3500.0, Side.BUY, 0.001)
+
+        assert self.call_names(client) == ["new_order", "cancel_order"]
+        decision = order_mgr.last_reposition_decision
+        assert decision is not None
+        assert decision.strategy == "place_first"
+        assert decision.inputs.available == 100.0
+        assert decision.inputs.required_margin == pytest.approx(3.5)
+
+    @pytest.mark.asyncio
+    async def test_unknown_then_insufficient_balance(
+        self, mock_client: Mock, config: Settings
+    ) -> None:
+        """残高が未取得なら発注先行、不足が分かればキャンセル優先になることを確認."""
+        client = self.adaptive_client(mock_client, available=1.0, place_delay=0)
+        order_mgr = OrderManager(client, config)
+
+        # 未取得: 判断は待たずに発注先行、残高はバックグラウンドで取得
+        await order_mgr.reposition_order("old1", 3500.0, Side.BUY, 0.001, strategy="adaptive")
+        assert order_mgr.last_reposition_decision is not None
+        assert order_mgr.last_reposition_decision.reason == (
+            "routine reposition with balance unknown"
+        )
+        await asyncio.sleep(0)
+        client.fetch_balance.assert_awaited_once()
+
+        # 取得済み: 3.5 (= 3500 * 0.001) に対して 1.0 しかない
+        await order_mgr.reposition_order("old2", 3500.0, Side.BUY, 0.001, strategy="adaptive")
+        assert order_mgr.last_reposition_decision.reason == "insufficient margin headroom"
+        assert self.call_names(client) == ["new_order", "cancel_order", "cancel_order", "new_order"]
+
+    @pytest.mark.asyncio
+    async def test_start_fetches_balance_and_close_cancels(
+        self, mock_client: Mock, config: Settings
+    ) -> None:
+        """adaptive では start() で残高の取得を始め、close() で止めることを確認."""
+        config.order_update_strategy = "adaptive"
+        client = self.adaptive_client(mock_client, available=100.0, place_delay=0)
+        fetched = asyncio.Event()
+
+        async def slow_balance() -> Balance:
+            fetched.set()
+            await asyncio.sleep(10)
+            raise AssertionError("not cancelled")
+
+        client.fetch_balance = AsyncMock(side_effect=slow_balance)
+
+        async with OrderManager(client, config) as order_mgr:
+            await asyncio.wait_for(fetched.wait(), timeout=1.0)
+            task = order_mgr._balance_task
+            assert task is not None
+
+        assert task.cancelled()
+        assert order_mgr._balance_task is None
+
+    @pytest.mark.asyncio
+    async def test_escape_uses_latency_budget(
+        self, mock_client: Mock, config: Settings, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """約定回避では旧注文が板に残る時間が予算を超えるとキャンセル優先になることを確認."""
+        client = self.adaptive_client(mock_client, available=100.0, place_delay=0.02)
+        order_mgr = OrderManager(client, config)
+        await order_mgr.refresh_balance()
+
+        # サンプルがない間はキャンセル優先
+        await order_mgr.reposition_order(
+            "old0", 3500.0, Side.BUY, 0.001, strategy="adaptive", escape=True
+        )
+        assert order_mgr.last_reposition_decision is not None
+        assert order_mgr.last_reposition_decision.reason == "escape without latency samples"
+
+        for i in range(5):
+            await order_mgr.place_order(Side.BUY, 3400.0 + i, 0.001)
+            await order_mgr.cancel_order(f"order{3400.0 + i}")
+
+        config.adaptive_escape_budget_ms = 5.0
+        client.reset_mock()
+        with caplog.at_level(logging.INFO, logger="standx_mm_bot.core.order"):
+            await order_mgr.reposition_order(
+                "old1", 3500.0, Side.BUY, 0.001, strategy="adaptive", escape=True
+            )
+        assert self.call_names(client) == ["cancel_order", "new_order"]
+        assert "Reposition strategy: cancel_first (escape exposure" in caplog.text
+        assert "escape=True, place=" in caplog.text
+
+        config.adaptive_escape_budget_ms = 500.0
+        client.reset_mock()
+        await order_mgr.reposition_order(
+            "old2", 3500.0, Side.BUY, 0.001, strategy="adaptive", escape=True
+        )
+        assert self.call_names(client) == ["new_order", "cancel_order"]
+        assert order_mgr.last_reposition_decision.strategy == "place_first"
+
+
 class TestConcurrency:
     """並行処理のテスト."""
 
@@ -240,6 +438,238 @@ class TestConcurrency:
         ]
 
 
+class TestPlaceQuotes:
+    """place_quotes のテスト."""
+
+    @pytest.mark.asyncio
+    async def test_quotes_are_placed_concurrently(
+        self, mock_client: Mock, config: Settings
+    ) -> None:
+        """両側の発注が同時に送信されることを確認."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def new_order(**kwargs: object) -> dict[str, str]:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"order_id": f"{kwargs['side']}_1", "status": "OPEN"}
+
+        mock_client.new_order.side_effect = new_order
+
+        order_mgr = OrderManager(mock_client, config)
+        results = await order_mgr.place_quotes(
+            [(Side.BUY, 3490.0, 0.001), (Side.SELL, 3510.0, 0.001)]
+        )
+
+        assert max_in_flight == 2
+        assert [r.side for r in results] == [Side.BUY, Side.SELL]
+        assert all(r.ok for r in results)
+        assert results[0].order is not None and results[0].order.id == "buy_1"
+        assert results[1].order is not None and results[1].order.id == "sell_1"
+
+    @pytest.mark.asyncio
+    async def test_partial_failure(self, mock_client: Mock, config: Settings) -> None:
+        """片側の失敗が結果に記録され、もう片側は発注されることを確認."""
+
+        async def new_order(**kwargs: object) -> dict[str, str]:
+            if kwargs["side"] == "sell":
+                raise APIError("HTTP 400: insufficient margin", status=400)
+            return {"order_id": "buy_1", "status": "OPEN"}
+
+        mock_client.new_order.side_effect = new_order
+
+        order_mgr = OrderManager(mock_client, config)
+        buy, sell = await order_mgr.place_quotes(
+            [(Side.BUY, 3490.0, 0.001), (Side.SELL, 3510.0, 0.001)]
+        )
+
+        assert buy.ok and buy.error is None
+        assert not sell.ok
+        assert isinstance(sell.error, APIError)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, mock_client: Mock, config: Settings) -> None:
+        """同時発注数が quote_max_concurrency 以下に制限されることを確認."""
+        config.quote_max_concurrency = 2
+        in_flight = 0
+        max_in_flight = 0
+
+        async def new_order(**kwargs: object) -> dict[str, str]:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"order_id": f"{kwargs['side']}_{kwargs['price']}", "status": "OPEN"}
+
+        mock_client.new_order.side_effect = new_order
+
+        order_mgr = OrderManager(mock_client, config)
+        quotes = [(Side.BUY, 3490.0 - i, 0.001) for i in range(3)]
+        quotes += [(Side.SELL, 3510.0 + i, 0.001) for i in range(3)]
+        results = await order_mgr.place_quotes(quotes)
+
+        assert max_in_flight == 2
+        assert len(results) == 6
+        assert mock_client.new_order.await_count == 6
+
+
+class TestPresignedCancel:
+    """署名済みキャンセルのテスト."""
+
+    @pytest.fixture
+    def presign_config(self, config: Settings) -> Settings:
+        config.cancel_presign_enabled = True
+        config.cancel_presign_refresh_seconds = 5.0
+        return config
+
+    @pytest.mark.asyncio
+    async def test_cancel_uses_envelope(self, mock_client: Mock, presign_config: Settings) -> None:
+        """発注時に作成した署名済みキャンセルがそのまま送信されることを確認."""
+        envelope = Mock(spec=PreparedRequest)
+        envelope.age.return_value = 0.1
+        mock_client.prepare_cancel_order = Mock(return_value=envelope)
+        mock_client.send_prepared = AsyncMock(return_value={})
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        order_mgr = OrderManager(mock_client, presign_config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+        await order_mgr.cancel_order("test123")
+
+        mock_client.prepare_cancel_order.assert_called_once_with("test123", "ETH-USD")
+        mock_client.send_prepared.assert_awaited_once_with(envelope)
+        mock_client.cancel_order.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stale_envelope_falls_back(
+        self, mock_client: Mock, presign_config: Settings
+    ) -> None:
+        """期限切れの署名済みキャンセルは使わず通常のキャンセルを送ることを確認."""
+        envelope = Mock(spec=PreparedRequest)
+        envelope.age.return_value = 60.0
+        mock_client.prepare_cancel_order = Mock(return_value=envelope)
+        mock_client.send_prepared = AsyncMock()
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        order_mgr = OrderManager(mock_client, presign_config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+        await order_mgr.cancel_order("test123")
+
+        mock_client.send_prepared.assert_not_called()
+        mock_client.cancel_order.assert_called_once_with(order_id="test123", symbol="ETH-USD")
+
+    @pytest.mark.asyncio
+    async def test_rejected_envelope_resigns(
+        self, mock_client: Mock, presign_config: Settings
+    ) -> None:
+        """署名済みキャンセルが拒否された場合は署名し直して送ることを確認."""
+        envelope = Mock(spec=PreparedRequest)
+        envelope.age.return_value = 0.1
+        mock_client.prepare_cancel_order = Mock(return_value=envelope)
+        mock_client.send_prepared = AsyncMock(
+            side_effect=APIError(
+                'HTTP 400: {"code": 400, "message": "request timestamp expired"}', status=400
+            )
+        )
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        order_mgr = OrderManager(mock_client, presign_config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+        await order_mgr.cancel_order("test123")
+
+        mock_client.cancel_order.assert_called_once_with(order_id="test123", symbol="ETH-USD")
+
+    @pytest.mark.asyncio
+    async def test_rejected_envelope_is_not_resent(
+        self, mock_client: Mock, presign_config: Settings
+    ) -> None:
+        """署名以外の理由（注文なし等）の拒否では署名し直して送り直さないことを確認."""
+        envelope = Mock(spec=PreparedRequest)
+        envelope.age.return_value = 0.1
+        mock_client.prepare_cancel_order = Mock(return_value=envelope)
+        rejection = APIError('HTTP 400: {"code": 400, "message": "order not found"}', status=400)
+        mock_client.send_prepared = AsyncMock(side_effect=rejection)
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        order_mgr = OrderManager(mock_client, presign_config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+        with pytest.raises(APIError, match="order not found"):
+            await order_mgr.cancel_order("test123")
+
+        mock_client.cancel_order.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_order_event_forgets_envelope(
+        self, mock_client: Mock, presign_config: Settings
+    ) -> None:
+        """約定・キャンセルのイベントで署名済みキャンセルが破棄されることを確認."""
+        mock_client.prepare_cancel_order = Mock(return_value=Mock(spec=PreparedRequest))
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        order_mgr = OrderManager(mock_client, presign_config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+        await order_mgr.handle_order_event({"order_id": "test123", "status": "PARTIALLY_FILLED"})
+        assert "test123" in order_mgr._cancel_envelopes
+
+        await order_mgr.handle_order_event({"order_id": "test123", "status": "FILLED"})
+        assert order_mgr._cancel_envelopes == {}
+
+    @pytest.mark.asyncio
+    async def test_context_manager_runs_refresh(
+        self, mock_client: Mock, presign_config: Settings
+    ) -> None:
+        """async with の間だけ定期再署名が動くことを確認."""
+        presign_config.cancel_presign_refresh_seconds = 0.02
+        old = Mock(spec=PreparedRequest)
+        old.age.return_value = 1.0
+        mock_client.prepare_cancel_order = Mock(return_value=old)
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        async with OrderManager(mock_client, presign_config) as order_mgr:
+            await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+            await asyncio.sleep(0.05)
+            task = order_mgr._refresh_task
+
+        assert mock_client.prepare_cancel_order.call_count >= 2
+        assert task is not None and task.cancelled()
+        assert order_mgr._refresh_task is None
+
+    @pytest.mark.asyncio
+    async def test_refresh_resigns_old_envelopes(
+        self, mock_client: Mock, presign_config: Settings
+    ) -> None:
+        """更新間隔を過ぎた署名済みキャンセルが再署名されることを確認."""
+        old = Mock(spec=PreparedRequest)
+        old.age.return_value = 6.0
+        fresh = Mock(spec=PreparedRequest)
+        fresh.age.return_value = 0.0
+        mock_client.prepare_cancel_order = Mock(side_effect=[old, fresh])
+        mock_client.send_prepared = AsyncMock(return_value={})
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        order_mgr = OrderManager(mock_client, presign_config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+        order_mgr.refresh_cancel_envelopes()
+        await order_mgr.cancel_order("test123")
+
+        assert mock_client.prepare_cancel_order.call_count == 2
+        mock_client.send_prepared.assert_awaited_once_with(fresh)
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, mock_client: Mock, config: Settings) -> None:
+        """デフォルトでは署名済みキャンセルを作成しないことを確認."""
+        mock_client.prepare_cancel_order = Mock()
+        mock_client.new_order.return_value = {"order_id": "test123", "status": "OPEN"}
+
+        order_mgr = OrderManager(mock_client, config)
+        await order_mgr.place_order(Side.BUY, 3500.0, 0.001)
+
+        mock_client.prepare_cancel_order.assert_not_called()
+
+
 # ========================================
 # 統合テスト（実API使用、手動実行）
 # ========================================
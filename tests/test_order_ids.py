@@ -0,0 +1,51 @@
+"""order_ids.pyのテスト."""
+
+from standx_mm_bot.client import APIError, NetworkError
+from standx_mm_bot.client.order_ids import (
+    ClientOrderIds,
+    is_client_order_id,
+    is_duplicate_order,
+)
+
+
+def test_new_ids_are_unique_and_recognized() -> None:
+    """生成したIDが一意で、クライアント注文IDとして判定されることを確認."""
+    ids = ClientOrderIds()
+    generated = {ids.new_id() for _ in range(1000)}
+
+    assert len(generated) == 1000
+    assert all(is_client_order_id(i) for i in generated)
+    assert not is_client_order_id("1234567890")
+    assert ClientOrderIds().new_id() not in generated
+
+
+def test_bind_exchange_id() -> None:
+    """取引所注文IDの対応付けを確認（未判明の再登録で上書きしない）."""
+    ids = ClientOrderIds()
+    client_id = ids.new_id()
+    assert client_id in ids
+    assert ids.exchange_id(client_id) is None
+
+    ids.bind(client_id, "order_1")
+    ids.bind(client_id)
+    assert ids.exchange_id(client_id) == "order_1"
+
+
+def test_capacity() -> None:
+    """古い対応付けから破棄されることを確認."""
+    ids = ClientOrderIds(capacity=2)
+    first = ids.new_id()
+    ids.new_id()
+    ids.new_id()
+
+    assert len(ids) == 2
+    assert first not in ids
+
+
+def test_is_duplicate_order() -> None:
+    """重複発注の拒否を判定できることを確認."""
+    assert is_duplicate_order(APIError("HTTP 400: duplicate cl_ord_id", status=400))
+    assert is_duplicate_order(APIError("HTTP 409: order already exists", status=409))
+    assert not is_duplicate_order(APIError("HTTP 400: invalid price", status=400))
+    assert not is_duplicate_order(APIError("HTTP 500: duplicate", status=500))
+    assert not is_duplicate_order(NetworkError("Network error: duplicate"))
@@ -0,0 +1,106 @@
+"""payload.pyのテスト."""
+
+import json
+
+import pytest
+
+from standx_mm_bot.client.payload import (
+    encode_body,
+    encode_cancel_order,
+    encode_cancel_order_by_client_id,
+    encode_cancel_orders,
+    encode_cancel_orders_by_client_id,
+    encode_new_order,
+)
+
+
+def _canonical(body: dict) -> bytes:
+    """従来の辞書 + json.dumps によるエンコード."""
+    return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+
+def test_encode_body() -> None:
+    """任意のボディが挿入順序を保持したコンパクトJSONになることを確認."""
+    body = {"b": 1, "a": "x", "c": True}
+
+    assert encode_body(body) == b'{"b":1,"a":"x","c":true}'
+
+
+@pytest.mark.parametrize(
+    ("side", "order_type", "size", "price", "time_in_force", "reduce_only"),
+    [
+        ("buy", "limit", 0.001, 3500.25, "alo", False),
+        ("SELL", "LIMIT", 0.1, 3500.0, "gtc", True),
+        ("Buy", "market", 1, 98765.4321, "ioc", False),
+        ("sell", "limit", 1e-05, 1e16, "alo", False),
+    ],
+)
+def test_encode_new_order_matches_dict_path(
+    side: str,
+    order_type: str,
+    size: float,
+    price: float,
+    time_in_force: str,
+    reduce_only: bool,
+) -> None:
+    """テンプレートによるnew_orderが従来の辞書パスと同一バイト列になることを確認."""
+    expected = _canonical(
+        {
+            "symbol": "ETH-USD",
+            "side": side.lower(),
+            "order_type": order_type.lower(),
+            "qty": str(size),
+            "price": str(price),
+            "time_in_force": time_in_force,
+            "reduce_only": reduce_only,
+        }
+    )
+
+    payload = encode_new_order("ETH-USD", side, order_type, size, price, time_in_force, reduce_only)
+
+    assert payload == expected
+    assert json.loads(payload)["side"] == side.lower()
+
+
+def test_encode_new_order_escapes_symbol() -> None:
+    """シンボルがJSONとして正しくエスケープされることを確認."""
+    payload = encode_new_order('A"B', "buy", "limit", 1.0, 2.0, "gtc", False)
+
+    assert json.loads(payload)["symbol"] == 'A"B'
+
+
+def test_encode_cancel_order_matches_dict_path() -> None:
+    """テンプレートによるcancel_orderが従来の辞書パスと同一バイト列になることを確認."""
+    payload = encode_cancel_order("order_123", "ETH-USD")
+
+    assert payload == _canonical({"order_id": "order_123", "symbol": "ETH-USD"})
+
+
+def test_encode_new_order_with_client_order_id() -> None:
+    """クライアント注文IDが末尾に追加されることを確認."""
+    encoded = encode_new_order("ETH-USD", "buy", "limit", 0.1, 3500.0, "alo", False, "mm_1")
+    assert encoded == encode_body(
+        {
+            "symbol": "ETH-USD",
+            "side": "buy",
+            "order_type": "limit",
+            "qty": "0.1",
+            "price": "3500.0",
+            "time_in_force": "alo",
+            "reduce_only": False,
+            "cl_ord_id": "mm_1",
+        }
+    )
+
+
+def test_encode_cancel_order_by_client_id() -> None:
+    """クライアント注文ID指定のキャンセルボディを確認."""
+    assert encode_cancel_order_by_client_id("mm_1", "ETH-USD") == encode_body(
+        {"cl_ord_id": "mm_1", "symbol": "ETH-USD"}
+    )
+
+
+def test_encode_cancel_orders() -> None:
+    """一括キャンセルのボディを確認."""
+    assert encode_cancel_orders(("1", "2")) == b'{"order_id_list":["1","2"]}'
+    assert encode_cancel_orders_by_client_id(["mm_1"]) == b'{"cl_ord_id_list":["mm_1"]}'
@@ -0,0 +1,137 @@
+"""ratelimit.pyのテスト."""
+
+import asyncio
+import time
+
+import pytest
+
+from standx_mm_bot.client.ratelimit import Priority, PriorityRateLimiter, priority_for_path
+
+
+def test_priority_for_path() -> None:
+    """パスから優先度が判定されることを確認."""
+    assert priority_for_path("/api/cancel_order") == Priority.CANCEL
+    assert priority_for_path("/api/new_order") == Priority.PLACE
+    assert priority_for_path("/api/query_open_orders?symbol=ETH-USD") == Priority.QUERY
+
+
+@pytest.mark.asyncio
+async def test_acquire_within_burst_does_not_wait() -> None:
+    """バースト内のリクエストは待機しないことを確認."""
+    limiter = PriorityRateLimiter(rate=10, burst=5)
+
+    waits = [await limiter.acquire() for _ in range(5)]
+
+    assert waits == [0.0] * 5
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_refill() -> None:
+    """トークン切れ時は補充まで待機することを確認."""
+    limiter = PriorityRateLimiter(rate=50, burst=1)
+    await limiter.acquire()
+
+    start = time.monotonic()
+    await limiter.acquire()
+
+    assert time.monotonic() - start >= 0.015
+
+
+@pytest.mark.asyncio
+async def test_strict_priority_order() -> None:
+    """待機中のリクエストはキャンセル > 発注 > 照会の順に処理されることを確認."""
+    limiter = PriorityRateLimiter(rate=200, burst=1)
+    await limiter.acquire()
+    order: list[Priority] = []
+
+    async def request(priority: Priority) -> None:
+        await limiter.acquire(priority)
+        order.append(priority)
+
+    # 照会 → 発注 → キャンセルの順に到着
+    tasks = [asyncio.create_task(request(p)) for p in (Priority.QUERY, Priority.PLACE)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request(Priority.CANCEL)))
+    await asyncio.gather(*tasks)
+
+    assert order == [Priority.CANCEL, Priority.PLACE, Priority.QUERY]
+
+
+@pytest.mark.asyncio
+async def test_cancel_reserve() -> None:
+    """キャンセル用の予約枠は発注・照会に使われないことを確認."""
+    limiter = PriorityRateLimiter(rate=0.001, burst=3, cancel_reserve=2)
+
+    assert await limiter.acquire(Priority.QUERY) == 0.0
+    # 残り2トークンは予約枠: キャンセルは即座に通る
+    assert await limiter.acquire(Priority.CANCEL) == 0.0
+    assert await limiter.acquire(Priority.CANCEL) == 0.0
+
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(limiter.acquire(Priority.PLACE), timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_block_others() -> None:
+    """待機中にキャンセルされたリクエストが後続を妨げないことを確認."""
+    limiter = PriorityRateLimiter(rate=100, burst=1)
+    await limiter.acquire()
+
+    waiter = asyncio.create_task(limiter.acquire(Priority.CANCEL))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    await asyncio.wait_for(limiter.acquire(Priority.QUERY), timeout=1.0)
+
+
+@pytest.mark.asyncio
+async def test_penalize_blocks_all() -> None:
+    """429受信後はRetry-Afterの間、全優先度が待機することを確認."""
+    limiter = PriorityRateLimiter(rate=1000, burst=10)
+
+    limiter.penalize(0.05)
+    start = time.monotonic()
+    await limiter.acquire(Priority.CANCEL)
+
+    assert time.monotonic() - start >= 0.04
+    assert limiter.snapshot()["rate_limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_update_from_headers() -> None:
+    """レート制限ヘッダーで残りトークンと待機時間が補正されることを確認."""
+    limiter = PriorityRateLimiter(rate=1000, burst=10)
+
+    limiter.update_from_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.05"})
+    start = time.monotonic()
+    await limiter.acquire(Priority.CANCEL)
+
+    assert time.monotonic() - start >= 0.04
+
+
+def test_update_from_headers_ignores_invalid() -> None:
+    """不正なヘッダー値は無視されることを確認."""
+    limiter = PriorityRateLimiter(rate=10, burst=10)
+
+    limiter.update_from_headers({"X-RateLimit-Remaining": "abc", "Retry-After": "soon"})
+
+    assert limiter.snapshot()["tokens"] == pytest.approx(10)
+
+
+@pytest.mark.asyncio
+async def test_snapshot_counts() -> None:
+    """優先度別の取得数・待機数が記録されることを確認."""
+    limiter = PriorityRateLimiter(rate=500, burst=1)
+    await limiter.acquire(Priority.PLACE)
+    await limiter.acquire(Priority.CANCEL)
+
+    snapshot = limiter.snapshot()
+
+    assert snapshot["place"] == {
+        "acquired": 1,
+        "delayed": 0,
+        "waiting": 0,
+        "wait_seconds": 0.0,
+    }
+    assert snapshot["cancel"]["acquired"] == 1  # type: ignore[index]
+    assert snapshot["cancel"]["delayed"] == 1  # type: ignore[index]
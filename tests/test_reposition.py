@@ -0,0 +1,69 @@
+"""再配置戦略の選択のテスト."""
+
+from standx_mm_bot.core.reposition import RepositionInputs, choose_reposition_strategy
+
+
+def inputs(
+    escape: bool = False,
+    place: float | None = 0.03,
+    cancel: float | None = 0.02,
+    available: float | None = 100.0,
+) -> RepositionInputs:
+    """テスト用の入力（必要証拠金は3.5）."""
+    return RepositionInputs(escape, place, cancel, available, required_margin=3.5)
+
+
+class TestChooseRepositionStrategy:
+    """choose_reposition_strategy のテスト."""
+
+    def test_routine_with_headroom(self) -> None:
+        """証拠金に余裕がある通常の再配置は発注先行."""
+        decision = choose_reposition_strategy(inputs(), escape_budget=0.01)
+        assert decision.strategy == "place_first"
+
+    def test_routine_ignores_latency(self) -> None:
+        """通常の再配置はレイテンシに関わらず発注先行（空白時間ゼロ）."""
+        decision = choose_reposition_strategy(inputs(place=1.0, cancel=None), escape_budget=0.01)
+        assert decision.strategy == "place_first"
+
+    def test_insufficient_headroom(self) -> None:
+        """利用可能額が必要証拠金未満ならキャンセル優先."""
+        decision = choose_reposition_strategy(inputs(available=3.0), escape_budget=1.0)
+        assert decision.strategy == "cancel_first"
+        assert decision.reason == "insufficient margin headroom"
+
+    def test_unknown_balance(self) -> None:
+        """残高が未取得でも通常の再配置は発注先行、約定回避はキャンセル優先."""
+        decision = choose_reposition_strategy(inputs(available=None), escape_budget=1.0)
+        assert decision.strategy == "place_first"
+        assert decision.reason == "routine reposition with balance unknown"
+
+        decision = choose_reposition_strategy(
+            inputs(escape=True, available=None), escape_budget=1.0
+        )
+        assert decision.strategy == "cancel_first"
+        assert decision.reason == "escape with balance unknown"
+
+    def test_escape_within_budget(self) -> None:
+        """約定回避: 発注 + キャンセル片道が予算内なら発注先行."""
+        # 30ms + 20ms / 2 = 40ms
+        decision = choose_reposition_strategy(inputs(escape=True), escape_budget=0.04)
+        assert decision.strategy == "place_first"
+        assert decision.reason == "escape exposure 40.0ms <= budget 40.0ms"
+
+    def test_escape_over_budget(self) -> None:
+        """約定回避: 予算を超えるならキャンセル優先."""
+        decision = choose_reposition_strategy(inputs(escape=True), escape_budget=0.039)
+        assert decision.strategy == "cancel_first"
+
+    def test_escape_without_samples(self) -> None:
+        """約定回避: レイテンシのサンプルがなければキャンセル優先."""
+        decision = choose_reposition_strategy(inputs(escape=True, place=None), escape_budget=1.0)
+        assert decision.strategy == "cancel_first"
+        assert decision.reason == "escape without latency samples"
+
+    def test_format_inputs(self) -> None:
+        """ログ出力用の文字列."""
+        assert inputs(cancel=None).format() == (
+            "escape=False, place=30.0ms, cancel=n/a, available=100.00, required=3.50"
+        )
@@ -0,0 +1,62 @@
+"""retry.pyのテスト."""
+
+import random
+
+import pytest
+
+from standx_mm_bot.client.exceptions import (
+    APIError,
+    AuthenticationError,
+    NetworkError,
+    RateLimitError,
+)
+from standx_mm_bot.client.ratelimit import Priority
+from standx_mm_bot.client.retry import RetryPolicy, default_policies
+
+
+@pytest.fixture
+def policies() -> dict[Priority, RetryPolicy]:
+    """デフォルトポリシー."""
+    return default_policies(max_attempts=4, base_delay=0.05, max_delay=1.0, deadline=3.0)
+
+
+@pytest.mark.parametrize("priority", [Priority.QUERY, Priority.CANCEL])
+def test_idempotent_retries_transient_errors(
+    policies: dict[Priority, RetryPolicy], priority: Priority
+) -> None:
+    """照会・キャンセルは一時的なエラーを全てリトライすることを確認."""
+    policy = policies[priority]
+
+    assert policy.should_retry(RateLimitError())
+    assert policy.should_retry(APIError("HTTP 503", status=503))
+    assert policy.should_retry(NetworkError("timeout", request_sent=True))
+    assert policy.should_retry(NetworkError("refused", request_sent=False))
+
+
+def test_place_retries_only_safe_errors(policies: dict[Priority, RetryPolicy]) -> None:
+    """発注は未処理が確実なエラーのみリトライすることを確認."""
+    policy = policies[Priority.PLACE]
+
+    assert policy.should_retry(RateLimitError())
+    assert policy.should_retry(NetworkError("refused", request_sent=False))
+    assert not policy.should_retry(NetworkError("timeout", request_sent=True))
+    assert not policy.should_retry(APIError("HTTP 503", status=503))
+
+
+def test_permanent_errors_not_retried(policies: dict[Priority, RetryPolicy]) -> None:
+    """恒久的なエラーはリトライしないことを確認."""
+    for policy in policies.values():
+        assert not policy.should_retry(APIError("HTTP 400", status=400))
+        assert not policy.should_retry(AuthenticationError("JWT expired", status=401))
+        assert not policy.should_retry(ValueError("bug"))
+
+
+def test_backoff_full_jitter() -> None:
+    """バックオフが指数的に増加し上限で頭打ちになることを確認."""
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.5)
+    rng = random.Random(0)
+
+    for attempt, cap in [(1, 0.1), (2, 0.2), (3, 0.4), (4, 0.5), (10, 0.5)]:
+        delays = [policy.backoff(attempt, rng) for _ in range(200)]
+        assert all(0 <= d <= cap for d in delays)
+        assert max(delays) > cap * 0.8
@@ -0,0 +1,103 @@
+"""token_store.pyのテスト."""
+
+import json
+import stat
+import time
+from pathlib import Path
+
+import jwt as pyjwt
+
+from standx_mm_bot.client.token_store import CachedToken, TokenStore, token_expiry
+
+AUTH_URL = "https://api.standx.com"
+
+
+def _cached(expires_at: float, address: str = "0xabc", chain: str = "bsc") -> CachedToken:
+    return CachedToken(
+        token="jwt", expires_at=expires_at, address=address, chain=chain, auth_url=AUTH_URL
+    )
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """保存したトークンを読み込めることを確認."""
+    store = TokenStore(tmp_path / "jwt.json")
+    cached = _cached(time.time() + 3600)
+
+    store.save(cached)
+
+    assert store.load("0xabc", "bsc", AUTH_URL) == cached
+
+
+def test_save_permissions(tmp_path: Path) -> None:
+    """キャッシュファイルが所有者のみ読み書き可能で作成されることを確認."""
+    store = TokenStore(tmp_path / "jwt.json")
+
+    store.save(_cached(time.time() + 3600))
+
+    assert stat.S_IMODE(store.path.stat().st_mode) == 0o600
+
+
+def test_load_missing_file(tmp_path: Path) -> None:
+    """ファイルがない場合はNoneを返すことを確認."""
+    assert TokenStore(tmp_path / "missing.json").load("0xabc", "bsc", AUTH_URL) is None
+
+
+def test_load_corrupted_file(tmp_path: Path) -> None:
+    """壊れたファイルは無視されることを確認."""
+    path = tmp_path / "jwt.json"
+    path.write_text("{not json")
+
+    assert TokenStore(path).load("0xabc", "bsc", AUTH_URL) is None
+
+
+def test_load_expired_token(tmp_path: Path) -> None:
+    """最低有効期間を満たさないトークンは無視されることを確認."""
+    store = TokenStore(tmp_path / "jwt.json")
+    store.save(_cached(time.time() + 30))
+
+    assert store.load("0xabc", "bsc", AUTH_URL, min_validity=60) is None
+
+
+def test_load_different_wallet(tmp_path: Path) -> None:
+    """ウォレットやチェーンが異なるトークンは無視されることを確認."""
+    store = TokenStore(tmp_path / "jwt.json")
+    store.save(_cached(time.time() + 3600))
+
+    assert store.load("0xdef", "bsc", AUTH_URL) is None
+    assert store.load("0xabc", "solana", AUTH_URL) is None
+
+
+def test_load_different_auth_url(tmp_path: Path) -> None:
+    """別の認証API（モック取引所など）で発行されたトークンは無視されることを確認."""
+    store = TokenStore(tmp_path / "jwt.json")
+    store.save(_cached(time.time() + 3600))
+
+    assert store.load("0xabc", "bsc", "http://127.0.0.1:8080") is None
+
+
+def test_load_legacy_cache_without_auth_url(tmp_path: Path) -> None:
+    """発行元URLを持たない旧形式のキャッシュは無視されることを確認."""
+    path = tmp_path / "jwt.json"
+    path.write_text(
+        json.dumps(
+            {"token": "jwt", "expires_at": time.time() + 3600, "address": "0xabc", "chain": "bsc"}
+        )
+    )
+
+    assert TokenStore(path).load("0xabc", "bsc", AUTH_URL) is None
+
+
+def test_token_expiry_from_exp_claim() -> None:
+    """JWTのexpクレームから有効期限を取得できることを確認."""
+    token = pyjwt.encode({"exp": 2_000_000_000}, "s" * 32, algorithm="HS256")
+
+    assert token_expiry(token, default_ttl=60) == 2_000_000_000
+
+
+def test_token_expiry_fallback() -> None:
+    """expが取得できない場合はデフォルト有効期間を使うことを確認."""
+    before = time.time()
+
+    expires_at = token_expiry("not-a-jwt", default_ttl=60)
+
+    assert before + 60 <= expires_at <= time.time() + 60
@@ -0,0 +1,172 @@
+"""HTTPトランスポートのテスト."""
+
+import sys
+from collections.abc import Mapping
+from unittest.mock import Mock
+
+import aiohttp
+import pytest
+from aioresponses import aioresponses
+
+from standx_mm_bot.client import APIError, NetworkError, StandXHTTPClient
+from standx_mm_bot.client.transport import (
+    AiohttpTransport,
+    TransportResponse,
+    create_transport,
+)
+from standx_mm_bot.config import Settings
+from standx_mm_bot.mock_exchange import MockExchange, MockExchangeConfig
+
+URL = "https://perps.standx.com/api/query_balance"
+
+
+class RecordingTransport:
+    """送信内容を記録して固定レスポンスを返すトランスポート."""
+
+    def __init__(self, response: TransportResponse):
+        self.response = response
+        self.requests: list[tuple[str, str, dict[str, str], bytes, float]] = []
+        self.closed = False
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        timeout: float,
+    ) -> TransportResponse:
+        self.requests.append((method, url, dict(headers), body, timeout))
+        return self.response
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_transport_reads_response() -> None:
+    """ステータス・ヘッダー・ボディのバイト列を返すことを確認."""
+    with aioresponses() as mocked:
+        mocked.post(URL, status=200, body=b'{"ok":1}', headers={"X-Test": "1"})
+
+        transport = create_transport("aiohttp")
+        try:
+            response = await transport.request("POST", URL, {}, b"{}", 1.0)
+        finally:
+            await transport.close()
+
+    assert response.status == 200
+    assert response.body == b'{"ok":1}'
+    assert response.headers["X-Test"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_aiohttp_transport_maps_errors() -> None:
+    """通信エラーがNetworkErrorに変換されることを確認."""
+    connect_error = aiohttp.ClientConnectorError(Mock(), OSError("Connection refused"))
+    with aioresponses() as mocked:
+        mocked.get(URL, exception=connect_error)
+        mocked.get(URL, exception=TimeoutError())
+
+        transport = AiohttpTransport(aiohttp.ClientSession())
+        try:
+            with pytest.raises(NetworkError) as refused:
+                await transport.request("GET", URL, {}, b"", 1.0)
+            with pytest.raises(NetworkError, match="timed out after 1.00s") as timed_out:
+                await transport.request("GET", URL, {}, b"", 1.0)
+        finally:
+            await transport.close()
+
+    assert not refused.value.request_sent
+    assert timed_out.value.request_sent
+
+
+def test_create_transport_rejects_unknown_name() -> None:
+    """未対応のトランスポート名はValueErrorになることを確認."""
+    with pytest.raises(ValueError, match="Unsupported HTTP transport"):
+        create_transport("http3")
+
+
+def test_http2_requires_httpx(monkeypatch: pytest.MonkeyPatch) -> None:
+    """httpxがない場合はインストール方法を示すことを確認."""
+    monkeypatch.setitem(sys.modules, "httpx", None)
+
+    with pytest.raises(RuntimeError, match=r"standx-mm-bot\[http2\]"):
+        create_transport("http2")
+
+
+@pytest.mark.asyncio
+async def test_http2_transport_against_mock_exchange() -> None:
+    """HTTP/2トランスポートで発注・キャンセルができ、エラー応答が変換されることを確認."""
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+
+    async with MockExchange(MockExchangeConfig(ticks_per_second=0)) as exchange:
+        config = Settings(
+            _env_file=None,
+            standx_private_key="0x" + "a" * 64,
+            standx_wallet_address="0x1234567890abcdef",
+            standx_chain="bsc",
+            standx_request_signing_key="0x" + "c" * 64,
+            standx_api_url=exchange.base_url,
+            symbol="ETH-USD",
+            jwt_cache_path=None,
+            http_transport="http2",
+            http_warmup_connections=0,
+            http_metrics_log_seconds=0,
+        )
+        async with StandXHTTPClient(config, jwt_token="test_jwt_token") as client:
+            await client.new_order("ETH-USD", "buy", 2990.0, 0.1, time_in_force="alo")
+            orders = await client.fetch_open_orders("ETH-USD")
+            assert [o.price for o in orders] == [2990.0]
+
+            await client.cancel_order(orders[0].id, "ETH-USD")
+            assert await client.fetch_open_orders("ETH-USD") == []
+
+            with pytest.raises(APIError, match="HTTP 400") as rejected:
+                await client.cancel_order(orders[0].id, "ETH-USD")
+            assert rejected.value.status == 400
+
+        transport = create_transport("http2")
+        try:
+            response = await transport.request("GET", exchange.base_url + "/unknown", {}, b"", 1.0)
+            assert response.status == 404
+        finally:
+            await transport.close()
+        base_url = exchange.base_url
+
+    # 停止したサーバーへの接続は送信前の失敗
+    transport = create_transport("http2")
+    try:
+        with pytest.raises(NetworkError) as refused:
+            await transport.request("GET", base_url + "/api/query_balance", {}, b"", 1.0)
+    finally:
+        await transport.close()
+    assert not refused.value.request_sent
+
+
+@pytest.mark.asyncio
+async def test_client_uses_injected_transport() -> None:
+    """StandXHTTPClientが指定したトランスポートで送受信することを確認."""
+    config = Settings(
+        standx_private_key="0x" + "a" * 64,
+        standx_wallet_address="0x1234567890abcdef",
+        standx_chain="bsc",
+        standx_request_signing_key="0x" + "c" * 64,
+        http_warmup_connections=0,
+        http_metrics_log_seconds=0,
+    )
+    transport = RecordingTransport(
+        TransportResponse(status=200, headers={}, body=b'{"balance":"100"}')
+    )
+
+    async with StandXHTTPClient(config, jwt_token="test_jwt_token", transport=transport) as client:
+        balance = await client.fetch_balance()
+        assert client.session is None
+
+    assert balance.balance == 100.0
+    assert transport.closed
+    method, url, headers, body, timeout = transport.requests[0]
+    assert (method, url, body) == ("GET", URL, b"")
+    assert headers["authorization"] == "Bearer test_jwt_token"
+    assert timeout == config.http_timeout_seconds
@@ -1,11 +1,16 @@
 """WebSocketクライアントのテスト."""
 
+import asyncio
 import json
+import time
+from collections.abc import Callable
 from unittest.mock import AsyncMock
 
 import pytest
+import websockets
 
 from standx_mm_bot.client import StandXWebSocketClient
+from standx_mm_bot.client.clock import ClockSync
 from standx_mm_bot.config import Settings
 
 
@@ -191,3 +196,104 @@ async def test_callback_error_handling(config: Settings) -> None:
     await client._dispatch_message({"channel": "price", "data": {}})
 
     assert callback2_called
+
+
+@pytest.mark.asyncio
+async def test_price_time_updates_clock(config: Settings) -> None:
+    """priceメッセージの時刻がサーバー時刻推定に使われることを確認."""
+    clock = ClockSync()
+    client = StandXWebSocketClient(config, clock=clock)
+
+    server_ms = time.time() * 1000 + 5000
+    await client._dispatch_message({"channel": "price", "data": {"time": int(server_ms)}})
+
+    assert clock.offset_ms > 4000
+
+
+@pytest.mark.asyncio
+async def test_receive_messages_decodes_bytes(config: Settings) -> None:
+    """受信フレームをバイト列のままデコードしてディスパッチすることを確認."""
+    client = StandXWebSocketClient(config)
+    client._running = True
+    prices: list[str] = []
+    orders: list[str] = []
+
+    async def on_price(data: dict) -> None:
+        prices.append(data["mark_price"])
+
+    async def on_order(data: dict) -> None:
+        orders.append(data["status"])
+
+    client.on_price_update(on_price)
+    client.on_order_update(on_order)
+
+    frames = [
+        b'{"channel":"price","data":{"mark_price":"3500.0"}}',
+        b"not json",
+        b'{"channel":"unknown","data":{}}',
+        b'{"channel":"order","data":{"status":"FILLED"}}',
+    ]
+    ws = AsyncMock()
+    ws.recv.side_effect = [*frames, websockets.ConnectionClosedOK(None, None)]
+
+    client._start_consumers()
+    try:
+        await client._receive_messages(ws)
+        await wait_until(lambda: bool(prices and orders))
+    finally:
+        await client._stop_consumers()
+
+    assert prices == ["3500.0"]
+    assert orders == ["FILLED"]
+    ws.recv.assert_called_with(decode=False)
+
+
+@pytest.mark.asyncio
+async def test_slow_price_callback_conflates(config: Settings) -> None:
+    """遅いpriceコールバック中の価格は最新のみ処理され、注文イベントは全件順に処理されることを確認."""
+    client = StandXWebSocketClient(config)
+    release = asyncio.Event()
+    prices: list[str] = []
+    orders: list[str] = []
+
+    async def slow_price(data: dict) -> None:
+        prices.append(data["mark_price"])
+        await release.wait()
+
+    async def on_order(data: dict) -> None:
+        orders.append(data["status"])
+
+    client.on_price_update(slow_price)
+    client.on_order_update(on_order)
+
+    client._start_consumers()
+    try:
+        client._enqueue_message({"channel": "price", "data": {"mark_price": "3000"}})
+        await wait_until(lambda: prices == ["3000"])
+
+        # priceコールバックが止まっている間も受信（キューへの積み込み）は続く
+        for price in ("3001", "3002", "3003"):
+            client._enqueue_message({"channel": "price", "data": {"mark_price": price}})
+        for status in ("NEW", "PARTIALLY_FILLED", "FILLED"):
+            client._enqueue_message({"channel": "order", "data": {"status": status}})
+        await wait_until(lambda: len(orders) == 3)
+        assert client.queue_stats()["price"]["depth"] == 1
+
+        release.set()
+        await wait_until(lambda: len(prices) == 2)
+    finally:
+        await client._stop_consumers()
+
+    assert prices == ["3000", "3003"]
+    assert orders == ["NEW", "PARTIALLY_FILLED", "FILLED"]
+    stats = client.queue_stats()
+    assert stats["price"] == {"depth": 0, "max_depth": 1, "received": 4, "dropped": 2}
+    assert stats["order"]["dropped"] == 0
+    assert stats["order"]["received"] == 3
+
+
+async def wait_until(predicate: Callable[[], bool], timeout: float = 1.0) -> None:
+    """条件が満たされるまでイベントループを回す."""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0)